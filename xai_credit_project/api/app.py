@@ -1,115 +1,378 @@
-from flask import Flask, render_template, jsonify, request
-from flask_cors import CORS
-from scripts.xai_credit_model import *
 import os
+# Eğitim grafikleri arka plan iş parçacığında çizilir; GUI arka ucu kullanılmamalı.
+# matplotlib yalnızca eğitim veya rapor için ilk kez gerektiğinde yüklenir.
+os.environ.setdefault('MPLBACKEND', 'Agg')
+from dotenv import load_dotenv
+from flask import Flask, render_template, jsonify, request, g, Response
+from flask_cors import CORS
+# Tahmin servisi yalnızca NumPy ve model paketini yükler; eğitim (scikit-learn,
+# imblearn, pandas) ve açıklama kütüphaneleri (shap, lime) ilk kullanımda yüklenir
+from scripts.explanation import (
+    shap_aciklayici_olustur, shap_aciklama_listesi, lime_aciklayici_olustur, lime_skorlayici,
+    lime_acikla, lime_ayarlari_coz, varsayilan_lime_ayarlari
+)
+from scripts.explainer_cache import ExplainerRegistry, yeni_model_versiyonu
+from scripts.batch_predict import (
+    istek_govdesini_ayristir, kayitlari_matrise_donustur, toplu_tahmin, DEFAULT_CHUNK_SIZE
+)
+from scripts.pipeline import InferencePipeline
+from scripts.jobs import TrainingJobManager
+from scripts.artifacts import artifact_kaydet, en_son_artifact_yukle
+from scripts.model_registry import ModelRegistry, ModelSnapshot
+from scripts.shap_batch import ShapDeposu, eski_depolari_temizle, shap_deposu_dizini
+from scripts.compiled_forest import FlatForest, ormani_derle
+from scripts.micro_batch import TahminBirlestirici
+from scripts.result_cache import SonucOnbellegi, sonuc_anahtari
+from scripts.drift import DriftIzleyici, olasilik_referansi_ekle
+from scripts.interpretation import YorumServisi
+from scripts.metrics import metrikler
 import traceback
 import sys
+import time
+
+# Çevresel değişkenleri yükle (OPENAI_API_KEY, OPENAI_BASE_URL, KREDI_AI_CLIENT)
+load_dotenv()
 
 app = Flask(__name__)
 
 # CORS politikasını ayarla
 CORS(app)
 
-# Global değişkenler
-model = None
-X_train = None
-X_test = None
-scaler = None
+@app.before_request
+def _istek_baslat():
+    g.istek_baslangic = time.perf_counter()
 
-@app.route('/api/train', methods=['POST'])
-def train_model():
-    global model, X_train, X_test, scaler
-    
+@app.after_request
+def _istek_olc(response):
+    # Yalnızca API uç noktaları; /api/train/<job_id> gibi yollar kural adıyla gruplanır
+    if request.path.startswith('/api/') and request.url_rule is not None:
+        metrikler.gozlemle(
+            'request_duration_seconds', time.perf_counter() - g.istek_baslangic,
+            "API isteklerinin toplam gecikmesi", endpoint=request.url_rule.rule
+        )
+        metrikler.sayac_arttir(
+            'requests_total', 1, "API istek sayısı",
+            endpoint=request.url_rule.rule, status=str(response.status_code)
+        )
+    return response
+
+def asama_suresi(endpoint, phase, baslangic):
+    """İstek aşamasının süresini gecikme histogramına ekle; bitiş zamanını döndür"""
+    simdi = time.perf_counter()
+    metrikler.gozlemle(
+        'request_phase_seconds', simdi - baslangic,
+        "API isteklerinin aşama bazında gecikmesi", endpoint=endpoint, phase=phase
+    )
+    return simdi
+
+# Servis edilen modelin değişmez, sürümlenmiş görüntüleri
+model_registry = ModelRegistry()
+
+# Tekrarlanan başvurular için tahmin ve açıklama sonuçları
+# (KREDI_RESULT_CACHE_MB, KREDI_RESULT_CACHE_TTL, KREDI_RESULT_CACHE_DIR)
+sonuc_onbellegi = SonucOnbellegi.ortamdan()
+
+# Tahmin yolundaki girdi ve olasılık dağılımlarının eğitim referansından kayması
+drift_izleyici = DriftIzleyici()
+
+# Model sürümü başına bir kez oluşturulan açıklayıcılar
+explainer_registry = ExplainerRegistry()
+
+@model_registry.on_publish
+def _aciklayicilari_yenile(snapshot, onceki):
+    # Yeni sürüm yayınlanınca eski açıklayıcılar serbest bırakılır
+    explainer_registry.activate(snapshot.version)
+    # Sonuçlar sürümle anahtarlanır; eski sürümlerin kayıtları yer tutmasın
+    sonuc_onbellegi.gecersiz_kil(snapshot.version)
+    # Kayma yeni sürümün eğitim referansına göre sıfırdan sayılır
+    drift_izleyici.etkinlestir(snapshot.version, snapshot.meta.get('drift_reference'))
+
+# Eşzamanlı /api/predict istekleri tek bir orman değerlendirmesinde birleştirilir
+# (KREDI_BATCH_WAIT_MS, KREDI_BATCH_MAX_ROWS)
+tahmin_birlestirici = TahminBirlestirici.ortamdan()
+
+# Arka plan eğitim işleri (aynı anda tek eğitim)
+training_jobs = TrainingJobManager(max_workers=1)
+
+# AI yorumları eğitimden bağımsız olarak arka planda alınır
+yorum_servisi = YorumServisi()
+
+def artifact_ile_baslat():
+    """Diskteki en yeni model paketini yükleyerek API'yi sıcak başlat"""
     try:
-        print("Model eğitimi başlıyor...")
-        
-        # Veri yükleme kontrolü
-        try:
-            X_scaled, y, df, X_orig = veri_yukle_ve_onisle()
-            print("Veri başarıyla yüklendi")
-        except Exception as e:
-            print(f"Veri yükleme hatası: {str(e)}")
-            print(f"Hata detayı: {traceback.format_exc()}")
-            raise Exception(f"Veri yükleme hatası: {str(e)}")
-        
-        # Model eğitimi kontrolü
-        try:
-            model, X_train, X_test, y_train, y_test = model_egit(X_scaled, y)
-            print("Model başarıyla eğitildi")
-        except Exception as e:
-            print(f"Model eğitim hatası: {str(e)}")
-            print(f"Hata detayı: {traceback.format_exc()}")
-            raise Exception(f"Model eğitim hatası: {str(e)}")
-        
-        # Performans değerlendirme kontrolü
-        try:
-            performans_metrikleri, y_pred = model_performansi(model, X_test, y_test)
-            print("Performans metrikleri hesaplandı")
-        except Exception as e:
-            print(f"Performans hesaplama hatası: {str(e)}")
-            print(f"Hata detayı: {traceback.format_exc()}")
-            raise Exception(f"Performans hesaplama hatası: {str(e)}")
-        
-        # SHAP ve LIME açıklamaları
-        try:
-            shap_aciklamalar(model, X_train, X_test)
-            lime_aciklamalar(model, X_train, X_test)
-            print("Açıklamalar oluşturuldu")
-        except Exception as e:
-            print(f"Açıklama oluşturma hatası: {str(e)}")
-            print(f"Hata detayı: {traceback.format_exc()}")
-            raise Exception(f"Açıklama oluşturma hatası: {str(e)}")
-        
-        # Özellik önem dereceleri
-        feature_importance = pd.DataFrame({
-            'özellik': X_orig.columns,
-            'önem': model.feature_importances_
-        }).sort_values('önem', ascending=False)
-        
-        # AI yorumu
+        paket = en_son_artifact_yukle(mmap=True, tembel=True)
+    except Exception as e:
+        print(f"Model paketi yüklenemedi: {str(e)}")
+        return False
+    
+    if paket is None:
+        print("Kayıtlı model paketi yok, /api/train bekleniyor")
+        return False
+    
+    if paket['model'] is None:
+        # scikit-learn ormanı yalnızca açıklayıcılar istediğinde yüklenir
+        pipeline = InferencePipeline.from_params(
+            paket['scaler_params']['mean'], paket['scaler_params']['scale'],
+            engine=paket['forest'], model_loader=paket['model_yukle']
+        )
+    else:
+        pipeline = InferencePipeline.from_scaler(
+            paket['model'], paket['scaler'],
+            engine=paket['forest'] or FlatForest.from_sklearn(paket['model'])
+        )
+    model_registry.publish(ModelSnapshot.olustur(
+        version=paket['version'],
+        pipeline=pipeline,
+        background=paket['background'],
+        meta=paket['meta'],
+        background_weights=paket['background_weights']
+    ))
+    print(f"Model paketi yüklendi (sürüm: {paket['version']})")
+    return True
+
+def lime_aciklayici(snapshot, discretizer='quartile'):
+    """Görüntünün sürümü için önbellekteki LIME açıklayıcısını döndür"""
+    return explainer_registry.get(
+        snapshot.version, f'lime:{discretizer}',
+        lambda: lime_aciklayici_olustur(snapshot.background, discretizer, snapshot.background_weights)
+    )
+
+def lime_skorlayici_al(snapshot, n_jobs):
+    """Pertürbasyon skorlayıcısını (gerekirse çok çekirdekli) önbellekten döndür"""
+    if not n_jobs:
+        return snapshot.pipeline.model.predict_proba
+    return explainer_registry.get(
+        snapshot.version, f'scorer:{n_jobs}',
+        lambda: lime_skorlayici(snapshot.pipeline.model, n_jobs)
+    )
+
+# Sorgu parametresi ile verilebilen LIME ayarları (lime_<ad>)
+LIME_QUERY_FIELDS = ('num_samples', 'discretizer', 'random_state', 'n_jobs')
+
+def tahmin_onbellek_anahtari(snapshot, X, tur, lime_ayarlari):
+    """Ham satırlar, açıklayıcı ve sonucu etkileyen LIME ayarlarından önbellek anahtarı
+
+    Tohumsuz LIME açıklaması da önbelleğe alınır: aynı başvurunun tekrarı
+    önbellek ömrü boyunca (KREDI_RESULT_CACHE_TTL) aynı açıklamayı alır.
+    """
+    ayarlar = {'explainer': tur}
+    if tur == 'lime':
+        # n_jobs yalnızca hızı etkiler, anahtara girmez
+        ayarlar.update(
+            num_samples=lime_ayarlari.num_samples,
+            discretizer=lime_ayarlari.discretizer,
+            random_state=lime_ayarlari.random_state
+        )
+    return sonuc_anahtari(snapshot.version, X, **ayarlar)
+
+def istek_lime_ayarlari(govde=None):
+    """Global LIME bütçesine gövdedeki 'lime' nesnesini ve lime_* parametrelerini uygula"""
+    degerler = dict((govde or {}).get('lime') or {})
+    for alan in LIME_QUERY_FIELDS:
+        if f'lime_{alan}' in request.args:
+            degerler[alan] = request.args[f'lime_{alan}']
+    return lime_ayarlari_coz(degerler)
+
+def shap_aciklayici(snapshot):
+    """Görüntünün sürümü için önbellekteki TreeSHAP açıklayıcısını döndür"""
+    return explainer_registry.get(
+        snapshot.version, 'shap', lambda: shap_aciklayici_olustur(snapshot.pipeline.model)
+    )
+
+def shap_deposu(snapshot):
+    """Görüntünün sürümü için bir kez açılan satır bazında SHAP deposu; yoksa FileNotFoundError"""
+    return explainer_registry.get(
+        snapshot.version, 'shap_store', lambda: ShapDeposu(shap_deposu_dizini(snapshot.version))
+    )
+
+# Desteklenen açıklama yöntemleri
+EXPLAINERS = ('lime', 'shap')
+
+def aciklamalari_uret(snapshot, X, tur, lime_ayarlari=None):
+    """Ölçeklenmiş satırlar için LIME veya SHAP açıklamalarını aynı biçimde üret
+
+    (açıklamalar, bilgiler) döndürür; LIME için bilgiler örnek sayısı ve yerel
+    modelin uyum skorunu içerir.
+    """
+    if tur == 'shap':
+        return shap_aciklama_listesi(shap_aciklayici(snapshot), X), None
+    
+    ayarlar = lime_ayarlari or varsayilan_lime_ayarlari()
+    explainer = lime_aciklayici(snapshot, ayarlar.discretizer)
+    predict_fn = lime_skorlayici_al(snapshot, ayarlar.n_jobs)
+    aciklamalar, bilgiler = [], []
+    for satir in X:
+        exp, bilgi = lime_acikla(explainer, satir, predict_fn, ayarlar)
+        aciklamalar.append(exp.as_list())
+        bilgiler.append(bilgi)
+    return aciklamalar, bilgiler
+
+def model_yok_yaniti():
+    return jsonify({
+        'success': False,
+        'message': 'Lütfen önce modeli eğitin!'
+    }), 400
+
+def egitimi_calistir(job):
+    """Eğitim hattını aşama aşama çalıştır ve yeni modeli yayınla"""
+    import pandas as pd
+    from scripts.training import veri_yukle_ve_onisle, model_egit, model_performansi
+    from scripts.explanation import shap_aciklamalar, lime_aciklamalar
+    from scripts.background import arka_plan_ozetle
+    print("Model eğitimi başlıyor...")
+    
+    with job.stage('veri_yukleme'):
+        X_scaled, y, df, X_orig, scaler, drift_referansi = veri_yukle_ve_onisle(
+            return_scaler=True, return_referans=True
+        )
+        print("Veri başarıyla yüklendi")
+    
+    with job.stage('model_egitimi'):
+        model, X_train_balanced, yeni_X_test, y_train, y_test = model_egit(X_scaled, y)
+        # Tahminler derlenmiş ormanla yapılır; scikit-learn modeli açıklayıcılarda kalır
+        forest = ormani_derle(model, yeni_X_test)
+        yeni_pipeline = InferencePipeline.from_scaler(model, scaler, engine=forest)
+        yeni_versiyon = yeni_model_versiyonu()
+        print(f"Model başarıyla eğitildi (sürüm: {yeni_versiyon})")
+    
+    # Açıklayıcılar dengelenmiş eğitim seti yerine sabit boyutlu ağırlıklı özeti kullanır
+    with job.stage('arka_plan_ozeti'):
+        arka_plan = arka_plan_ozetle(X_train_balanced, y_train, ayrik_kaynak=X_scaled)
+        del X_train_balanced
+    
+    with job.stage('performans'):
+        performans_metrikleri, y_pred = model_performansi(yeni_pipeline, X_orig.loc[yeni_X_test.index], y_test)
+        olasilik_referansi_ekle(drift_referansi, yeni_pipeline.predict_proba(X_orig.loc[yeni_X_test.index])[:, 1])
+        print("Performans metrikleri hesaplandı")
+    
+    # Özellik önem dereceleri
+    feature_importance = pd.DataFrame({
+        'özellik': X_orig.columns,
+        'önem': model.feature_importances_
+    }).sort_values('önem', ascending=False)
+    
+    # Eğitim yorumu beklemez; yorum açıklamalarla eşzamanlı alınır ve
+    # /api/interpretation/<anahtar> üzerinden sorgulanır
+    yorum_anahtari = yorum_servisi.iste(performans_metrikleri, feature_importance)
+    
+    # Yeni sürümün görüntüsü yayından önce hazırlanır; açıklamalar onunla üretilir
+    snapshot = ModelSnapshot.olustur(yeni_versiyon, yeni_pipeline, arka_plan.X,
+                                     meta={'drift_reference': drift_referansi},
+                                     background_weights=arka_plan.agirlik)
+    
+    # Açıklamalar başarısız olursa model yayınlanmaz ve paket yazılmaz; iş 'failed'
+    # olur ve eski model (ve SHAP deposu) servis edilmeye devam eder
+    with job.stage('aciklamalar'):
+        shap_aciklamalar(model, arka_plan.X, yeni_X_test, depo_dizini=shap_deposu_dizini(yeni_versiyon))
+        lime_aciklamalar(model, arka_plan.X, yeni_X_test, explainer=lime_aciklayici(snapshot, varsayilan_lime_ayarlari().discretizer))
+        print("Açıklamalar oluşturuldu")
+    
+    # Yeniden başlatmada eğitimi beklememek için paketi diske yaz
+    with job.stage('paket_kaydetme'):
         try:
-            ai_interpretation = get_ai_interpretation(performans_metrikleri, feature_importance)
-            print("AI yorumu alındı")
+            artifact_kaydet(model, scaler, arka_plan.X, version=yeni_versiyon, forest=forest,
+                            background_weights=arka_plan.agirlik,
+                            meta={'background_method': arka_plan.yontem, 'drift_reference': drift_referansi})
         except Exception as e:
-            print(f"AI yorum hatası: {str(e)}")
+            # Paket yazılamasa da bellekteki model kullanılabilir
+            print(f"Model paketi kaydedilemedi: {str(e)}")
             print(f"Hata detayı: {traceback.format_exc()}")
-            raise Exception(f"AI yorum hatası: {str(e)}")
-        
+    
+    # Son adım: eğitim boyunca tahminler eski modelle sürer; yeni model tek adımda devreye girer
+    with job.stage('yayinlama'):
+        model_registry.publish(snapshot)
+        # Eski SHAP depoları yalnızca başarılı yayından sonra silinir; servis
+        # edilen sürümün deposu her zaman korunur
+        eski_depolari_temizle(koru=(snapshot.version,))
+    
+    yorum = yorum_servisi.durum(yorum_anahtari)
+    
+    return {
+        'success': True,
+        'message': 'Model başarıyla eğitildi',
+        'model_version': yeni_versiyon,
+        'performans': {
+            'roc_auc': float(performans_metrikleri['roc_auc']),
+            'classification_report': performans_metrikleri['classification_report']
+        },
+        'ai_interpretation': yorum['interpretation'],
+        'ai_interpretation_status': yorum['status'],
+        'ai_interpretation_url': f'/api/interpretation/{yorum_anahtari}'
+    }
+
+@app.route('/api/train', methods=['POST'])
+def train_model():
+    """Eğitimi arka planda başlat ve iş kimliğini hemen döndür"""
+    job = training_jobs.submit(egitimi_calistir)
+    print(f"Eğitim işi kuyruğa alındı: {job.id}")
+    return jsonify({
+        'success': True,
+        'message': 'Model eğitimi başlatıldı',
+        'job_id': job.id,
+        'status_url': f'/api/train/{job.id}'
+    }), 202
+
+@app.route('/api/train/<job_id>', methods=['GET'])
+def train_status(job_id):
+    """Eğitim işinin aşama bazında durumunu ve sürelerini döndür"""
+    job = training_jobs.get(job_id)
+    if job is None:
         return jsonify({
-            'success': True,
-            'message': 'Model başarıyla eğitildi',
-            'performans': {
-                'roc_auc': float(performans_metrikleri['roc_auc']),
-                'classification_report': performans_metrikleri['classification_report']
-            },
-            'ai_interpretation': ai_interpretation
-        })
-        
-    except Exception as e:
-        error_msg = f"Model eğitimi sırasında hata oluştu: {str(e)}\n{traceback.format_exc()}"
-        print(error_msg)
+            'success': False,
+            'message': f'Eğitim işi bulunamadı: {job_id}'
+        }), 404
+    return jsonify({
+        'success': True,
+        **job.to_dict()
+    })
+
+@app.route('/api/interpretation/<anahtar>', methods=['GET'])
+def interpretation_status(anahtar):
+    """Eğitim sonrası istenen AI yorumunun durumunu ve metnini döndür"""
+    yorum = yorum_servisi.durum(anahtar)
+    if yorum is None:
         return jsonify({
             'success': False,
-            'message': str(e),
-            'error_details': error_msg
-        }), 500
+            'message': f'AI yorumu bulunamadı: {anahtar}'
+        }), 404
+    return jsonify({
+        'success': True,
+        **yorum
+    })
 
 @app.route('/api/predict', methods=['POST'])
 def predict():
-    global model, X_train
-    
     try:
         print("Tahmin işlemi başlıyor...")
         
-        # Model kontrolü
-        if model is None:
+        # İstek boyunca tek bir tutarlı model görüntüsü kullanılır
+        snapshot = model_registry.current()
+        if snapshot is None:
+            return model_yok_yaniti()
+        
+        t = time.perf_counter()
+        # JSON olmayan gövdeler ve nesne olmayan JSON (dizi, null) istemci hatasıdır
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
             return jsonify({
                 'success': False,
-                'message': 'Lütfen önce modeli eğitin!'
+                'message': 'İstek gövdesi bir JSON nesnesi olmalıdır'
             }), 400
         
-        data = request.get_json()
-        print(f"Gelen veri: {data}")
+        explainer_turu = request.args.get('explainer') or data.get('explainer', 'lime')
+        if explainer_turu not in EXPLAINERS:
+            return jsonify({
+                'success': False,
+                'message': f'Geçersiz açıklayıcı: {explainer_turu}'
+            }), 400
+        
+        try:
+            lime_ayarlari = istek_lime_ayarlari(data)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
         
         # Veri doğrulama
         required_fields = ['employed', 'bank_balance', 'annual_salary']
@@ -122,58 +385,65 @@ def predict():
         
         # Giriş verilerini hazırla
         try:
-            input_data = pd.DataFrame({
-                'Employed': [float(data['employed'])],
-                'Bank Balance': [float(data['bank_balance'])],
-                'Annual Salary': [float(data['annual_salary'])]
-            })
+            input_data = kayitlari_matrise_donustur([data])
             print("Giriş verileri hazırlandı")
+            t = asama_suresi('predict', 'parse', t)
         except ValueError as e:
             return jsonify({
                 'success': False,
-                'message': f'Geçersiz veri formatı: {str(e)}'
+                'message': str(e)
             }), 400
         
+        # Aynı başvuru bu model sürümüyle daha önce skorlandıysa yeniden hesaplanmaz.
+        # Anahtar, input_data yerinde ölçeklenmeden önce alınır.
+        onbellek_anahtari = tahmin_onbellek_anahtari(snapshot, input_data, explainer_turu, lime_ayarlari)
+        onbellekteki = sonuc_onbellegi.getir(onbellek_anahtari, explainer_turu)
+        if onbellekteki is not None:
+            drift_izleyici.gozlemle(snapshot.version, input_data, onbellekteki['probability']['default'])
+            asama_suresi('predict', 'cache', t)
+            return jsonify(onbellekteki)
+        
         # Tahmin yap
         try:
-            prediction = model.predict(input_data)[0]
-            proba = model.predict_proba(input_data)[0]
+            # Orman eşzamanlı isteklerle birlikte bir kez çalışır, etiket
+            # olasılıklardan türetilir. input_data yerinde ölçeklenir ve
+            # açıklayıcıya doğrudan verilir.
+            ham_girdi = input_data.copy()
+            proba = tahmin_birlestirici.predict_proba(snapshot.pipeline, input_data)[0]
+            drift_izleyici.gozlemle(snapshot.version, ham_girdi, proba[1])
+            prediction = snapshot.pipeline.classes_[proba.argmax()]
+            t = asama_suresi('predict', 'inference', t)
             print(f"Tahmin sonucu: {prediction}, Olasılıklar: {proba}")
         except Exception as e:
             print(f"Tahmin hatası: {str(e)}")
             print(f"Hata detayı: {traceback.format_exc()}")
             raise Exception(f"Tahmin hatası: {str(e)}")
         
-        # LIME açıklaması
+        # LIME veya SHAP açıklaması
         try:
-            feature_names = ['İstihdam Durumu', 'Banka Bakiyesi', 'Yıllık Maaş']
-            explainer = lime.lime_tabular.LimeTabularExplainer(
-                X_train.values,
-                feature_names=feature_names,
-                class_names=['Temerrüt Yok', 'Temerrüt Var'],
-                mode='classification'
-            )
-            
-            exp = explainer.explain_instance(
-                input_data.iloc[0].values, 
-                model.predict_proba,
-                num_features=3
-            )
-            print("LIME açıklaması oluşturuldu")
+            aciklamalar, bilgiler = aciklamalari_uret(snapshot, input_data, explainer_turu, lime_ayarlari)
+            explanation = aciklamalar[0]
+            asama_suresi('predict', 'explanation', t)
+            print(f"{explainer_turu.upper()} açıklaması oluşturuldu")
         except Exception as e:
-            print(f"LIME açıklama hatası: {str(e)}")
+            print(f"{explainer_turu.upper()} açıklama hatası: {str(e)}")
             print(f"Hata detayı: {traceback.format_exc()}")
-            raise Exception(f"LIME açıklama hatası: {str(e)}")
+            raise Exception(f"{explainer_turu.upper()} açıklama hatası: {str(e)}")
         
-        return jsonify({
+        sonuc = {
             'success': True,
             'prediction': int(prediction),
             'probability': {
                 'no_default': float(proba[0]),
                 'default': float(proba[1])
             },
-            'explanation': exp.as_list()
-        })
+            'explanation': explanation,
+            'explanation_info': bilgiler[0] if bilgiler else None,
+            'explainer': explainer_turu,
+            'model_version': snapshot.version
+        }
+        sonuc_onbellegi.koy(onbellek_anahtari, sonuc, explainer_turu)
+        return jsonify(sonuc)
         
     except Exception as e:
         error_msg = f"Tahmin sırasında hata oluştu: {str(e)}\n{traceback.format_exc()}"
@@ -184,5 +454,163 @@ def predict():
             'error_details': error_msg
         }), 500
 
+# Toplu isteklerde açıklama üretilebilecek en fazla satır sayısı
+MAX_EXPLAIN_ROWS = {'lime': 100, 'shap': 10000}
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """JSON dizisi, CSV veya NDJSON olarak gelen kayıtları toplu skorla"""
+    try:
+        # İstek boyunca tek bir tutarlı model görüntüsü kullanılır
+        snapshot = model_registry.current()
+        if snapshot is None:
+            return model_yok_yaniti()
+        
+        explain = request.args.get('explain', 'false').lower() in ('1', 'true', 'yes')
+        explainer_turu = request.args.get('explainer', 'lime')
+        if explainer_turu not in EXPLAINERS:
+            return jsonify({
+                'success': False,
+                'message': f'Geçersiz açıklayıcı: {explainer_turu}'
+            }), 400
+        
+        t = time.perf_counter()
+        try:
+            try:
+                chunk_size = int(request.args.get('chunk_size', DEFAULT_CHUNK_SIZE))
+            except ValueError:
+                chunk_size = 0
+            if chunk_size <= 0:
+                raise ValueError("chunk_size pozitif bir tam sayı olmalıdır")
+            lime_ayarlari = istek_lime_ayarlari()
+            X = istek_govdesini_ayristir(request.get_data(), request.content_type)
+            t = asama_suresi('predict_batch', 'parse', t)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        if explain and X.shape[0] > MAX_EXPLAIN_ROWS[explainer_turu]:
+            return jsonify({
+                'success': False,
+                'message': f'{explainer_turu} açıklaması en fazla {MAX_EXPLAIN_ROWS[explainer_turu]} satır için istenebilir'
+            }), 400
+        
+        print(f"Toplu tahmin: {X.shape[0]} kayıt")
+        # Girdiler yerinde ölçeklenmeden önce sayılır
+        drift_izleyici.gozlemle(snapshot.version, X)
+        # X yerinde ölçeklenir; açıklamalar aynı ölçeklenmiş satırları kullanır
+        etiketler, proba = toplu_tahmin(snapshot.pipeline, X, chunk_size=chunk_size)
+        drift_izleyici.gozlemle(snapshot.version, proba=proba[:, 1])
+        t = asama_suresi('predict_batch', 'inference', t)
+        
+        sonuc = {
+            'success': True,
+            'count': int(X.shape[0]),
+            'predictions': etiketler.astype(int).tolist(),
+            'probability': {
+                'no_default': proba[:, 0].tolist(),
+                'default': proba[:, 1].tolist()
+            },
+            'model_version': snapshot.version
+        }
+        
+        if explain:
+            sonuc['explanations'], sonuc['explanation_info'] = aciklamalari_uret(
+                snapshot, X, explainer_turu, lime_ayarlari
+            )
+            asama_suresi('predict_batch', 'explanation', t)
+            sonuc['explainer'] = explainer_turu
+        
+        return jsonify(sonuc)
+        
+    except Exception as e:
+        error_msg = f"Toplu tahmin sırasında hata oluştu: {str(e)}\n{traceback.format_exc()}"
+        print(error_msg)
+        return jsonify({
+            'success': False,
+            'message': str(e),
+            'error_details': error_msg
+        }), 500
+
+@app.route('/api/shap', methods=['GET'])
+def shap_rows():
+    """Eğitimde hesaplanmış satır bazında SHAP katkılarını yeniden hesaplamadan döndür"""
+    snapshot = model_registry.current()
+    if snapshot is None:
+        return model_yok_yaniti()
+    
+    try:
+        row_ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip()]
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'message': 'ids virgülle ayrılmış tam sayılar olmalı'
+        }), 400
+    
+    try:
+        depo = shap_deposu(snapshot)
+    except FileNotFoundError:
+        return jsonify({
+            'success': False,
+            'message': f'Bu model sürümü için SHAP deposu yok: {snapshot.version}'
+        }), 404
+    
+    try:
+        degerler = depo.getir(row_ids)
+    except KeyError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e.args[0])
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'model_version': snapshot.version,
+        'feature_names': depo.meta['feature_names'],
+        'expected_value': depo.meta['expected_value'],
+        'rows': {str(i): satir.tolist() for i, satir in zip(row_ids, degerler)}
+    })
+
+@app.route('/api/explainers', methods=['GET'])
+def explainer_stats():
+    """Açıklayıcı oluşturma maliyeti ve yeniden kullanım sayıları"""
+    return jsonify({
+        'success': True,
+        **explainer_registry.stats()
+    })
+
+@app.route('/api/cache', methods=['GET'])
+def result_cache_stats():
+    """Sonuç önbelleğinin isabet/ıska sayıları ve doluluğu"""
+    return jsonify({
+        'success': True,
+        **sonuc_onbellegi.stats()
+    })
+
+@app.route('/api/drift', methods=['GET'])
+def drift_report():
+    """Girdi özellikleri ve temerrüt olasılığı için eğitim referansına göre PSI/KS"""
+    rapor = drift_izleyici.rapor()
+    if rapor is None:
+        return jsonify({
+            'success': False,
+            'message': 'Servis edilen model sürümü için drift referansı yok'
+        }), 404
+    return jsonify({
+        'success': True,
+        **rapor
+    })
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Aşama süreleri, bellek, istek gecikmeleri ve drift skorları (Prometheus metin biçimi)"""
+    drift_izleyici.metrikleri_yayinla()
+    return Response(metrikler.prometheus(), mimetype='text/plain; version=0.0.4')
+
+# Başlangıçta en yeni model paketini yükle
+artifact_ile_baslat()
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8080, debug=True) 
\ No newline at end of file
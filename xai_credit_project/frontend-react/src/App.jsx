@@ -16,7 +16,26 @@ function App() {
     setLoading(true);
     try {
       const response = await axios.post('/api/train');
-      setModelStatus(response.data);
+      // Eğitim arka planda sürer; iş tamamlanana kadar durumu sorgula
+      let job = response.data;
+      while (job.status !== 'succeeded' && job.status !== 'failed') {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        job = (await axios.get(response.data.status_url)).data;
+      }
+      if (job.status !== 'succeeded') {
+        setModelStatus({ success: false, message: job.error });
+      } else {
+        setModelStatus(job.result);
+        // AI yorumu eğitimden sonra hazır olabilir; hazır olana kadar sorgula
+        let yorum = { status: job.result.ai_interpretation_status };
+        while (yorum.status === 'pending') {
+          await new Promise((resolve) => setTimeout(resolve, 1000));
+          yorum = (await axios.get(job.result.ai_interpretation_url)).data;
+        }
+        if (yorum.interpretation) {
+          setModelStatus({ ...job.result, ai_interpretation: yorum.interpretation });
+        }
+      }
     } catch (error) {
       setModelStatus({ success: false, message: error.message });
     }
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Model Artifact Paketleri
+Eğitilmiş orman, ölçekleyici ve açıklayıcı arka plan özetini sürümlenmiş bir
+klasöre yazar; API başlangıçta en yeni paketi yükleyerek yeniden eğitim
+beklemeden tahmin yapabilir.
+"""
+
+import functools
+import json
+import os
+import shutil
+from datetime import datetime
+
+import joblib
+import numpy as np
+
+from scripts.compiled_forest import FlatForest
+from scripts.explainer_cache import yeni_model_versiyonu
+
+ARTIFACTS_DIR = os.environ.get(
+    'KREDI_ARTIFACTS_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts")
+)
+
+# Saklanacak en fazla paket sayısı
+ARTIFACT_KEEP = 5
+
+MODEL_FILE = "model.joblib"
+SCALER_FILE = "scaler.joblib"
+BACKGROUND_FILE = "background.npy"
+BACKGROUND_WEIGHTS_FILE = "background_weights.npy"
+FOREST_FILE = "forest.npz"
+META_FILE = "meta.json"
+
+
+def artifact_kaydet(model, scaler, X_background, version=None, meta=None, artifacts_dir=None, forest=None,
+                    background_weights=None):
+    """Modeli, ölçekleyiciyi ve arka plan verisini yeni bir sürüm klasörüne yaz
+
+    forest verilirse derlenmiş orman da pakete eklenir. X_background bir arka
+    plan özetiyse background_weights temsilcilerin ağırlıklarıdır.
+    """
+    artifacts_dir = artifacts_dir or ARTIFACTS_DIR
+    version = version or yeni_model_versiyonu()
+    hedef = os.path.join(artifacts_dir, version)
+    gecici = hedef + ".tmp"
+
+    os.makedirs(gecici, exist_ok=True)
+    # Sıkıştırmasız döküm: yüklerken diziler bellek eşlemeli açılabilir
+    joblib.dump(model, os.path.join(gecici, MODEL_FILE))
+    joblib.dump(scaler, os.path.join(gecici, SCALER_FILE))
+    np.save(os.path.join(gecici, BACKGROUND_FILE), np.ascontiguousarray(X_background, dtype=np.float64))
+    if background_weights is not None:
+        np.save(os.path.join(gecici, BACKGROUND_WEIGHTS_FILE), np.asarray(background_weights, dtype=np.float64))
+    if forest is not None:
+        forest.kaydet(os.path.join(gecici, FOREST_FILE))
+
+    bilgi = {
+        'version': version,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'background_shape': list(np.shape(X_background)),
+        # Tahmin servisi ölçekleyiciyi scikit-learn yüklemeden kurabilsin
+        'scaler': {
+            'mean': np.asarray(scaler.mean_, dtype=np.float64).tolist(),
+            'scale': np.asarray(scaler.scale_, dtype=np.float64).tolist()
+        }
+    }
+    bilgi.update(meta or {})
+    with open(os.path.join(gecici, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(bilgi, f, ensure_ascii=False, indent=2)
+
+    # Yarım yazılmış paketler hiçbir zaman yüklenmesin
+    os.replace(gecici, hedef)
+    print(f"Model paketi kaydedildi: {hedef}")
+
+    eski_paketleri_temizle(artifacts_dir)
+    return version
+
+
+def artifact_surumleri(artifacts_dir=None):
+    """Tamamlanmış paket sürümlerini eskiden yeniye sıralı döndür"""
+    artifacts_dir = artifacts_dir or ARTIFACTS_DIR
+    if not os.path.isdir(artifacts_dir):
+        return []
+    return sorted(
+        ad for ad in os.listdir(artifacts_dir)
+        if not ad.endswith(".tmp") and os.path.exists(os.path.join(artifacts_dir, ad, META_FILE))
+    )
+
+
+def artifact_yukle(version, mmap=True, artifacts_dir=None, tembel=False):
+    """Belirtilen sürümün paketini yükle
+
+    tembel=True ise derlenmiş orman ve ölçekleyici parametreleri içeren
+    paketlerde scikit-learn modeli ve ölçekleyici yüklenmez: 'model' ve
+    'scaler' None olur, model gerektiğinde 'model_yukle()' ile yüklenir.
+    """
+    artifacts_dir = artifacts_dir or ARTIFACTS_DIR
+    klasor = os.path.join(artifacts_dir, version)
+    mmap_mode = 'r' if mmap else None
+
+    with open(os.path.join(klasor, META_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+
+    # Derlenmiş orman içermeyen eski paketlerde None
+    forest_yolu = os.path.join(klasor, FOREST_FILE)
+    forest = FlatForest.yukle(forest_yolu) if os.path.exists(forest_yolu) else None
+    # Özetlenmemiş arka plan içeren eski paketlerde None
+    agirlik_yolu = os.path.join(klasor, BACKGROUND_WEIGHTS_FILE)
+    model_yukle = functools.partial(joblib.load, os.path.join(klasor, MODEL_FILE), mmap_mode=mmap_mode)
+    # Eski paketler (orman veya ölçekleyici parametresi yok) her zaman tam yüklenir
+    tembel = tembel and forest is not None and 'scaler' in meta
+
+    return {
+        'version': meta['version'],
+        'model': None if tembel else model_yukle(),
+        'model_yukle': model_yukle,
+        'scaler': None if tembel else joblib.load(os.path.join(klasor, SCALER_FILE)),
+        'scaler_params': meta.get('scaler'),
+        'background': np.load(os.path.join(klasor, BACKGROUND_FILE), mmap_mode=mmap_mode),
+        'background_weights': np.load(agirlik_yolu) if os.path.exists(agirlik_yolu) else None,
+        'forest': forest,
+        'meta': meta
+    }
+
+
+def en_son_artifact_yukle(mmap=True, artifacts_dir=None, tembel=False):
+    """En yeni paketi yükle; hiç paket yoksa None döndür"""
+    surumler = artifact_surumleri(artifacts_dir)
+    if not surumler:
+        return None
+    return artifact_yukle(surumler[-1], mmap=mmap, artifacts_dir=artifacts_dir, tembel=tembel)
+
+
+def eski_paketleri_temizle(artifacts_dir=None, keep=ARTIFACT_KEEP):
+    """En yeni `keep` paket dışındakileri sil"""
+    artifacts_dir = artifacts_dir or ARTIFACTS_DIR
+    for version in artifact_surumleri(artifacts_dir)[:-keep]:
+        shutil.rmtree(os.path.join(artifacts_dir, version), ignore_errors=True)
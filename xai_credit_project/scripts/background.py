@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Açıklayıcı Arka Planı
+SMOTE ile dengelenmiş eğitim setini eğitim sırasında bir kez, az sayıda
+ağırlıklı temsilci satıra özetler. Açıklayıcılar tam eğitim seti yerine bu
+özeti kullanır; böylece süreç başına bellek ve açıklayıcı kurulum süresi
+eğitim verisi büyüdükçe sabit kalır.
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+from scripts.metrics import olculen
+
+# Özetteki en fazla temsilci satır sayısı
+ARKA_PLAN_BOYUTU = 200
+# 'kmeans': katman içi küme merkezleri, 'quantile': çeyreklik ızgarasından gerçek satırlar,
+# 'none': özetleme yapılmaz (tam eğitim seti)
+ARKA_PLAN_YONTEMLERI = ('kmeans', 'quantile', 'none')
+# Bu kadar veya daha az farklı değeri olan sütunlar katman olarak ayrılır (ör. Employed)
+AYRIK_DEGER_SINIRI = 10
+
+
+@dataclass(frozen=True)
+class ArkaPlanOzeti:
+    """Temsilci satırlar ve temsil ettikleri veri oranı (ağırlıkların toplamı 1)"""
+    X: np.ndarray
+    agirlik: np.ndarray
+    yontem: str
+    kaynak_satir: int
+
+
+def varsayilan_arka_plan_ayarlari():
+    """KREDI_ARKA_PLAN_YONTEMI ve KREDI_ARKA_PLAN_BOYUTU ortam değişkenlerini oku"""
+    yontem = os.getenv('KREDI_ARKA_PLAN_YONTEMI') or 'kmeans'
+    if yontem not in ARKA_PLAN_YONTEMLERI:
+        raise ValueError(f"Geçersiz arka plan yöntemi: {yontem}")
+    return yontem, int(os.getenv('KREDI_ARKA_PLAN_BOYUTU') or ARKA_PLAN_BOYUTU)
+
+
+def _ayrik_degerler(X):
+    """Az sayıda farklı değeri olan sütunlar ve değerleri: {sütun indeksi: değerler}"""
+    X = np.asarray(X, dtype=np.float64)
+    degerler = {}
+    for j in range(X.shape[1]):
+        tekil = np.unique(X[:, j])
+        if len(tekil) <= AYRIK_DEGER_SINIRI:
+            degerler[j] = tekil
+    return degerler
+
+
+def _en_yakina_yuvarla(x, tekil):
+    """Her değeri tekil (sıralı) değerlerin en yakınına çek"""
+    sinirlar = (tekil[:-1] + tekil[1:]) / 2
+    return tekil[np.searchsorted(sinirlar, x)]
+
+
+def _katmanlar(X, y, ayrik):
+    """Ayrık sütunların (ve varsa sınıfın) değer birleşimlerine göre satır indeksleri"""
+    anahtar = X[:, ayrik]
+    if y is not None:
+        anahtar = np.column_stack([anahtar, np.asarray(y, dtype=np.float64)])
+    if anahtar.shape[1] == 0:
+        return [np.arange(X.shape[0])]
+    _, etiket = np.unique(anahtar, axis=0, return_inverse=True)
+    etiket = etiket.ravel()
+    return [np.flatnonzero(etiket == k) for k in range(etiket.max() + 1)]
+
+
+def _paylastir(boyutlar, toplam):
+    """toplam temsilciyi katmanlara satır sayısıyla orantılı, en az bir tane olacak şekilde dağıt"""
+    boyutlar = np.asarray(boyutlar)
+    pay = np.maximum(np.floor(boyutlar / boyutlar.sum() * toplam).astype(int), 1)
+    return np.minimum(pay, boyutlar)
+
+
+def _kmeans_ozeti(X_katman, k, surekli, random_state):
+    """Sürekli sütunlarda k-means; ayrık sütunlar katman içinde sabittir"""
+    if k >= len(X_katman):
+        return X_katman, np.ones(len(X_katman))
+    km = MiniBatchKMeans(n_clusters=k, batch_size=4096, n_init=3, random_state=random_state)
+    etiket = km.fit_predict(X_katman[:, surekli])
+    sayilar = np.bincount(etiket, minlength=k)
+    merkezler = np.repeat(X_katman[:1], k, axis=0)
+    merkezler[:, surekli] = km.cluster_centers_
+    dolu = sayilar > 0
+    return merkezler[dolu], sayilar[dolu].astype(np.float64)
+
+
+def _quantile_ozeti(X_katman, k, surekli):
+    """Sürekli sütunların çeyreklik ızgarasındaki her dolu hücreden medyana en yakın gerçek satır"""
+    if k >= len(X_katman):
+        return X_katman, np.ones(len(X_katman))
+    kova_sayisi = max(int(np.floor(k ** (1.0 / max(len(surekli), 1)))), 1)
+    hucre = np.zeros(len(X_katman), dtype=np.int64)
+    for j in surekli:
+        sinirlar = np.quantile(X_katman[:, j], np.linspace(0, 1, kova_sayisi + 1)[1:-1])
+        hucre = hucre * kova_sayisi + np.searchsorted(sinirlar, X_katman[:, j], side='right')
+    temsilciler, agirliklar = [], []
+    for h in np.unique(hucre):
+        satirlar = X_katman[hucre == h]
+        medyan = np.median(satirlar[:, surekli], axis=0)
+        en_yakin = np.argmin(((satirlar[:, surekli] - medyan) ** 2).sum(axis=1))
+        temsilciler.append(satirlar[en_yakin])
+        agirliklar.append(len(satirlar))
+    return np.array(temsilciler), np.array(agirliklar, dtype=np.float64)
+
+
+@olculen()
+def arka_plan_ozetle(X, y=None, boyut=None, yontem=None, random_state=42, ayrik_kaynak=None):
+    """Eğitim setini en fazla boyut ağırlıklı satıra özetle
+
+    y verilirse sınıflar ayrı katmanlarda özetlenir; azınlık sınıfı ve ayrık
+    sütunların her değeri özette temsil edilir. Ağırlıklar temsilcinin
+    kapsadığı satır oranıdır.
+
+    ayrik_kaynak, ayrık sütunların belirleneceği SMOTE öncesi veridir. SMOTE
+    ayrık sütunları (ör. Employed) ara değerlere çektiğinden bu sütunlar X
+    içinde kaynaktaki en yakın değere yuvarlanır; verilmezse X kullanılır.
+    """
+    varsayilan_yontem, varsayilan_boyut = varsayilan_arka_plan_ayarlari()
+    yontem = yontem or varsayilan_yontem
+    boyut = boyut or varsayilan_boyut
+    if yontem not in ARKA_PLAN_YONTEMLERI:
+        raise ValueError(f"Geçersiz arka plan yöntemi: {yontem}")
+
+    X = np.asarray(X, dtype=np.float64)
+    n = X.shape[0]
+    if ayrik_kaynak is not None:
+        degerler = _ayrik_degerler(ayrik_kaynak)
+        X = X.copy()
+        for j, tekil in degerler.items():
+            X[:, j] = _en_yakina_yuvarla(X[:, j], tekil)
+    else:
+        degerler = _ayrik_degerler(X)
+    if yontem == 'none' or n <= boyut:
+        return ArkaPlanOzeti(X, np.full(n, 1.0 / n), 'none', n)
+
+    ayrik = sorted(degerler)
+    katmanlar = _katmanlar(X, y, ayrik)
+    surekli = [j for j in range(X.shape[1]) if j not in ayrik]
+    paylar = _paylastir([len(idx) for idx in katmanlar], boyut)
+
+    parcalar, agirliklar = [], []
+    for idx, k in zip(katmanlar, paylar):
+        if not surekli:
+            temsilciler, agirlik = X[idx[:1]], np.array([float(len(idx))])
+        elif yontem == 'kmeans':
+            temsilciler, agirlik = _kmeans_ozeti(X[idx], k, surekli, random_state)
+        else:
+            temsilciler, agirlik = _quantile_ozeti(X[idx], k, surekli)
+        parcalar.append(temsilciler)
+        agirliklar.append(agirlik)
+
+    agirlik = np.concatenate(agirliklar)
+    ozet = ArkaPlanOzeti(np.concatenate(parcalar), agirlik / agirlik.sum(), yontem, n)
+    print(f"Arka plan özetlendi ({yontem}): {n} satır -> {len(ozet.X)} temsilci")
+    return ozet
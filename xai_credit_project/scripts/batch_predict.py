@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Toplu Tahmin
+JSON dizisi, CSV veya NDJSON olarak gelen başvuru kayıtlarını sütun bazında
+doğrulayıp tek bir NumPy matrisine dönüştürür ve modeli parça parça çalıştırır.
+"""
+
+import csv
+import io
+import json
+
+import numpy as np
+
+# API alan adları (sıra modeldeki FEATURE_COLUMNS ile aynı)
+INPUT_FIELDS = ['employed', 'bank_balance', 'annual_salary']
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def _kayitlari_oku(body, content_type):
+    """İstek gövdesini içerik türüne göre sözlük listesine çevir"""
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    text = body.decode('utf-8') if isinstance(body, bytes) else body
+
+    if content_type in ('text/csv', 'application/csv'):
+        return list(csv.DictReader(io.StringIO(text)))
+
+    if content_type in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+        kayitlar = []
+        for satir_no, satir in enumerate(text.splitlines()):
+            if not satir.strip():
+                continue
+            try:
+                kayitlar.append(json.loads(satir))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Geçersiz NDJSON satırı {satir_no}: {str(e)}")
+        return kayitlar
+
+    try:
+        kayitlar = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Geçersiz JSON: {str(e)}")
+    if isinstance(kayitlar, dict):
+        kayitlar = kayitlar.get('records')
+    if not isinstance(kayitlar, list):
+        raise ValueError("Gövde bir kayıt dizisi olmalı")
+    return kayitlar
+
+
+def kayitlari_matrise_donustur(kayitlar):
+    """Kayıtları sütun bazında doğrulayıp (n, 3) float64 matrise yerleştir"""
+    n = len(kayitlar)
+    X = np.empty((n, len(INPUT_FIELDS)), dtype=np.float64)
+
+    for j, alan in enumerate(INPUT_FIELDS):
+        try:
+            sutun = [kayit[alan] for kayit in kayitlar]
+        except (KeyError, TypeError):
+            eksik = next(i for i, kayit in enumerate(kayitlar)
+                         if not isinstance(kayit, dict) or alan not in kayit)
+            raise ValueError(f"Eksik alan: {alan} (satır {eksik})")
+        try:
+            X[:, j] = np.asarray(sutun, dtype=np.float64)
+        except (ValueError, TypeError):
+            hatali = next(i for i, deger in enumerate(sutun) if not _sayi_mi(deger))
+            raise ValueError(f"Geçersiz veri formatı: {alan} (satır {hatali})")
+
+    gecersiz = ~np.isfinite(X)
+    if gecersiz.any():
+        satir, sutun = np.argwhere(gecersiz)[0]
+        raise ValueError(f"Geçersiz veri formatı: {INPUT_FIELDS[sutun]} (satır {satir})")
+
+    return X
+
+
+def _sayi_mi(deger):
+    try:
+        float(deger)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def istek_govdesini_ayristir(body, content_type):
+    """İstek gövdesini doğrulanmış bir özellik matrisine çevir"""
+    kayitlar = _kayitlari_oku(body, content_type)
+    if not kayitlar:
+        raise ValueError("Boş kayıt listesi")
+    return kayitlari_matrise_donustur(kayitlar)
+
+
+def toplu_tahmin(pipeline, X, chunk_size=DEFAULT_CHUNK_SIZE):
+    """predict_proba'yı parça başına bir kez çalıştır, etiketleri olasılıklardan türet
+
+    X, hattın ölçeklemesiyle parça parça yerinde dönüştürülür.
+    """
+    n = X.shape[0]
+    proba = np.empty((n, len(pipeline.classes_)), dtype=np.float64)
+
+    for baslangic in range(0, n, chunk_size):
+        bitis = min(baslangic + chunk_size, n)
+        proba[baslangic:bitis] = pipeline.predict_proba(X[baslangic:bitis])
+
+    etiketler = pipeline.classes_[proba.argmax(axis=1)]
+    return etiketler, proba
@@ -0,0 +1,537 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark Paketi
+Eğitim ve servis hattının gerçek fonksiyonlarını (xai_credit_model ve Flask
+test istemcisi üzerinden API) Default_Fin.csv şemasındaki sentetik veri
+setlerinde ölçer. Her veri boyutu kendi sonuç ve paket dizinleriyle ayrı bir
+süreçte çalışır; böylece tepe bellek ölçümleri birbirini etkilemez. Giriş
+noktalarının soğuk içe aktarma süresi `python -X importtime` ile ölçülür ve
+tahmin servisinin ağır kütüphaneleri yüklemediği denetlenir. Ölçümler JSON
+olarak yazılır ve kayıtlı taban çizgisiyle karşılaştırılarak gerilemeler
+işaretlenir.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Script doğrudan çalıştırıldığında proje kökünü içe aktarma yoluna ekle
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.metrics import metrikler
+
+PROJE_DIZINI = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KAYNAK_VERI = os.path.join(PROJE_DIZINI, "data", "Default_Fin.csv")
+SENTETIK_DIZIN = os.path.join(
+    os.environ.get('KREDI_CACHE_DIR', os.path.join(PROJE_DIZINI, "cache")),
+    "benchmark_veri"
+)
+TABAN_DOSYASI = os.path.join(PROJE_DIZINI, "benchmarks", "baseline.json")
+SONUC_DOSYASI = os.path.join(
+    os.environ.get('KREDI_RESULTS_DIR', os.path.join(PROJE_DIZINI, "results")),
+    "benchmark_sonuclari.json"
+)
+
+# JSON biçimi değişirse artırılır (eski taban çizgileriyle karşılaştırılmaz)
+BENCHMARK_SURUMU = 1
+
+# Varsayılan boyutlar taban çizgisindekilerle aynıdır; 10m yalnızca --sizes ile ölçülür
+VARSAYILAN_BOYUTLAR = ('10k', '1m')
+
+# Bu orandan fazla yavaşlama veya bellek artışı gerileme sayılır
+GERILEME_TOLERANSI = 0.25
+# Gürültüyü gerileme saymamak için en küçük mutlak farklar
+MIN_FARK_SANIYE = 0.005
+MIN_FARK_MB = 16.0
+
+# Tahmin servisinin (api.app) başlangıçta yüklememesi gereken kütüphaneler
+AGIR_MODULLER = ('sklearn', 'pandas', 'imblearn', 'shap', 'lime', 'matplotlib', 'seaborn', 'openai')
+# Soğuk içe aktarma süresi izlenen giriş noktaları
+GIRIS_NOKTALARI = (
+    'api.app', 'scripts.training', 'scripts.explanation', 'scripts.report', 'scripts.xai_credit_model'
+)
+ICE_AKTARMA_TEKRARI = 3
+
+# Sürekli sütunlara eklenen gürültünün sütun standart sapmasına oranı
+GURULTU_ORANI = 0.05
+URETIM_PARCASI = 1_000_000
+
+
+def boyut_ayristir(metin):
+    """'10k', '1m', '10m' veya tam sayı biçimindeki satır sayısını çöz"""
+    metin = str(metin).strip().lower().replace('_', '')
+    carpan = {'k': 1_000, 'm': 1_000_000}.get(metin[-1:], 1)
+    try:
+        satir = int(float(metin[:-1] if carpan > 1 else metin) * carpan)
+    except ValueError:
+        raise ValueError(f"Geçersiz veri boyutu: {metin}")
+    if satir < 100:
+        raise ValueError(f"Veri boyutu en az 100 satır olmalı: {metin}")
+    return satir
+
+
+def boyut_etiketi(satir):
+    for ek, carpan in (('m', 1_000_000), ('k', 1_000)):
+        if satir % carpan == 0:
+            return f"{satir // carpan}{ek}"
+    return str(satir)
+
+
+def sentetik_veri_uret(satir, hedef, kaynak=KAYNAK_VERI, random_state=42):
+    """Kaynak veriden yeniden örnekleyip gürültü ekleyerek sentetik CSV yaz
+
+    Satırlar kaynaktan yerine koyarak seçilir, böylece özellikler ile hedef
+    arasındaki ilişki ve sınıf oranı korunur. Bakiye ve maaşa sütun standart
+    sapmasıyla orantılı gürültü eklenir. Dosya parça parça yazılır; bellek
+    kullanımı satır sayısından bağımsızdır.
+    """
+    kaynak_df = pd.read_csv(kaynak)
+    surekli = ['Bank Balance', 'Annual Salary']
+    sapma = kaynak_df[surekli].std().to_numpy() * GURULTU_ORANI
+    rng = np.random.default_rng(random_state)
+
+    os.makedirs(os.path.dirname(hedef), exist_ok=True)
+    gecici = hedef + ".tmp"
+    for baslangic in range(0, satir, URETIM_PARCASI):
+        adet = min(URETIM_PARCASI, satir - baslangic)
+        parca = kaynak_df.iloc[rng.integers(0, len(kaynak_df), size=adet)].reset_index(drop=True)
+        parca[surekli] = np.maximum(
+            parca[surekli].to_numpy() + rng.normal(0.0, sapma, size=(adet, len(surekli))), 0.0
+        ).round(2)
+        parca['Index'] = np.arange(baslangic + 1, baslangic + adet + 1)
+        parca.to_csv(gecici, mode='w' if baslangic == 0 else 'a', header=baslangic == 0, index=False)
+    os.replace(gecici, hedef)
+    return hedef
+
+
+def sentetik_veri(satir, random_state=42):
+    """Satır sayısı için sentetik CSV'nin yolu (yoksa bir kez üretilir)"""
+    yol = os.path.join(SENTETIK_DIZIN, f"default_fin_{boyut_etiketi(satir)}_{random_state}.csv")
+    if not os.path.exists(yol):
+        print(f"Sentetik veri üretiliyor: {yol}")
+        sentetik_veri_uret(satir, yol, random_state=random_state)
+    return yol
+
+
+def _ozet(olcum):
+    return {
+        'saniye': round(olcum['wall_seconds'], 6),
+        'cpu_saniye': round(olcum['cpu_seconds'], 6),
+        'tepe_mb': round(olcum['peak_rss_bytes'] / 1024 ** 2, 2)
+    }
+
+
+@contextmanager
+def _asama(sonuc, ad):
+    """Bloğun süresini, CPU süresini ve tepe belleğini sonuc[ad] altına yaz"""
+    with metrikler.asama(f'benchmark_{ad}') as olcum:
+        yield
+    sonuc[ad] = _ozet(olcum)
+
+
+def _tekrarla(sonuc, ad, fn, tekrar):
+    """fn(i)'yi tekrar kez çağır; saniye medyan çağrı süresidir"""
+    sureler = []
+    with metrikler.asama(f'benchmark_{ad}') as olcum:
+        for i in range(tekrar):
+            baslangic = time.perf_counter()
+            fn(i)
+            sureler.append(time.perf_counter() - baslangic)
+    kayit = _ozet(olcum)
+    kayit.update(
+        saniye=round(float(np.median(sureler)), 6),
+        p95_saniye=round(float(np.percentile(sureler, 95)), 6),
+        cpu_saniye=round(olcum['cpu_seconds'] / tekrar, 6),
+        tekrar=tekrar
+    )
+    sonuc[ad] = kayit
+
+
+def _basarili(yanit):
+    if yanit.status_code != 200:
+        raise RuntimeError(f"API isteği başarısız ({yanit.status_code}): {yanit.get_data(as_text=True)[:500]}")
+    return yanit
+
+
+# Yeni bir yorumlayıcıda modülü içe aktarıp süre, bellek ve yüklü modülleri yazdırır
+_ICE_AKTARMA_KODU = """
+import importlib, json, sys, time
+baslangic = time.perf_counter()
+importlib.import_module({modul!r})
+sure = time.perf_counter() - baslangic
+from scripts.metrics import _hwm_bayt
+print(json.dumps({{
+    'saniye': sure, 'cpu_saniye': time.process_time(), 'tepe_bayt': _hwm_bayt(), 'moduller': sorted(sys.modules)
+}}))
+"""
+
+
+def _importtime_ayristir(stderr, adet=10):
+    """-X importtime çıktısından kendi süresi en uzun modüller (ms)"""
+    sureler = []
+    for satir in stderr.splitlines():
+        if not satir.startswith('import time:') or 'self [us]' in satir:
+            continue
+        kendi, _, ad = satir[len('import time:'):].split('|')
+        sureler.append((ad.strip(), int(kendi) / 1000))
+    sureler.sort(key=lambda kayit: -kayit[1])
+    return [[ad, round(ms, 2)] for ad, ms in sureler[:adet]]
+
+
+def ice_aktarma_olc(modul, ortam=None, tekrar=ICE_AKTARMA_TEKRARI):
+    """Modülün soğuk içe aktarma süresini yeni yorumlayıcılarda ölç
+
+    saniye medyan içe aktarma süresidir. agir_moduller, AGIR_MODULLER içinden
+    içe aktarma sonunda yüklü olanlar; en_yavas, -X importtime'a göre kendi
+    süresi en uzun modüllerdir.
+    """
+    ortam = dict(os.environ, **(ortam or {}))
+    ortam['PYTHONPATH'] = os.pathsep.join(filter(None, [PROJE_DIZINI, ortam.get('PYTHONPATH')]))
+    olcumler = []
+    for _ in range(tekrar):
+        cikti = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _ICE_AKTARMA_KODU.format(modul=modul)],
+            cwd=PROJE_DIZINI, env=ortam, capture_output=True, text=True
+        )
+        if cikti.returncode != 0:
+            raise RuntimeError(f"{modul} içe aktarılamadı:\n{cikti.stderr[-2000:]}")
+        olcum = json.loads(cikti.stdout.strip().splitlines()[-1])
+        olcum['en_yavas'] = _importtime_ayristir(cikti.stderr)
+        olcumler.append(olcum)
+
+    son = olcumler[-1]
+    return {
+        'saniye': round(float(np.median([o['saniye'] for o in olcumler])), 6),
+        'cpu_saniye': round(float(np.median([o['cpu_saniye'] for o in olcumler])), 6),
+        'tepe_mb': round(float(np.median([o['tepe_bayt'] for o in olcumler])) / 1024 ** 2, 2),
+        'modul_sayisi': len(son['moduller']),
+        'agir_moduller': [ad for ad in AGIR_MODULLER if ad in son['moduller']],
+        'en_yavas': son['en_yavas'],
+        'tekrar': tekrar
+    }
+
+
+def giris_noktalarini_olc():
+    """Giriş noktalarının model paketi olmadan soğuk içe aktarma ölçümleri"""
+    bos = tempfile.mkdtemp(prefix="kredi_benchmark_bos_")
+    sonuc = {}
+    for modul in GIRIS_NOKTALARI:
+        sonuc[modul] = ice_aktarma_olc(modul, {'KREDI_ARTIFACTS_DIR': bos, 'KREDI_RESULTS_DIR': bos})
+        print(f"{modul:<26} {sonuc[modul]['saniye'] * 1000:>8.1f} ms  {sonuc[modul]['tepe_mb']:>6.1f} MB  "
+              f"ağır: {', '.join(sonuc[modul]['agir_moduller']) or '-'}")
+    return sonuc
+
+
+def boyutu_olc(satir, ayarlar):
+    """Tek bir veri boyutu için tüm aşamaları ölç (ayrı süreçte çalışır)
+
+    Sonuç, paket ve SHAP dizinleri geçici bir klasöre yönlendirilir; proje
+    altındaki results/ ve artifacts/ değişmez.
+    """
+    calisma = tempfile.mkdtemp(prefix=f"kredi_benchmark_{boyut_etiketi(satir)}_")
+    os.environ.update(
+        KREDI_RESULTS_DIR=os.path.join(calisma, "results"),
+        KREDI_ARTIFACTS_DIR=os.path.join(calisma, "artifacts"),
+        KREDI_AI_CLIENT='none'
+    )
+    os.makedirs(os.environ['KREDI_RESULTS_DIR'], exist_ok=True)
+
+    import matplotlib
+    matplotlib.use('Agg')
+    from sklearn.model_selection import train_test_split
+    from scripts.artifacts import artifact_kaydet
+    from scripts.background import arka_plan_ozetle
+    from scripts.compiled_forest import ormani_derle
+    from scripts.explanation import LimeAyarlari, lime_aciklamalar, shap_aciklamalar
+    from scripts.interpretation import YORUM_YOK
+    from scripts.pipeline import InferencePipeline
+    from scripts.report import create_html_report
+    from scripts.training import model_performansi, orman_egit, smote_uygula, veri_yukle_ve_onisle
+
+    n_jobs = ayarlar['n_jobs']
+    tekrar = ayarlar['tekrar']
+    agac_ayarlari = {'n_estimators': ayarlar['agac']} if ayarlar['agac'] else {}
+    veri_yolu = sentetik_veri(satir)
+
+    sonuc = {}
+    with _asama(sonuc, 'veri_yukleme'):
+        X_scaled, y, df, X_orig, scaler = veri_yukle_ve_onisle(
+            return_scaler=True, onbellek=False, veri_yolu=veri_yolu
+        )
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_scaled, y, test_size=0.2, random_state=42, stratify=y
+    )
+    with _asama(sonuc, 'smote'):
+        X_bal, y_bal = smote_uygula(X_train, y_train, n_jobs)
+    with _asama(sonuc, 'egitim'):
+        model = orman_egit(X_bal, y_bal, n_jobs, **agac_ayarlari)
+    with _asama(sonuc, 'orman_derleme'):
+        forest = ormani_derle(model, X_test)
+    with _asama(sonuc, 'arka_plan_ozeti'):
+        ozet = arka_plan_ozetle(X_bal, y_bal, ayrik_kaynak=X_train)
+    # API eğitim işi gibi dengelenmiş set özetten sonra bırakılır
+    egitim_satiri = int(len(X_bal))
+    del X_bal, y_bal
+
+    pipeline = InferencePipeline.from_scaler(model, scaler, engine=forest)
+    X_test_ham = X_orig.loc[X_test.index]
+    with _asama(sonuc, 'toplu_tahmin'):
+        performans, y_pred = model_performansi(pipeline, X_test_ham, y_test)
+    satirlar = X_test_ham.to_numpy(dtype=np.float64)[:tekrar]
+    # Pipeline NumPy girdileri yerinde ölçekler; her çağrı kendi kopyasını alır
+    _tekrarla(sonuc, 'tek_satir_tahmin', lambda i: pipeline.predict_proba(satirlar[i % len(satirlar)].copy()), tekrar)
+
+    aciklanan = X_test.iloc[:ayarlar['aciklama_satiri']]
+    with _asama(sonuc, 'shap'):
+        # CLI ve API ile aynı yol: açıklayıcılar özetlenmiş arka planı kullanır
+        shap_aciklamalar(model, ozet.X, aciklanan, depo_dizini=os.path.join(calisma, "shap"))
+    with _asama(sonuc, 'lime'):
+        lime_aciklamalar(model, ozet.X, aciklanan, ayarlar=LimeAyarlari(random_state=42), agirlik=ozet.agirlik)
+    with _asama(sonuc, 'rapor'):
+        create_html_report(
+            model, X_orig, X_scaled, y, df, performans, y_test, y_pred, YORUM_YOK, n_jobs=1
+        )
+
+    # API, eğitilen modelin paketiyle başlar (geçici paket dizini)
+    artifact_kaydet(model, scaler, ozet.X, forest=forest, background_weights=ozet.agirlik)
+    # Yalnızca tahmin yapan bir sürecin soğuk başlangıcı: içe aktarma + paket yükleme
+    sonuc['api_baslatma'] = ice_aktarma_olc('api.app', {
+        'KREDI_ARTIFACTS_DIR': os.environ['KREDI_ARTIFACTS_DIR'],
+        'KREDI_RESULTS_DIR': os.environ['KREDI_RESULTS_DIR']
+    })
+    from api.app import app
+    istemci = app.test_client()
+    kayitlar = [
+        {'employed': int(e), 'bank_balance': float(b), 'annual_salary': float(m)}
+        for e, b, m in X_test_ham.to_numpy()[:max(tekrar, ayarlar['api_toplu_satir'])]
+    ]
+    for explainer in ('shap', 'lime'):
+        _tekrarla(sonuc, f'api_tahmin_{explainer}', lambda i: _basarili(istemci.post(
+            f'/api/predict?explainer={explainer}', json=kayitlar[i % len(kayitlar)]
+        )), tekrar)
+    with _asama(sonuc, 'api_toplu_tahmin'):
+        _basarili(istemci.post('/api/predict/batch', json=kayitlar[:ayarlar['api_toplu_satir']]))
+
+    return {
+        'satir_sayisi': int(satir),
+        'temiz_satir_sayisi': int(len(X_scaled)),
+        'egitim_satiri': egitim_satiri,
+        'roc_auc': round(float(performans['roc_auc']), 4),
+        'ayarlar': ayarlar,
+        'asamalar': sonuc
+    }
+
+
+def ortam_bilgisi():
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+
+def calistir(boyutlar, ayarlar):
+    """Her boyutu yeni bir süreçte ölç ve sonuç belgesini döndür"""
+    sonuc = {'surum': BENCHMARK_SURUMU, 'ortam': ortam_bilgisi(), 'boyutlar': {}}
+    for satir in boyutlar:
+        etiket = boyut_etiketi(satir)
+        print(f"\n=== {etiket} satır ===")
+        # spawn: her boyut temiz bir süreçte; tepe bellek ve içe aktarma durumu paylaşılmaz
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as havuz:
+            sonuc['boyutlar'][etiket] = havuz.submit(boyutu_olc, satir, ayarlar).result()
+    return sonuc
+
+
+def _asamalari_karsilastir(etiket, asamalar, eski_asamalar, tolerans):
+    gerilemeler = []
+    for asama, olcum in asamalar.items():
+        eski = eski_asamalar.get(asama)
+        if eski is None:
+            continue
+        for olcu, min_fark in (('saniye', MIN_FARK_SANIYE), ('tepe_mb', MIN_FARK_MB)):
+            fark = olcum[olcu] - eski[olcu]
+            if fark > min_fark and fark > eski[olcu] * tolerans:
+                gerilemeler.append({
+                    'boyut': etiket, 'asama': asama, 'olcu': olcu,
+                    'taban': eski[olcu], 'simdiki': olcum[olcu],
+                    'degisim': round(fark / eski[olcu], 4) if eski[olcu] else None
+                })
+        yeni_agir = [ad for ad in olcum.get('agir_moduller', []) if ad not in eski.get('agir_moduller', [])]
+        if yeni_agir:
+            gerilemeler.append({
+                'boyut': etiket, 'asama': asama, 'olcu': 'agir_moduller',
+                'taban': eski.get('agir_moduller', []), 'simdiki': olcum['agir_moduller'], 'degisim': None
+            })
+    return gerilemeler
+
+
+def servis_kontrolu(sonuc):
+    """Tahmin servisinin başlangıçta ağır kütüphane yüklediği ölçümler
+
+    Taban çizgisinden bağımsızdır: api.app yalnızca NumPy ve model paketini
+    yüklemelidir.
+    """
+    olcumler = [('ice_aktarma', 'api.app', sonuc.get('ice_aktarma', {}).get('api.app'))]
+    olcumler += [
+        (etiket, 'api_baslatma', boyut['asamalar'].get('api_baslatma'))
+        for etiket, boyut in sonuc['boyutlar'].items()
+    ]
+    return [
+        {'boyut': etiket, 'asama': asama, 'olcu': 'agir_moduller',
+         'taban': [], 'simdiki': olcum['agir_moduller'], 'degisim': None}
+        for etiket, asama, olcum in olcumler
+        if olcum is not None and olcum['agir_moduller']
+    ]
+
+
+def karsilastir(sonuc, taban, tolerans=GERILEME_TOLERANSI):
+    """Taban çizgisine göre yavaşlayan veya daha fazla bellek kullanan aşamalar
+
+    Yalnızca aynı ayarlarla ölçülmüş boyutlar karşılaştırılır. Giriş
+    noktalarının içe aktarma ölçümleri 'ice_aktarma' adıyla karşılaştırılır.
+    """
+    gerilemeler = []
+    if taban.get('surum') != sonuc['surum']:
+        print("Taban çizgisi farklı bir benchmark sürümüne ait; karşılaştırılmadı")
+        return gerilemeler
+    if taban.get('ortam', {}).get('cpu_count') != sonuc['ortam']['cpu_count']:
+        print("Uyarı: taban çizgisi farklı çekirdek sayısına sahip bir makinede ölçülmüş")
+
+    if 'ice_aktarma' in sonuc and 'ice_aktarma' in taban:
+        gerilemeler += _asamalari_karsilastir('ice_aktarma', sonuc['ice_aktarma'], taban['ice_aktarma'], tolerans)
+
+    for etiket, boyut in sonuc['boyutlar'].items():
+        onceki = taban.get('boyutlar', {}).get(etiket)
+        if onceki is None:
+            print(f"{etiket}: taban çizgisinde yok")
+            continue
+        if onceki['ayarlar'] != boyut['ayarlar']:
+            print(f"{etiket}: taban çizgisi farklı ayarlarla ölçülmüş; karşılaştırılmadı")
+            continue
+        gerilemeler += _asamalari_karsilastir(etiket, boyut['asamalar'], onceki['asamalar'], tolerans)
+    return gerilemeler
+
+
+def tabani_guncelle(sonuc, yol=TABAN_DOSYASI):
+    """Ölçülen boyutları taban çizgisine yaz (diğer boyutlar korunur)"""
+    taban = taban_yukle(yol)
+    if taban is None or taban.get('surum') != sonuc['surum']:
+        taban = {'surum': sonuc['surum'], 'boyutlar': {}}
+    taban['ortam'] = sonuc['ortam']
+    taban['boyutlar'].update(sonuc['boyutlar'])
+    if 'ice_aktarma' in sonuc:
+        taban['ice_aktarma'] = sonuc['ice_aktarma']
+    os.makedirs(os.path.dirname(yol), exist_ok=True)
+    with open(yol, "w", encoding="utf-8") as f:
+        json.dump(taban, f, ensure_ascii=False, indent=2)
+    print(f"Taban çizgisi güncellendi: {yol}")
+
+
+def taban_yukle(yol=TABAN_DOSYASI):
+    try:
+        with open(yol, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def ozet_yazdir(sonuc, gerilemeler):
+    isaretli = {(g['boyut'], g['asama']) for g in gerilemeler}
+    if sonuc.get('ice_aktarma'):
+        print("\nİçe aktarma")
+        for modul, olcum in sonuc['ice_aktarma'].items():
+            isaret = "  GERİLEME" if ('ice_aktarma', modul) in isaretli else ""
+            print(f"  {modul:<26} {olcum['saniye'] * 1000:>8.1f} ms  {olcum['tepe_mb']:>7.1f} MB  "
+                  f"{olcum['modul_sayisi']:>5} modül{isaret}")
+    for etiket, boyut in sonuc['boyutlar'].items():
+        print(f"\n{etiket} ({boyut['temiz_satir_sayisi']} temiz satır, AUC={boyut['roc_auc']:.4f})")
+        for asama, olcum in boyut['asamalar'].items():
+            isaret = "  GERİLEME" if (etiket, asama) in isaretli else ""
+            print(f"  {asama:<18} {olcum['saniye'] * 1000:>11.2f} ms  "
+                  f"CPU {olcum['cpu_saniye'] * 1000:>11.2f} ms  {olcum['tepe_mb']:>8.1f} MB{isaret}")
+    for g in gerilemeler:
+        print(f"GERİLEME {g['boyut']}/{g['asama']} {g['olcu']}: {g['taban']} -> {g['simdiki']}")
+
+
+def arguman_ayristir(argv=None):
+    parser = argparse.ArgumentParser(description="Eğitim ve servis hattı benchmark paketi")
+    parser.add_argument('--sizes', nargs='+', default=list(VARSAYILAN_BOYUTLAR), metavar='N',
+                        help="Sentetik veri boyutları (ör. 10k 1m 10m)")
+    parser.add_argument('--trees', type=int, default=None,
+                        help="Orman ağaç sayısı (varsayılan: MODEL_AYARLARI)")
+    parser.add_argument('--n-jobs', type=int, default=None,
+                        help="Eğitim çekirdek sayısı (varsayılan: KREDI_N_JOBS veya tüm çekirdekler)")
+    parser.add_argument('--repeat', type=int, default=20,
+                        help="Tek satır ve API tahminleri için tekrar sayısı")
+    parser.add_argument('--explain-rows', type=int, default=200,
+                        help="SHAP ile açıklanan test satırı sayısı")
+    parser.add_argument('--api-batch-rows', type=int, default=1000,
+                        help="/api/predict/batch isteğindeki satır sayısı")
+    parser.add_argument('--baseline', default=TABAN_DOSYASI, help="Taban çizgisi JSON dosyası")
+    parser.add_argument('--output', default=SONUC_DOSYASI, help="Sonuç JSON dosyası")
+    parser.add_argument('--tolerance', type=float, default=GERILEME_TOLERANSI,
+                        help="Gerileme sayılan göreli yavaşlama / bellek artışı")
+    parser.add_argument('--import-only', action='store_true',
+                        help="Yalnızca giriş noktalarının içe aktarma süresini ölç")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Sonuçları taban çizgisi olarak kaydet")
+    args = parser.parse_args(argv)
+    try:
+        args.sizes = [boyut_ayristir(boyut) for boyut in args.sizes]
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv=None):
+    """Benchmark'ları çalıştır; gerileme varsa 1 döndür"""
+    args = arguman_ayristir(argv)
+    ayarlar = {
+        'agac': args.trees,
+        'n_jobs': args.n_jobs,
+        'tekrar': args.repeat,
+        'aciklama_satiri': args.explain_rows,
+        'api_toplu_satir': args.api_batch_rows
+    }
+    sonuc = calistir([] if args.import_only else args.sizes, ayarlar)
+    print("\n=== İçe aktarma ===")
+    sonuc['ice_aktarma'] = giris_noktalarini_olc()
+
+    taban = taban_yukle(args.baseline)
+    gerilemeler = karsilastir(sonuc, taban, args.tolerance) if taban else []
+    gerilemeler += servis_kontrolu(sonuc)
+    sonuc['taban_cizgisi'] = args.baseline if taban else None
+    sonuc['gerilemeler'] = gerilemeler
+    ozet_yazdir(sonuc, gerilemeler)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(sonuc, f, ensure_ascii=False, indent=2)
+    print(f"\nBenchmark sonuçları kaydedildi: {args.output}")
+
+    if args.update_baseline:
+        tabani_guncelle({k: sonuc[k] for k in ('surum', 'ortam', 'boyutlar', 'ice_aktarma')}, args.baseline)
+        return 0
+    return 1 if gerilemeler else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
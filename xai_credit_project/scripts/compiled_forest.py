@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Derlenmiş Orman
+Eğitilmiş RandomForestClassifier'ın tüm ağaçlarını bitişik NumPy dizilerine
+(özellik, eşik, çocuklar, yaprak olasılığı) düzleştirir. Tahmin, tüm
+satırlar ve ağaçlar için derinlik kadar vektörel adımla yapılır; scikit-learn'ün
+ağaç başına Python ve joblib yükü ortadan kalkar.
+"""
+
+import time
+
+import numpy as np
+
+from scripts.metrics import olculen
+
+# Derlenmiş orman ile scikit-learn olasılıkları arasındaki izin verilen en büyük fark
+DERLEME_TOLERANSI = 1e-6
+
+# Satır x ağaç düğüm dizilerinin belleği sınırlı kalsın diye parça boyutu
+EVAL_CHUNK_ROWS = 1024
+
+
+class FlatForest:
+    """Düz dizilere derlenmiş ikili sınıflandırma ormanı"""
+
+    def __init__(self, feature, threshold, children, value, roots, depth, classes):
+        self.feature = np.asarray(feature, dtype=np.int8)
+        self.threshold = np.asarray(threshold, dtype=np.float32)
+        # Satır 2*i sol, 2*i+1 sağ çocuk: sonraki düğüm children[2*düğüm + (x > eşik)]
+        self.children = np.asarray(children, dtype=np.int32).reshape(-1)
+        self.value = np.asarray(value, dtype=np.float32)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.depth = int(depth)
+        self.classes_ = np.asarray(classes)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Ormanın ağaçlarını tek bir düğüm dizisinde birleştir
+
+        Yapraklar kendilerine döner (eşik +inf), böylece her satır sabit sayıda
+        adımda yaprağa ulaşır. Eşikler float32'ye aşağı yuvarlanır: float32
+        girdiler için x <= eşik karşılaştırması scikit-learn ile birebir aynıdır.
+        """
+        if len(model.classes_) != 2:
+            raise ValueError("Yalnızca ikili sınıflandırma ormanları derlenebilir")
+
+        parcalar = {'feature': [], 'threshold': [], 'children': [], 'value': []}
+        roots, depth, offset = [], 0, 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            yaprak = tree.children_left < 0
+            idx = np.arange(tree.node_count)
+
+            esik = tree.threshold.astype(np.float32)
+            fazla = esik > tree.threshold
+            esik[fazla] = np.nextafter(esik[fazla], np.float32(-np.inf))
+            esik[yaprak] = np.inf
+
+            deger = tree.value[:, 0, :]
+            parcalar['feature'].append(np.where(yaprak, 0, tree.feature))
+            parcalar['threshold'].append(esik)
+            parcalar['children'].append(np.column_stack([
+                np.where(yaprak, idx, tree.children_left),
+                np.where(yaprak, idx, tree.children_right)
+            ]) + offset)
+            parcalar['value'].append(deger[:, 1] / deger.sum(axis=1))
+
+            roots.append(offset)
+            depth = max(depth, tree.max_depth)
+            offset += tree.node_count
+
+        return cls(
+            roots=roots, depth=depth, classes=model.classes_,
+            **{ad: np.concatenate(dizi) for ad, dizi in parcalar.items()}
+        )
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    @property
+    def nbytes(self):
+        return sum(dizi.nbytes for dizi in self._diziler().values())
+
+    def _diziler(self):
+        return {
+            'feature': self.feature, 'threshold': self.threshold, 'children': self.children,
+            'value': self.value, 'roots': self.roots
+        }
+
+    def _pozitif_olasilik(self, X):
+        n, n_features = X.shape
+        # Satır satır düzleştirilmiş X içinde her satırın başlangıcı
+        satir_basi = (np.arange(n, dtype=np.int32) * n_features)[:, None]
+        duz = X.ravel()
+        node = np.broadcast_to(self.roots, (n, len(self.roots)))
+        for _ in range(self.depth):
+            x = np.take(duz, satir_basi + np.take(self.feature, node))
+            sag = x > np.take(self.threshold, node)
+            node = np.take(self.children, node * 2 + sag)
+        return np.take(self.value, node).mean(axis=1, dtype=np.float64)
+
+    def predict_proba(self, X):
+        """(n, 2) olasılık matrisi; girdiler scikit-learn gibi float32'ye çevrilir"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        pozitif = np.empty(X.shape[0], dtype=np.float64)
+        for baslangic in range(0, X.shape[0], EVAL_CHUNK_ROWS):
+            bitis = baslangic + EVAL_CHUNK_ROWS
+            pozitif[baslangic:bitis] = self._pozitif_olasilik(X[baslangic:bitis])
+        return np.column_stack([1.0 - pozitif, pozitif])
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def kaydet(self, yol):
+        """Dizileri sıkıştırmasız tek bir .npz dosyasına yaz"""
+        np.savez(yol, depth=self.depth, classes=self.classes_, **self._diziler())
+
+    @classmethod
+    def yukle(cls, yol):
+        with np.load(yol) as veri:
+            return cls(
+                veri['feature'], veri['threshold'], veri['children'],
+                veri['value'], veri['roots'], int(veri['depth']), veri['classes']
+            )
+
+
+def parite_farki(forest, model, X):
+    """Derlenmiş orman ile scikit-learn olasılıkları arasındaki en büyük mutlak fark"""
+    X = np.asarray(X, dtype=np.float64)
+    return float(np.abs(forest.predict_proba(X) - model.predict_proba(X)).max())
+
+
+@olculen()
+def ormani_derle(model, X_dogrulama, tolerans=DERLEME_TOLERANSI):
+    """Ormanı derle ve doğrulama satırlarında scikit-learn ile karşılaştır
+
+    Fark toleransı aşarsa ValueError fırlatılır; derlenmiş orman hiçbir zaman
+    doğrulanmadan kullanılmaz.
+    """
+    forest = FlatForest.from_sklearn(model)
+    fark = parite_farki(forest, model, X_dogrulama)
+    if fark > tolerans:
+        raise ValueError(f"Derlenmiş orman scikit-learn ile uyuşmuyor (fark: {fark:.2e})")
+    print(f"Orman derlendi: {forest.n_estimators} ağaç, {len(forest.value)} düğüm, "
+          f"{forest.nbytes / 1024:.0f} KB (en büyük fark: {fark:.2e})")
+    return forest
+
+
+def sklearn_nbytes(model):
+    """scikit-learn ağaçlarının düğüm ve değer dizilerinin toplam boyutu"""
+    toplam = 0
+    for estimator in model.estimators_:
+        durum = estimator.tree_.__getstate__()
+        toplam += durum['nodes'].nbytes + durum['values'].nbytes
+    return toplam
+
+
+def _sure(fn, tekrar):
+    """fn()'in tekrar çağrısı üzerinden medyan süresi (saniye)"""
+    sureler = []
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        fn()
+        sureler.append(time.perf_counter() - baslangic)
+    return float(np.median(sureler))
+
+
+def cikarim_benchmark(model, forest, X, tekrar=50):
+    """Tek satır ve toplu tahmin gecikmesini ve belleği iki motor için karşılaştır"""
+    X = np.asarray(X, dtype=np.float64)
+    satir = X[:1]
+    sonuc = {
+        'satir_sayisi': int(X.shape[0]),
+        'parite_farki': parite_farki(forest, model, X),
+        'sklearn': {
+            'tek_satir_ms': _sure(lambda: model.predict_proba(satir), tekrar) * 1000,
+            'toplu_ms': _sure(lambda: model.predict_proba(X), max(tekrar // 10, 1)) * 1000,
+            'bellek_kb': sklearn_nbytes(model) / 1024
+        },
+        'derlenmis': {
+            'tek_satir_ms': _sure(lambda: forest.predict_proba(satir), tekrar) * 1000,
+            'toplu_ms': _sure(lambda: forest.predict_proba(X), max(tekrar // 10, 1)) * 1000,
+            'bellek_kb': forest.nbytes / 1024
+        }
+    }
+    for motor in ('sklearn', 'derlenmis'):
+        bilgi = sonuc[motor]
+        print(f"{motor:<10} tek satır={bilgi['tek_satir_ms']:.3f} ms  "
+              f"{X.shape[0]} satır={bilgi['toplu_ms']:.1f} ms  bellek={bilgi['bellek_kb']:.0f} KB")
+    print(f"En büyük olasılık farkı: {sonuc['parite_farki']:.2e}")
+    return sonuc
@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Ortak Ayarlar
+Sonuç klasörü ve ortam değişkeni yardımcıları. Eğitim, açıklama ve rapor
+modülleri tarafından paylaşılır; içe aktarılması dosya sistemine dokunmaz.
+"""
+
+import os
+
+RESULTS_DIR = os.environ.get(
+    'KREDI_RESULTS_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "results")
+)
+
+
+def sonuc_yolu(ad):
+    """Sonuç klasöründeki dosyanın yolu; klasör ilk yazımdan önce oluşturulur"""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    return os.path.join(RESULTS_DIR, ad)
+
+
+def ortam_int(ad):
+    """Tam sayı ortam değişkeni; tanımsız veya boşsa None"""
+    deger = os.getenv(ad)
+    return int(deger) if deger not in (None, '') else None
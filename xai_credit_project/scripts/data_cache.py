@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Ön İşlenmiş Veri Önbelleği
+veri_yukle_ve_onisle() çıktısını sütun bazında .npy dosyaları olarak saklar.
+Anahtar, kaynak CSV'nin içerik özeti ile ön işleme ayarlarından türetilir;
+CSV veya ayarlar değiştiğinde önbellek kendiliğinden geçersiz olur. Geçerli
+önbellek bellek eşlemeli (kopyasız) yüklenir.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+CACHE_DIR = os.environ.get(
+    'KREDI_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+)
+
+# Önbellek biçimi değişirse artırılır
+CACHE_FORMAT = 1
+CACHE_KEEP = 3
+
+META_FILE = "meta.json"
+HASH_INDEX_FILE = "hash_index.json"
+
+FEATURE_COLUMNS = ['Employed', 'Bank Balance', 'Annual Salary']
+TARGET_COLUMN = 'Defaulted?'
+
+
+def dosya_ozeti(veri_yolu, cache_dir=None):
+    """CSV içeriğinin SHA-256 özeti
+
+    Dosyanın boyutu ve değişiklik zamanı aynı kaldıkça önceki özet yeniden
+    kullanılır; böylece büyük dosyalar her çalıştırmada yeniden okunmaz.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    bilgi = os.stat(veri_yolu)
+    imza = f"{os.path.abspath(veri_yolu)}:{bilgi.st_size}:{bilgi.st_mtime_ns}"
+    indeks_yolu = os.path.join(cache_dir, HASH_INDEX_FILE)
+
+    indeks = {}
+    if os.path.exists(indeks_yolu):
+        try:
+            with open(indeks_yolu, encoding="utf-8") as f:
+                indeks = json.load(f)
+        except (OSError, ValueError):
+            indeks = {}
+    if imza in indeks:
+        return indeks[imza]
+
+    ozet = hashlib.sha256()
+    with open(veri_yolu, "rb") as f:
+        for blok in iter(lambda: f.read(1 << 20), b""):
+            ozet.update(blok)
+    ozet = ozet.hexdigest()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    indeks[imza] = ozet
+    gecici = indeks_yolu + ".tmp"
+    with open(gecici, "w", encoding="utf-8") as f:
+        json.dump(indeks, f)
+    os.replace(gecici, indeks_yolu)
+    return ozet
+
+
+def onbellek_anahtari(veri_yolu, ayarlar, cache_dir=None):
+    """İçerik özeti + ön işleme ayarlarından önbellek anahtarı üret"""
+    icerik = {
+        'format': CACHE_FORMAT,
+        'source_sha256': dosya_ozeti(veri_yolu, cache_dir),
+        'settings': ayarlar
+    }
+    return hashlib.sha256(json.dumps(icerik, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def onbellege_yaz(anahtar, X_scaled, y, df, scaler, cache_dir=None):
+    """Ön işlenmiş veriyi sütun bazında .npy dosyalarına yaz"""
+    cache_dir = cache_dir or CACHE_DIR
+    hedef = os.path.join(cache_dir, anahtar)
+    gecici = hedef + ".tmp"
+    shutil.rmtree(gecici, ignore_errors=True)
+    os.makedirs(gecici)
+
+    np.save(os.path.join(gecici, "index.npy"), df.index.to_numpy())
+    df_sutunlari = []
+    for i, col in enumerate(df.columns):
+        np.save(os.path.join(gecici, f"df_{i}.npy"), df[col].to_numpy())
+        df_sutunlari.append(col)
+    for i, col in enumerate(FEATURE_COLUMNS):
+        np.save(os.path.join(gecici, f"scaled_{i}.npy"), X_scaled[col].to_numpy())
+
+    meta_yaz(gecici, df_sutunlari, len(df), scaler)
+
+    shutil.rmtree(hedef, ignore_errors=True)
+    os.replace(gecici, hedef)
+    print(f"Ön işlenmiş veri önbelleğe yazıldı: {hedef}")
+    eski_onbellekleri_temizle(cache_dir)
+
+
+def meta_yaz(klasor, df_sutunlari, satir, scaler):
+    """Sütun dosyaları yazılmış klasörü meta.json ile tamamla (en son yazılır)"""
+    meta = {
+        'df_columns': list(df_sutunlari),
+        'rows': int(satir),
+        'scaler': {
+            'mean': scaler.mean_.tolist(),
+            'var': scaler.var_.tolist(),
+            'scale': scaler.scale_.tolist(),
+            'n_samples_seen': int(np.max(scaler.n_samples_seen_))
+        }
+    }
+    with open(os.path.join(klasor, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def onbellekten_oku(anahtar, cache_dir=None):
+    """Önbellek geçerliyse (X_scaled, y, df, X, scaler) döndür, yoksa None"""
+    return klasorden_oku(os.path.join(cache_dir or CACHE_DIR, anahtar))
+
+
+def klasorden_oku(klasor):
+    """Sütun bazında .npy klasörünü bellek eşlemeli aç; meta.json yoksa None"""
+    meta_yolu = os.path.join(klasor, META_FILE)
+    if not os.path.exists(meta_yolu):
+        return None
+
+    with open(meta_yolu, encoding="utf-8") as f:
+        meta = json.load(f)
+
+    def yukle(ad):
+        return np.load(os.path.join(klasor, ad), mmap_mode='r')
+
+    index = pd.Index(yukle("index.npy"))
+    df = pd.DataFrame(
+        {col: yukle(f"df_{i}.npy") for i, col in enumerate(meta['df_columns'])},
+        index=index, copy=False
+    )
+    X_scaled = pd.DataFrame(
+        {col: yukle(f"scaled_{i}.npy") for i, col in enumerate(FEATURE_COLUMNS)},
+        index=index, copy=False
+    )
+    X = df[FEATURE_COLUMNS]
+    y = df[TARGET_COLUMN]
+
+    scaler = StandardScaler()
+    scaler.n_features_in_ = len(meta['scaler']['mean'])
+    scaler.n_samples_seen_ = meta['scaler']['n_samples_seen']
+    scaler.mean_ = np.asarray(meta['scaler']['mean'])
+    scaler.var_ = np.asarray(meta['scaler']['var'])
+    scaler.scale_ = np.asarray(meta['scaler']['scale'])
+
+    print(f"Ön işlenmiş veri önbellekten yüklendi: {klasor} ({meta['rows']} satır)")
+    return X_scaled, y, df, X, scaler
+
+
+def eski_onbellekleri_temizle(cache_dir=None, keep=CACHE_KEEP):
+    """En son değiştirilen `keep` önbellek dışındakileri sil
+
+    Yalnızca veri önbelleği klasörleri (meta.json içerenler) silinir; aynı
+    dizindeki diğer önbellekler (ör. yorumlar/) korunur.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    klasorler = [
+        os.path.join(cache_dir, ad) for ad in os.listdir(cache_dir)
+        if not ad.endswith(".tmp") and os.path.exists(os.path.join(cache_dir, ad, META_FILE))
+    ]
+    klasorler.sort(key=os.path.getmtime)
+    for klasor in klasorler[:-keep]:
+        shutil.rmtree(klasor, ignore_errors=True)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dağılım Kayması İzleme
+Eğitim sırasında her özellik ve modelin temerrüt olasılığı için kantil
+kovalarından oluşan bir referans histogram çıkarılır. Tahmin yolunda gelen
+her satır aynı kovalara sayılır; ham satırlar saklanmaz ve bellek istek
+sayısından bağımsızdır. PSI ve (kovalanmış) KS skorları sayımlardan kova
+sayısı kadar adımda hesaplanır.
+"""
+
+import threading
+
+import numpy as np
+
+from scripts.metrics import metrikler
+from scripts.pipeline import FEATURE_COLUMNS
+
+# Referans kovalarının kantilleri (onluk dilimler)
+REFERANS_KANTILLERI = np.linspace(0, 1, 11)[1:-1]
+# Bu kadar veya daha az farklı değeri olan sütunlar değer bazında kovalanır (ör. Employed)
+AYRIK_DEGER_SINIRI = 10
+# Boş kovalarda log(0) olmaması için oranlara eklenen pay
+PSI_EPSILON = 1e-4
+# PSI eşikleri: altı kararlı, arası orta, üstü belirgin kayma
+PSI_ESIKLERI = (0.1, 0.25)
+# Skorların anlamlı sayılması için gereken en az gözlem
+MIN_GOZLEM = 100
+
+OLASILIK = 'probability'
+
+
+def _kesimler(degerler):
+    """Kova sınırları: ayrık sütunlarda değerlerin orta noktaları, diğerlerinde onluk dilimler"""
+    tekil = np.unique(degerler)
+    if len(tekil) <= AYRIK_DEGER_SINIRI:
+        return (tekil[:-1] + tekil[1:]) / 2
+    return np.unique(np.quantile(degerler, REFERANS_KANTILLERI))
+
+
+def referans_histogrami(degerler):
+    """Tek bir değişkenin referans kovaları, sayımları ve momentleri (JSON'a çevrilebilir)"""
+    degerler = np.asarray(degerler, dtype=np.float64)
+    kesimler = _kesimler(degerler)
+    sayimlar = np.bincount(np.searchsorted(kesimler, degerler, side='right'), minlength=len(kesimler) + 1)
+    return {
+        'cuts': kesimler.tolist(),
+        'counts': sayimlar.tolist(),
+        'mean': float(degerler.mean()),
+        'std': float(degerler.std()),
+        'min': float(degerler.min()),
+        'max': float(degerler.max())
+    }
+
+
+def ozellik_referansi(X, sutunlar=None):
+    """Ham (ölçeklenmemiş) özellik matrisi veya DataFrame'inden referans histogramları"""
+    if hasattr(X, 'columns'):
+        sutunlar = list(sutunlar or X.columns)
+        X = X[sutunlar].to_numpy(dtype=np.float64)
+    X = np.asarray(X, dtype=np.float64)
+    return {
+        'rows': int(X.shape[0]),
+        'features': {ad: referans_histogrami(X[:, j]) for j, ad in enumerate(sutunlar)}
+    }
+
+
+def olasilik_referansi_ekle(referans, proba):
+    """Referansa modelin (ör. test bölümündeki) temerrüt olasılıklarının histogramını ekle"""
+    referans[OLASILIK] = referans_histogrami(proba)
+    return referans
+
+
+def psi(referans, guncel):
+    """Population Stability Index: sum((g - r) * ln(g / r)) kova oranları üzerinden"""
+    r = np.asarray(referans, dtype=np.float64)
+    g = np.asarray(guncel, dtype=np.float64)
+    r = np.maximum(r / r.sum(), PSI_EPSILON)
+    g = np.maximum(g / g.sum(), PSI_EPSILON)
+    return float(np.sum((g - r) * np.log(g / r)))
+
+
+def kovali_ks(referans, guncel):
+    """Kova sınırlarındaki kümülatif oranların en büyük farkı (KS istatistiğinin alt sınırı)"""
+    r = np.cumsum(referans) / np.sum(referans)
+    g = np.cumsum(guncel) / np.sum(guncel)
+    return float(np.abs(r - g).max())
+
+
+def kayma_durumu(psi_degeri, gozlem):
+    if gozlem < MIN_GOZLEM:
+        return 'insufficient_data'
+    if psi_degeri < PSI_ESIKLERI[0]:
+        return 'stable'
+    if psi_degeri < PSI_ESIKLERI[1]:
+        return 'moderate'
+    return 'significant'
+
+
+class _Degisken:
+    """Bir değişkenin sabit boyutlu akan özeti: kova sayımları, momentler, en küçük/büyük"""
+
+    def __init__(self, referans):
+        self.referans = referans
+        self.kesimler = np.asarray(referans['cuts'], dtype=np.float64)
+        self.sayimlar = np.zeros(len(self.kesimler) + 1, dtype=np.int64)
+        self.adet = 0
+        self.ortalama = 0.0
+        self.m2 = 0.0
+        self.en_kucuk = np.inf
+        self.en_buyuk = -np.inf
+
+    def guncelle(self, degerler):
+        """Parça momentlerini Chan yöntemiyle birleştir; maliyet satır başına sabit"""
+        self.sayimlar += np.bincount(
+            np.searchsorted(self.kesimler, degerler, side='right'), minlength=len(self.sayimlar)
+        )
+        n_b = len(degerler)
+        ortalama_b = float(degerler.mean())
+        n = self.adet + n_b
+        fark = ortalama_b - self.ortalama
+        self.m2 += float(((degerler - ortalama_b) ** 2).sum()) + fark ** 2 * self.adet * n_b / n
+        self.ortalama += fark * n_b / n
+        self.adet = n
+        self.en_kucuk = min(self.en_kucuk, float(degerler.min()))
+        self.en_buyuk = max(self.en_buyuk, float(degerler.max()))
+
+    def ozet(self):
+        sonuc = {
+            'observations': self.adet,
+            'reference': {ad: self.referans[ad] for ad in ('mean', 'std', 'min', 'max')},
+            'cuts': self.referans['cuts'],
+            'reference_counts': self.referans['counts'],
+            'counts': self.sayimlar.tolist()
+        }
+        if self.adet == 0:
+            return dict(sonuc, psi=None, ks=None, status='insufficient_data')
+        psi_degeri = psi(self.referans['counts'], self.sayimlar)
+        return dict(
+            sonuc,
+            psi=psi_degeri,
+            ks=kovali_ks(self.referans['counts'], self.sayimlar),
+            status=kayma_durumu(psi_degeri, self.adet),
+            mean=self.ortalama,
+            std=float(np.sqrt(self.m2 / self.adet)),
+            min=self.en_kucuk,
+            max=self.en_buyuk
+        )
+
+
+class DriftIzleyici:
+    """Servis edilen model sürümünün referansına göre girdi ve çıktı kayması
+
+    Referans, eğitimde ozellik_referansi() ile oluşturulup olasılık
+    histogramı eklenmiş sözlüktür (paket meta.json içindeki 'drift_reference').
+    Referans yoksa izleyici pasiftir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._ozellikler = {}
+        self._olasilik = None
+
+    def etkinlestir(self, version, referans):
+        """Yeni model sürümü için sayımları sıfırla"""
+        with self._lock:
+            self._version = version
+            # Girdi sütunları FEATURE_COLUMNS sırasıyla gelir
+            referanslar = (referans or {}).get('features') or {}
+            self._ozellikler = {
+                ad: _Degisken(referanslar[ad]) for ad in FEATURE_COLUMNS if ad in referanslar
+            }
+            olasilik = (referans or {}).get(OLASILIK)
+            self._olasilik = _Degisken(olasilik) if olasilik else None
+
+    @property
+    def etkin(self):
+        return bool(self._ozellikler)
+
+    def gozlemle(self, version, X=None, proba=None):
+        """Ham girdi satırlarını (n, özellik) ve/veya temerrüt olasılıklarını say
+
+        Başka bir sürümle skorlanmış satırlar (yayın sırasında) sayılmaz.
+        """
+        if not self.etkin:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            if X is not None:
+                X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+                for ad, degisken in self._ozellikler.items():
+                    degisken.guncelle(X[:, FEATURE_COLUMNS.index(ad)])
+            if proba is not None and self._olasilik is not None:
+                self._olasilik.guncelle(np.atleast_1d(np.asarray(proba, dtype=np.float64)))
+
+    def rapor(self):
+        """Her özellik ve olasılık için PSI, KS, durum ve akan istatistikler"""
+        with self._lock:
+            if not self.etkin:
+                return None
+            ozellikler = {ad: d.ozet() for ad, d in self._ozellikler.items()}
+            olasilik = self._olasilik.ozet() if self._olasilik is not None else None
+            version = self._version
+        return {
+            'model_version': version,
+            'observations': max((o['observations'] for o in ozellikler.values()), default=0),
+            'psi_thresholds': list(PSI_ESIKLERI),
+            'features': ozellikler,
+            OLASILIK: olasilik
+        }
+
+    def metrikleri_yayinla(self):
+        """PSI ve KS skorlarını Prometheus göstergeleri olarak güncelle"""
+        rapor = self.rapor()
+        if rapor is None:
+            return
+        degiskenler = dict(rapor['features'])
+        if rapor[OLASILIK] is not None:
+            degiskenler[OLASILIK] = rapor[OLASILIK]
+        for ad, ozet in degiskenler.items():
+            if ozet['psi'] is None:
+                continue
+            metrikler.gosterge('drift_psi', ozet['psi'], "Eğitim referansına göre PSI", variable=ad)
+            metrikler.gosterge('drift_ks', ozet['ks'], "Eğitim referansına göre kovalı KS", variable=ad)
+            metrikler.gosterge('drift_observations', ozet['observations'],
+                               "Drift izleyicisindeki gözlem sayısı", variable=ad)
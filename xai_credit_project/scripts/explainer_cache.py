@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Açıklayıcı Önbelleği
+Her eğitilmiş model sürümü için açıklayıcıları (LIME vb.) bir kez oluşturur ve
+sonraki tahmin isteklerinde yeniden kullanır. Model yeniden eğitildiğinde eski
+sürümün açıklayıcıları serbest bırakılır.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from datetime import datetime
+
+
+def yeni_model_versiyonu():
+    """Sıralanabilir, benzersiz bir model sürüm kimliği üret"""
+    return datetime.now().strftime("%Y%m%d%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+
+class ExplainerRegistry:
+    """Model sürümüne göre anahtarlanan açıklayıcı kaydı
+
+    Açıklayıcılar kilit dışında oluşturulur: yavaş bir oluşturma yalnızca aynı
+    türü bekleyen istekleri bekletir; diğer türler ve önbellek isabetleri
+    beklemez. Aynı tür için eşzamanlı istekler tek bir oluşturmayı paylaşır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._explainers = {}
+        self._stats = {}
+        # Oluşturulmakta olan türler: tür -> Future
+        self._bekleyenler = {}
+
+    def _sifirla(self, version):
+        self._version = version
+        self._explainers = {}
+        self._stats = {}
+        # Süren oluşturmalar sonuçlarını yalnızca kendi bekleyenlerine iletir
+        self._bekleyenler = {}
+
+    def activate(self, version):
+        """Etkin sürümü değiştir; eski sürümün açıklayıcılarını serbest bırak"""
+        with self._lock:
+            if version != self._version:
+                self._sifirla(version)
+
+    def get(self, version, kind, factory):
+        """Açıklayıcıyı döndür; bu sürüm için yoksa factory() ile bir kez oluştur"""
+        with self._lock:
+            if self._version is None:
+                self._version = version
+
+            eski_surum = version != self._version
+            if not eski_surum:
+                if kind in self._explainers:
+                    self._stats[kind]['reuse_count'] += 1
+                    return self._explainers[kind]
+                bekleyen = self._bekleyenler.get(kind)
+                olusturan = bekleyen is None
+                if olusturan:
+                    bekleyen = self._bekleyenler[kind] = Future()
+
+        if eski_surum:
+            # Yayından kalkmış bir sürüme ait istek: önbelleği bozmadan oluştur
+            return factory()
+        if not olusturan:
+            return bekleyen.result()
+
+        baslangic = time.perf_counter()
+        try:
+            explainer = factory()
+        except BaseException as e:
+            with self._lock:
+                if self._bekleyenler.get(kind) is bekleyen:
+                    del self._bekleyenler[kind]
+            bekleyen.set_exception(e)
+            raise
+        sure = time.perf_counter() - baslangic
+
+        with self._lock:
+            # Oluşturma sırasında yeni sürüm yayınlandıysa sonuç önbelleğe girmez
+            if self._bekleyenler.get(kind) is bekleyen:
+                del self._bekleyenler[kind]
+                self._explainers[kind] = explainer
+                self._stats[kind] = {
+                    'build_seconds': sure,
+                    'built_at': datetime.now().isoformat(timespec='seconds'),
+                    'reuse_count': 0
+                }
+        bekleyen.set_result(explainer)
+        print(f"{kind} açıklayıcısı oluşturuldu ({sure:.3f} sn, sürüm: {version})")
+        return explainer
+
+    def invalidate(self):
+        """Tüm açıklayıcıları serbest bırak"""
+        with self._lock:
+            self._sifirla(None)
+
+    def stats(self):
+        """Oluşturma maliyeti ve yeniden kullanım sayılarını döndür"""
+        with self._lock:
+            return {
+                'version': self._version,
+                'explainers': {kind: dict(s) for kind, s in self._stats.items()}
+            }
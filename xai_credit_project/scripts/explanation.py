@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Açıklamalar
+SHAP ve LIME açıklayıcılarının oluşturulması ve LIME örnekleme bütçesi.
+shap, lime ve matplotlib ilk açıklama istendiğinde yüklenir; yalnızca tahmin
+yapan süreçler bu modülü içe aktarsa da bu kütüphaneleri taşımaz.
+"""
+
+import copy
+import os
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import numpy as np
+
+from scripts.config import ortam_int, sonuc_yolu
+from scripts.metrics import olculen
+from scripts.explainer_cache import yeni_model_versiyonu
+from scripts.shap_batch import shap_deposu_dizini, shap_pozitif_sinif, shap_toplu_hesapla
+
+# Açıklamalarda kullanılan özellik adları (modeldeki sütun sırasıyla)
+FEATURE_NAMES = ['İstihdam Durumu', 'Banka Bakiyesi', 'Yıllık Maaş']
+
+
+def shap_aciklayici_olustur(model):
+    """Ağaç modeli için TreeSHAP açıklayıcısını oluştur"""
+    import shap
+    return shap.TreeExplainer(model)
+
+
+def shap_aciklama_listesi(explainer, X):
+    """Satır(lar) için SHAP katkılarını LIME'ın as_list() biçiminde döndür
+
+    Her satır için [(özellik etiketi, katkı), ...] listesi üretilir; mutlak
+    katkıya göre büyükten küçüğe sıralıdır.
+    """
+    X = np.atleast_2d(X)
+    degerler = shap_pozitif_sinif(explainer.shap_values(X))
+    aciklamalar = []
+    for satir, katkilar in zip(X, degerler):
+        sira = np.argsort(-np.abs(katkilar))
+        aciklamalar.append([
+            (f"{FEATURE_NAMES[j]} = {satir[j]:.2f}", float(katkilar[j])) for j in sira
+        ])
+    return aciklamalar
+
+
+@olculen()
+def shap_aciklamalar(model, X_train, X_test, depo_dizini=None, n_jobs=None):
+    """SHAP değerlerini hesapla, satır bazında depoya yaz ve görselleştir
+
+    depo_dizini verilmezse results/shap_degerleri altında yeni bir sürüm
+    klasörü kullanılır; depolar hiçbir zaman kök klasöre yazılmaz.
+    """
+    try:
+        print("SHAP açıklamaları oluşturuluyor...")
+        
+        # SHAP değerlerini parçalar halinde hesapla ve diske yaz
+        depo = shap_toplu_hesapla(
+            model,
+            X_test,
+            depo_dizini or shap_deposu_dizini(yeni_model_versiyonu()),
+            row_ids=X_test.index.to_numpy(),
+            n_jobs=n_jobs,
+            feature_names=X_test.columns
+        )
+        shap_values = np.asarray(depo.values)
+        
+        print(f"SHAP değerleri hesaplandı. Boyut: {shap_values.shape}")
+        
+        # SHAP özet grafiği
+        import matplotlib.pyplot as plt
+        import shap
+        plt.figure(figsize=(10, 6))
+        shap.summary_plot(shap_values, X_test, plot_type="bar", show=False)
+        plt.title("SHAP Özellik Önem Dereceleri")
+        plt.tight_layout()
+        plt.savefig(sonuc_yolu("shap_ozet.png"))
+        plt.close()
+        print("SHAP özet grafiği kaydedildi")
+        
+        return shap_values
+        
+    except Exception as e:
+        print(f"SHAP açıklamaları oluşturulurken hata: {str(e)}")
+        raise
+
+
+@dataclass(frozen=True)
+class LimeAyarlari:
+    """LIME örnekleme bütçesi: doğruluk ile gecikme arasındaki denge"""
+    num_samples: int = 5000
+    discretizer: str = 'quartile'
+    random_state: Optional[int] = None
+    n_jobs: Optional[int] = None
+
+
+# Geçerli ayrıklaştırıcılar ('none': sürekli özellikler ayrıklaştırılmaz)
+LIME_DISCRETIZERS = ('quartile', 'decile', 'none')
+LIME_MAX_SAMPLES = 50000
+# numpy RandomState tohumlarının geçerli aralığı
+LIME_MAX_SEED = 2 ** 32
+
+
+def varsayilan_lime_ayarlari():
+    """Global LIME bütçesini ortam değişkenlerinden oku"""
+    return lime_ayarlari_coz({
+        'num_samples': ortam_int('LIME_NUM_SAMPLES'),
+        'discretizer': os.getenv('LIME_DISCRETIZER'),
+        'random_state': ortam_int('LIME_SEED'),
+        'n_jobs': ortam_int('LIME_N_JOBS')
+    }, temel=LimeAyarlari())
+
+
+def lime_ayarlari_coz(degerler, temel=None):
+    """İstekle gelen değerleri doğrulayıp temel ayarların üzerine uygula
+
+    n_jobs çekirdek sayısıyla sınırlandırılır (0 tek çekirdek); böylece
+    istekler büyük iş parçacığı havuzları veya sınırsız sayıda skorlayıcı
+    oluşturamaz. Aralık dışındaki değerler ValueError fırlatır.
+    """
+    temel = temel or varsayilan_lime_ayarlari()
+    degerler = {k: v for k, v in (degerler or {}).items() if v is not None}
+    bilinmeyen = set(degerler) - set(LimeAyarlari.__dataclass_fields__)
+    if bilinmeyen:
+        raise ValueError(f"Bilinmeyen LIME ayarı: {', '.join(sorted(bilinmeyen))}")
+    
+    try:
+        for alan in ('num_samples', 'random_state', 'n_jobs'):
+            if alan in degerler:
+                degerler[alan] = int(degerler[alan])
+    except (TypeError, ValueError):
+        raise ValueError(f"Geçersiz LIME ayarı: {alan}")
+    
+    ayarlar = replace(temel, **degerler)
+    if not 10 <= ayarlar.num_samples <= LIME_MAX_SAMPLES:
+        raise ValueError(f"num_samples 10 ile {LIME_MAX_SAMPLES} arasında olmalı")
+    if ayarlar.discretizer not in LIME_DISCRETIZERS:
+        raise ValueError(f"Geçersiz discretizer: {ayarlar.discretizer}")
+    if ayarlar.random_state is not None and not 0 <= ayarlar.random_state < LIME_MAX_SEED:
+        raise ValueError(f"random_state 0 ile {LIME_MAX_SEED - 1} arasında olmalı")
+    if ayarlar.n_jobs is not None:
+        if ayarlar.n_jobs < 0:
+            raise ValueError("n_jobs negatif olamaz")
+        ayarlar = replace(ayarlar, n_jobs=min(ayarlar.n_jobs, os.cpu_count() or 1))
+    return ayarlar
+
+
+# Ayrıklaştırıcıların kova sınırları için kullandığı yüzdelikler
+LIME_YUZDELIKLERI = {'quartile': [25, 50, 75], 'decile': list(range(10, 100, 10))}
+
+
+def _agirlikli_yuzdelik(x, agirlik, yuzdelikler):
+    """Ağırlıklı ters-CDF yüzdelikleri; sonuçlar x içindeki değerlerdir"""
+    sira = np.argsort(x, kind='stable')
+    x, kumulatif = x[sira], np.cumsum(agirlik[sira])
+    idx = np.searchsorted(kumulatif / kumulatif[-1], np.asarray(yuzdelikler) / 100.0)
+    return x[np.minimum(idx, len(x) - 1)]
+
+
+def lime_istatistikleri(X, agirlik, discretizer='quartile'):
+    """Ağırlıklı arka plandan LIME'ın training_data_stats sözlüğünü hesapla
+
+    Kova sınırları, kova içi ortalama/standart sapma ve kova frekansları
+    temsilcilerin ağırlıklarıyla hesaplanır; LIME bunları tam eğitim setinden
+    hesapladığı değerlerin yerine kullanır.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    agirlik = np.asarray(agirlik, dtype=np.float64)
+    istatistik = {ad: {} for ad in ('bins', 'means', 'stds', 'mins', 'maxs', 'feature_values', 'feature_frequencies')}
+    for j in range(X.shape[1]):
+        x = X[:, j]
+        sinirlar = np.unique(_agirlikli_yuzdelik(x, agirlik, LIME_YUZDELIKLERI[discretizer]))
+        kova = np.searchsorted(sinirlar, x)
+        kutle = np.bincount(kova, weights=agirlik, minlength=len(sinirlar) + 1)
+        ortalamalar, sapmalar = [], []
+        for k in range(len(sinirlar) + 1):
+            secim = kova == k
+            if kutle[k] > 0:
+                ortalama = np.average(x[secim], weights=agirlik[secim])
+                sapma = np.sqrt(np.average((x[secim] - ortalama) ** 2, weights=agirlik[secim]))
+            else:
+                ortalama, sapma = 0.0, 0.0
+            ortalamalar.append(float(ortalama))
+            # LIME kesik normal örneklemede sıfır sapmadan kaçınmak için aynı payı ekler
+            sapmalar.append(float(sapma) + 1e-11)
+        istatistik['bins'][j] = sinirlar
+        istatistik['means'][j] = ortalamalar
+        istatistik['stds'][j] = sapmalar
+        istatistik['mins'][j] = [float(x.min())] + sinirlar.tolist()
+        istatistik['maxs'][j] = sinirlar.tolist() + [float(x.max())]
+        istatistik['feature_values'][j] = list(range(len(sinirlar) + 1))
+        istatistik['feature_frequencies'][j] = kutle.tolist()
+    return istatistik
+
+
+def lime_aciklayici_olustur(X_train, discretizer='quartile', agirlik=None):
+    """Eğitim verisinden veya ağırlıklı arka plan özetinden LIME açıklayıcısını oluştur
+
+    agirlik verilirse X_train temsilci satırlardır; LIME'ın örnekleme
+    istatistikleri ağırlıklarla hesaplanır.
+    """
+    import lime.lime_tabular
+    X_train = np.asarray(X_train)
+    istatistik = None
+    if agirlik is not None and discretizer != 'none':
+        istatistik = lime_istatistikleri(X_train, agirlik, discretizer)
+    explainer = lime.lime_tabular.LimeTabularExplainer(
+        X_train,
+        feature_names=FEATURE_NAMES,
+        class_names=['Temerrüt Yok', 'Temerrüt Var'],
+        mode='classification',
+        discretize_continuous=discretizer != 'none',
+        discretizer=discretizer if discretizer != 'none' else 'quartile',
+        training_data_stats=istatistik
+    )
+    if agirlik is not None and discretizer == 'none':
+        # Sürekli örnekleme ölçeği ağırlıklı ortalama ve sapmadan alınır
+        ortalama = np.average(X_train, axis=0, weights=agirlik)
+        explainer.scaler.mean_ = ortalama
+        explainer.scaler.scale_ = np.sqrt(np.average((X_train - ortalama) ** 2, axis=0, weights=agirlik))
+    return explainer
+
+
+def lime_skorlayici(model, n_jobs=None):
+    """Pertürbasyonları skorlamak için predict_proba döndür
+
+    n_jobs verilirse ağaçlar paylaşılarak çok çekirdekli bir orman kopyası kullanılır.
+    """
+    if not n_jobs:
+        return model.predict_proba
+    paralel = copy.copy(model)
+    paralel.n_jobs = n_jobs
+    return paralel.predict_proba
+
+
+def lime_acikla(explainer, satir, predict_fn, ayarlar):
+    """Tek satır için LIME açıklaması ve örnekleme bilgisini döndür"""
+    if ayarlar.random_state is not None:
+        # Paylaşılan açıklayıcının durumunu bozmadan tekrarlanabilir örnekleme
+        # (ayrıklaştırıcı ve yerel model de kendi rastgele durumlarını taşır)
+        explainer = copy.copy(explainer)
+        explainer.random_state = np.random.RandomState(ayarlar.random_state)
+        explainer.base = copy.copy(explainer.base)
+        explainer.base.random_state = explainer.random_state
+        if explainer.discretizer is not None:
+            explainer.discretizer = copy.copy(explainer.discretizer)
+            explainer.discretizer.random_state = explainer.random_state
+    
+    exp = explainer.explain_instance(
+        satir,
+        predict_fn,
+        num_features=3,
+        num_samples=ayarlar.num_samples
+    )
+    bilgi = {
+        'num_samples': ayarlar.num_samples,
+        'discretizer': ayarlar.discretizer,
+        'random_state': ayarlar.random_state,
+        'score': float(exp.score),
+        'local_pred': float(np.ravel(exp.local_pred)[0])
+    }
+    return exp, bilgi
+
+
+@olculen()
+def lime_aciklamalar(model, X_train, X_test, explainer=None, ayarlar=None, agirlik=None):
+    """LIME açıklamaları oluştur
+
+    X_train arka plan özetiyse agirlik temsilcilerin ağırlıklarıdır.
+    """
+    try:
+        print("LIME açıklamaları oluşturuluyor...")
+        ayarlar = ayarlar or varsayilan_lime_ayarlari()
+        
+        # LIME açıklayıcı oluştur (önbellekte yoksa)
+        if explainer is None:
+            explainer = lime_aciklayici_olustur(X_train, ayarlar.discretizer, agirlik)
+        
+        # Örnek bir tahmin için LIME açıklaması
+        exp, bilgi = lime_acikla(
+            explainer,
+            X_test.iloc[0].values,
+            lime_skorlayici(model, ayarlar.n_jobs),
+            ayarlar
+        )
+        print(f"LIME yerel model skoru: {bilgi['score']:.4f} ({bilgi['num_samples']} örnek)")
+        
+        # HTML olarak kaydet
+        exp.save_to_file(sonuc_yolu("lime_aciklama.html"))
+        print("LIME açıklaması HTML olarak kaydedildi")
+        
+    except Exception as e:
+        print(f"LIME açıklamaları oluşturulurken hata: {str(e)}")
+        raise
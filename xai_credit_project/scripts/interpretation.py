@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+AI Yorumu
+Model metriklerinin dil modeliyle yorumlanmasını eğitimin kritik yolundan
+çıkarır. Yorumlar istemin (metrikler + özellik önemleri) ve model adının
+özetiyle anahtarlanan bir önbellekte saklanır; aynı sonuçları veren yeniden
+eğitimler servisi bir daha çağırmaz. İstemci değiştirilebilir: OPENAI_BASE_URL
+ile yerel bir taklit sunucuya yönlendirilebilir ya da herhangi bir
+istem -> metin fonksiyonu verilebilir.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+CACHE_DIR = os.path.join(
+    os.environ.get(
+        'KREDI_CACHE_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+    ),
+    "yorumlar"
+)
+
+SISTEM_MESAJI = "Sen bir finans ve makine öğrenmesi uzmanısın."
+
+# Yorum alınamadığında raporda gösterilen metin
+YORUM_YOK = "AI yorumu alınamadı."
+
+
+def yorum_istemi(performans_metrikleri, feature_importance):
+    """Model metriklerinden yorum istemini oluştur"""
+    return f"""
+    Kredi temerrüt tahmin modelinin sonuçlarını yorumla:
+
+    1. Model Performans Metrikleri:
+    - ROC AUC Skoru: {performans_metrikleri['roc_auc']}
+    - Sınıflandırma Raporu:
+    {performans_metrikleri['classification_report']}
+
+    2. Özellik Önem Sıralaması:
+    {feature_importance.to_string()}
+
+    Lütfen şu konularda yorum yap:
+    1. Modelin genel performansı nasıl?
+    2. Hangi özellikler temerrüt tahmininde en etkili?
+    3. Modelin güçlü ve zayıf yönleri neler?
+    4. Model nasıl iyileştirilebilir?
+
+    Yorumunu Türkçe olarak, maddeler halinde ve anlaşılır bir dille yap.
+    """
+
+
+class OpenAIYorumcu:
+    """OpenAI uyumlu sohbet API'si ile yorum üretir
+
+    base_url (veya OPENAI_BASE_URL) yerel bir taklit sunucuyu gösterebilir.
+    """
+
+    def __init__(self, model=None, api_key=None, base_url=None, timeout=60.0):
+        self.model = model or os.getenv('KREDI_AI_MODEL', 'gpt-4')
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.base_url = base_url or os.getenv('OPENAI_BASE_URL')
+        self.timeout = timeout
+        self._client = None
+
+    def _istemci(self):
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url, timeout=self.timeout)
+        return self._client
+
+    def __call__(self, istem):
+        response = self._istemci().chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SISTEM_MESAJI},
+                {"role": "user", "content": istem}
+            ]
+        )
+        return response.choices[0].message.content
+
+
+def varsayilan_yorumcu():
+    """KREDI_AI_CLIENT=none ise None (yorum devre dışı), aksi halde OpenAI istemcisi"""
+    if os.getenv('KREDI_AI_CLIENT', 'openai') == 'none':
+        return None
+    return OpenAIYorumcu()
+
+
+class YorumOnbellegi:
+    """İçerik adresli yorum önbelleği (anahtar başına bir JSON dosyası)"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or CACHE_DIR
+
+    def anahtar(self, istem, model_adi):
+        icerik = json.dumps({'istem': istem, 'model': model_adi}, sort_keys=True)
+        return hashlib.sha256(icerik.encode("utf-8")).hexdigest()[:32]
+
+    def _yol(self, anahtar):
+        return os.path.join(self.cache_dir, f"{anahtar}.json")
+
+    def oku(self, anahtar):
+        try:
+            with open(self._yol(anahtar), encoding="utf-8") as f:
+                return json.load(f)['interpretation']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def yaz(self, anahtar, yorum):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        gecici = self._yol(anahtar) + ".tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump({'interpretation': yorum}, f, ensure_ascii=False)
+        os.replace(gecici, self._yol(anahtar))
+
+
+def _model_adi(yorumcu):
+    return getattr(yorumcu, 'model', type(yorumcu).__name__)
+
+
+# Raporun AI yorumu için en fazla bekleyeceği süre (saniye)
+AI_YORUM_ZAMAN_ASIMI = 120
+
+
+def get_ai_interpretation(performans_metrikleri, feature_importance, yorumcu=None, onbellek=None):
+    """Model sonuçlarını dil modeliyle yorumla (eşzamanlı, önbellekli)
+
+    Aynı metrikler ve özellik önemleri için önbellekteki yorum döndürülür.
+    Eğitimi bekletmemek için YorumServisi tercih edilmelidir.
+    """
+    yorumcu = yorumcu if yorumcu is not None else varsayilan_yorumcu()
+    onbellek = onbellek or YorumOnbellegi()
+    istem = yorum_istemi(performans_metrikleri, feature_importance)
+    anahtar = onbellek.anahtar(istem, _model_adi(yorumcu))
+    
+    yorum = onbellek.oku(anahtar)
+    if yorum is None:
+        if yorumcu is None:
+            raise RuntimeError("AI yorumu devre dışı (KREDI_AI_CLIENT=none)")
+        yorum = yorumcu(istem)
+        onbellek.yaz(anahtar, yorum)
+    return yorum
+
+
+class YorumServisi:
+    """Yorumları arka planda üretir; önbellekte olanları hemen döndürür"""
+
+    def __init__(self, yorumcu=None, onbellek=None, max_workers=1):
+        self.yorumcu = yorumcu if yorumcu is not None else varsayilan_yorumcu()
+        self.onbellek = onbellek or YorumOnbellegi()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='yorum')
+        self._isler = {}
+        self._lock = threading.Lock()
+
+    def iste(self, performans_metrikleri, feature_importance):
+        """Yorumu kuyruğa al ve anahtarını döndür (önbellekteyse çağrı yapılmaz)"""
+        istem = yorum_istemi(performans_metrikleri, feature_importance)
+        anahtar = self.onbellek.anahtar(istem, _model_adi(self.yorumcu))
+        with self._lock:
+            is_ = self._isler.get(anahtar)
+            # Başarısız işler yeniden denenir
+            if is_ is None or (is_.done() and is_.exception() is not None):
+                yorum = self.onbellek.oku(anahtar)
+                if yorum is not None:
+                    is_ = Future()
+                    is_.set_result(yorum)
+                else:
+                    is_ = self._executor.submit(self._uret, anahtar, istem)
+                self._isler[anahtar] = is_
+        return anahtar
+
+    def _uret(self, anahtar, istem):
+        if self.yorumcu is None:
+            raise RuntimeError("AI yorumu devre dışı (KREDI_AI_CLIENT=none)")
+        yorum = self.yorumcu(istem)
+        self.onbellek.yaz(anahtar, yorum)
+        return yorum
+
+    def durum(self, anahtar):
+        """Yorumun durumunu döndür; anahtar bilinmiyorsa None"""
+        with self._lock:
+            is_ = self._isler.get(anahtar)
+        if is_ is None:
+            yorum = self.onbellek.oku(anahtar)
+            if yorum is None:
+                return None
+            return {'key': anahtar, 'status': 'succeeded', 'interpretation': yorum, 'error': None}
+        if not is_.done():
+            return {'key': anahtar, 'status': 'pending', 'interpretation': None, 'error': None}
+        if is_.exception() is not None:
+            return {'key': anahtar, 'status': 'failed', 'interpretation': None, 'error': str(is_.exception())}
+        return {'key': anahtar, 'status': 'succeeded', 'interpretation': is_.result(), 'error': None}
+
+    def bekle(self, anahtar, timeout=None):
+        """Yorumu bekle; hata veya zaman aşımında None döndür"""
+        with self._lock:
+            is_ = self._isler.get(anahtar)
+        if is_ is None:
+            return self.onbellek.oku(anahtar)
+        try:
+            return is_.result(timeout=timeout)
+        except Exception as e:
+            print(f"AI yorumu alınamadı: {str(e)}")
+            return None
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Arka Plan Eğitim İşleri
+Eğitim hattını bir iş parçacığı havuzunda çalıştırır; her işin aşama bazında
+durumunu, süresini, CPU süresini ve tepe belleğini kaydeder, böylece API
+isteği beklemeden dönebilir.
+"""
+
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+from scripts.metrics import metrikler
+
+# Bellekte tutulacak en fazla iş sayısı (bitmemiş işler sınırı aşabilir)
+MAX_JOBS = 50
+
+
+class TrainingJob:
+    """Tek bir eğitim işinin durumu"""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = 'queued'
+        self.created_at = datetime.now().isoformat(timespec='seconds')
+        self.finished_at = None
+        self.stages = OrderedDict()
+        # Aşamaların içinde ölçülen fonksiyonlar dahil tüm aşama ölçümleri
+        self.stage_metrics = []
+        self.result = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Bir aşamanın durumunu, süresini, CPU süresini ve tepe belleğini kaydet"""
+        with self._lock:
+            self.stages[name] = {'status': 'running', 'seconds': None, 'cpu_seconds': None, 'peak_rss_mb': None}
+        olcum = {}
+        try:
+            with metrikler.asama(f'egitim_{name}') as olcum:
+                yield
+        finally:
+            with self._lock:
+                self.stages[name].update(
+                    status=olcum['status'],
+                    seconds=olcum['wall_seconds'],
+                    cpu_seconds=olcum['cpu_seconds'],
+                    peak_rss_mb=olcum['peak_rss_bytes'] / 1024 ** 2
+                )
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'job_id': self.id,
+                'status': self.status,
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+                'stages': [dict(name=name, **bilgi) for name, bilgi in self.stages.items()],
+                'stage_metrics': list(self.stage_metrics),
+                'result': self.result,
+                'error': self.error
+            }
+
+
+class TrainingJobManager:
+    """Eğitim işlerini arka planda çalıştırır ve izler"""
+
+    def __init__(self, max_workers=1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='egitim')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn):
+        """fn(job) fonksiyonunu arka planda çalıştır ve işi hemen döndür"""
+        job = TrainingJob()
+        with self._lock:
+            self._jobs[job.id] = job
+            # Yalnızca bitmiş işler çıkarılır; kuyruktaki veya çalışan işler her zaman sorgulanabilir
+            fazla = len(self._jobs) - MAX_JOBS
+            if fazla > 0:
+                bitmis = [job_id for job_id, j in self._jobs.items() if j.finished_at is not None]
+                for job_id in bitmis[:fazla]:
+                    del self._jobs[job_id]
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, fn):
+        job.status = 'running'
+        try:
+            with metrikler.toplayici() as olcumler:
+                job.stage_metrics = olcumler
+                job.result = fn(job)
+            job.status = 'succeeded'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            print(f"Eğitim işi başarısız ({job.id}): {str(e)}")
+            print(f"Hata detayı: {traceback.format_exc()}")
+        finally:
+            job.finished_at = datetime.now().isoformat(timespec='seconds')
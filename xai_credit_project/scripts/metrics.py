@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Ölçümleme
+Eğitim ve tahmin yollarındaki aşamaların duvar saati süresini, CPU süresini ve
+tepe bellek kullanımını; API isteklerinin aşama bazında gecikme
+histogramlarını toplar. Ölçümler Prometheus metin biçiminde dışa aktarılır.
+"""
+
+import functools
+import logging
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# İstek aşamaları için gecikme kovaları (saniye)
+GECIKME_KOVALARI = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Eğitim hattı aşamaları için süre kovaları (saniye)
+ASAMA_KOVALARI = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+logger = logging.getLogger(__name__)
+
+_PROC_STATUS = "/proc/self/status"
+_PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def _hwm_bayt():
+    """Sürecin tepe RSS değeri (bayt)
+
+    Linux'ta /proc/self/status içindeki VmHWM okunur; diğer sistemlerde süreç
+    ömrü boyunca ulaşılan en yüksek RSS döndürülür.
+    """
+    try:
+        with open(_PROC_STATUS) as f:
+            for satir in f:
+                if satir.startswith("VmHWM:"):
+                    return int(satir.split()[1]) * 1024
+    except OSError:
+        pass
+    tepe = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return tepe if sys.platform == "darwin" else tepe * 1024
+
+
+def _hwm_sifirla():
+    """Tepe RSS değerini geçerli RSS'e indir (Linux); başarılıysa True"""
+    try:
+        with open(_PROC_CLEAR_REFS, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class Histogram:
+    """Sabit kovalı, iş parçacığı güvenli histogram"""
+
+    def __init__(self, kovalar):
+        self.kovalar = tuple(kovalar)
+        self._sayilar = [0] * (len(self.kovalar) + 1)
+        self._toplam = 0.0
+        self._adet = 0
+        self._lock = threading.Lock()
+
+    def gozlemle(self, deger):
+        i = 0
+        while i < len(self.kovalar) and deger > self.kovalar[i]:
+            i += 1
+        with self._lock:
+            self._sayilar[i] += 1
+            self._toplam += deger
+            self._adet += 1
+
+    def durum(self):
+        """(kova sınırları, kümülatif sayılar, toplam, adet)"""
+        with self._lock:
+            sayilar, toplam, adet = list(self._sayilar), self._toplam, self._adet
+        kumulatif, birikim = [], 0
+        for sayi in sayilar:
+            birikim += sayi
+            kumulatif.append(birikim)
+        return self.kovalar + (float('inf'),), kumulatif, toplam, adet
+
+
+def _etiket_metni(etiketler):
+    if not etiketler:
+        return ""
+    return "{" + ",".join(f'{ad}="{deger}"' for ad, deger in etiketler) + "}"
+
+
+def _sayi(deger):
+    if deger == float('inf'):
+        return "+Inf"
+    return repr(float(deger)) if isinstance(deger, float) else str(deger)
+
+
+class MetrikKaydi:
+    """Sayaç, gösterge ve histogramların süreç içi kaydı"""
+
+    def __init__(self, onek="kredi"):
+        self.onek = onek
+        self._lock = threading.Lock()
+        self._tanimlar = {}
+        self._degerler = {}
+        self._yerel = threading.local()
+        # Süreç genelinde etkin aşama sayısı: tepe RSS yalnızca hiçbir aşama yokken sıfırlanır
+        self._hwm_lock = threading.Lock()
+        self._etkin_asama = 0
+
+    def _seri(self, tip, ad, yardim, etiketler):
+        ad = f"{self.onek}_{ad}"
+        anahtar = tuple(sorted(etiketler.items()))
+        with self._lock:
+            self._tanimlar.setdefault(ad, (tip, yardim))
+            return ad, anahtar
+
+    def sayac_arttir(self, ad, miktar=1.0, yardim="", **etiketler):
+        ad, anahtar = self._seri('counter', ad, yardim, etiketler)
+        with self._lock:
+            seriler = self._degerler.setdefault(ad, {})
+            seriler[anahtar] = seriler.get(anahtar, 0.0) + miktar
+
+    def gosterge(self, ad, deger, yardim="", **etiketler):
+        ad, anahtar = self._seri('gauge', ad, yardim, etiketler)
+        with self._lock:
+            self._degerler.setdefault(ad, {})[anahtar] = float(deger)
+
+    def gozlemle(self, ad, deger, yardim="", kovalar=GECIKME_KOVALARI, **etiketler):
+        ad, anahtar = self._seri('histogram', ad, yardim, etiketler)
+        with self._lock:
+            seriler = self._degerler.setdefault(ad, {})
+            histogram = seriler.get(anahtar)
+            if histogram is None:
+                histogram = seriler[anahtar] = Histogram(kovalar)
+        histogram.gozlemle(deger)
+
+    @contextmanager
+    def sure(self, ad, yardim="", kovalar=GECIKME_KOVALARI, **etiketler):
+        """Bloğun süresini histograma ekle"""
+        baslangic = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.gozlemle(ad, time.perf_counter() - baslangic, yardim, kovalar, **etiketler)
+
+    def _toplayicilar(self):
+        if not hasattr(self._yerel, 'toplayicilar'):
+            self._yerel.toplayicilar = []
+        return self._yerel.toplayicilar
+
+    @contextmanager
+    def asama(self, ad):
+        """Bir hat aşamasının duvar saati, CPU süresi ve tepe belleğini ölç
+
+        Ölçüm sözlüğü verilir ve çıkışta doldurulur. CPU süresi süreç
+        genelidir: aşamanın açtığı işçi iş parçacıklarını ve aynı anda
+        çalışan diğer iş parçacıklarını (ör. API istekleri) da kapsar.
+        Tepe bellek süreç tepe RSS değeridir ve Linux'ta yalnızca başka etkin
+        aşama yokken sıfırlanır; iç içe veya başka iş parçacıklarındaki
+        aşamalarla çakışan bir aşamanın değeri, çakışan ilk aşamanın
+        başından beri ulaşılan tepedir (üst sınır).
+        """
+        with self._hwm_lock:
+            if self._etkin_asama == 0:
+                _hwm_sifirla()
+            self._etkin_asama += 1
+
+        olcum = {'stage': ad}
+        baslangic, cpu_baslangic = time.perf_counter(), time.process_time()
+        durum = 'succeeded'
+        try:
+            yield olcum
+        except Exception:
+            durum = 'failed'
+            raise
+        finally:
+            olcum.update(
+                wall_seconds=time.perf_counter() - baslangic,
+                cpu_seconds=time.process_time() - cpu_baslangic,
+                peak_rss_bytes=_hwm_bayt(),
+                status=durum
+            )
+            with self._hwm_lock:
+                self._etkin_asama -= 1
+            self._asamayi_kaydet(olcum)
+
+    def _asamayi_kaydet(self, olcum):
+        ad = olcum['stage']
+        self.gozlemle('stage_duration_seconds', olcum['wall_seconds'],
+                      "Hat aşamalarının duvar saati süresi", ASAMA_KOVALARI, stage=ad)
+        self.sayac_arttir('stage_cpu_seconds_total', olcum['cpu_seconds'],
+                          "Hat aşamalarının toplam CPU süresi", stage=ad)
+        self.sayac_arttir('stage_runs_total', 1, "Hat aşamalarının çalışma sayısı",
+                          stage=ad, status=olcum['status'])
+        self.gosterge('stage_peak_rss_bytes', olcum['peak_rss_bytes'],
+                      "Aşamanın son çalışmasındaki süreç tepe RSS değeri", stage=ad)
+        for toplayici in self._toplayicilar():
+            toplayici.append(dict(olcum))
+        logger.debug("[%s] %.3f sn, CPU %.3f sn, tepe RSS %.1f MB", ad, olcum['wall_seconds'],
+                     olcum['cpu_seconds'], olcum['peak_rss_bytes'] / 1024 ** 2)
+
+    @contextmanager
+    def toplayici(self):
+        """Bu iş parçacığında blok boyunca tamamlanan aşama ölçümlerini listede topla"""
+        olcumler = []
+        self._toplayicilar().append(olcumler)
+        try:
+            yield olcumler
+        finally:
+            self._yerel.toplayicilar = [t for t in self._yerel.toplayicilar if t is not olcumler]
+
+    def olculen(self, ad=None):
+        """Fonksiyonu aşama olarak ölçen dekoratör"""
+        def dekorator(fn):
+            @functools.wraps(fn)
+            def sarmalayici(*args, **kwargs):
+                with self.asama(ad or fn.__name__):
+                    return fn(*args, **kwargs)
+            return sarmalayici
+        return dekorator
+
+    def prometheus(self):
+        """Tüm metrikleri Prometheus metin biçiminde döndür"""
+        with self._lock:
+            tanimlar = dict(self._tanimlar)
+            degerler = {ad: dict(seriler) for ad, seriler in self._degerler.items()}
+
+        satirlar = []
+        for ad in sorted(degerler):
+            tip, yardim = tanimlar[ad]
+            if yardim:
+                satirlar.append(f"# HELP {ad} {yardim}")
+            satirlar.append(f"# TYPE {ad} {tip}")
+            for etiketler, deger in sorted(degerler[ad].items()):
+                if tip != 'histogram':
+                    satirlar.append(f"{ad}{_etiket_metni(etiketler)} {_sayi(deger)}")
+                    continue
+                kovalar, kumulatif, toplam, adet = deger.durum()
+                for sinir, sayi in zip(kovalar, kumulatif):
+                    satirlar.append(f"{ad}_bucket{_etiket_metni(etiketler + (('le', _sayi(sinir)),))} {sayi}")
+                satirlar.append(f"{ad}_sum{_etiket_metni(etiketler)} {_sayi(toplam)}")
+                satirlar.append(f"{ad}_count{_etiket_metni(etiketler)} {adet}")
+        return "\n".join(satirlar) + "\n"
+
+
+# Süreç genelinde paylaşılan kayıt
+metrikler = MetrikKaydi()
+olculen = metrikler.olculen
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Mikro Toplama
+Eşzamanlı tek satırlık tahmin isteklerini kısa bir süre (veya en fazla satır
+sayısına ulaşılana kadar) kuyrukta biriktirir, ormanı tüm satırlar için tek
+seferde vektörel olarak çalıştırır ve sonuçları bekleyen isteklere dağıtır.
+İstemci tarafında API değişmez; ağaç başına yük istek başına değil toplu
+değerlendirme başına ödenir.
+"""
+
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from scripts.metrics import metrikler
+
+# Varsayılan toplama penceresi (milisaniye) ve bir toplu değerlendirmedeki en fazla satır
+VARSAYILAN_BEKLEME_MS = 2.0
+VARSAYILAN_MAX_SATIR = 64
+# Sonuç bu süre içinde gelmezse istek kendi iş parçacığında skorlanır (milisaniye)
+VARSAYILAN_ZAMAN_ASIMI_MS = 1000.0
+
+# Toplu değerlendirme satır sayısı için histogram kovaları
+TOPLU_BOYUT_KOVALARI = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+# Kuyrukta eklenen bekleme süresi için kovalar (saniye)
+BEKLEME_KOVALARI = (0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+
+class _Is:
+    """Kuyruktaki tek bir isteğin satırları ve sonucu"""
+
+    __slots__ = ('pipeline', 'X', 'zaman', 'bitti', 'sonuc', 'hata', 'kilit', 'iptal')
+
+    def __init__(self, pipeline, X):
+        self.pipeline = pipeline
+        self.X = X
+        self.zaman = time.perf_counter()
+        self.bitti = threading.Event()
+        self.sonuc = None
+        self.hata = None
+        # Zaman aşımında çağıran işi geri alır; işçi artık sonuç veya satır yazmaz
+        self.kilit = threading.Lock()
+        self.iptal = False
+
+    def teslim_et(self, sonuc=None, hata=None, X=None):
+        """Sonucu (veya hatayı) bir kez ilet; geri alınmış veya bitmiş işler atlanır"""
+        with self.kilit:
+            if self.iptal or self.bitti.is_set():
+                return
+            if X is not None:
+                # Ölçeklenmiş satırlar çağıranın dizisine geri yazılır
+                self.X[:] = X
+            self.sonuc = sonuc
+            self.hata = hata
+            self.bitti.set()
+
+    def geri_al(self):
+        """Sonuç henüz iletilmediyse işi iptal et; iptal edildiyse True"""
+        with self.kilit:
+            if not self.bitti.is_set():
+                self.iptal = True
+            return self.iptal
+
+
+class TahminBirlestirici:
+    """Tek satırlık tahminleri toplu orman değerlendirmesinde birleştirir
+
+    bekleme_ms ilk isteğin kuyruğa girişinden itibaren diğer isteklerin
+    bekleneceği en uzun süredir; max_satir'a ulaşılırsa beklemeden
+    değerlendirilir. bekleme_ms 0 veya max_satir 1 ise tahmin çağıran iş
+    parçacığında doğrudan yapılır. Farklı model görüntülerinden gelen
+    istekler aynı toplu değerlendirmede birleştirilmez. Sonuç zaman_asimi_ms
+    içinde gelmezse (ör. işçi takıldıysa) istek doğrudan skorlanır; 0 ise
+    süresiz beklenir.
+    """
+
+    def __init__(self, bekleme_ms=VARSAYILAN_BEKLEME_MS, max_satir=VARSAYILAN_MAX_SATIR,
+                 zaman_asimi_ms=VARSAYILAN_ZAMAN_ASIMI_MS):
+        self.bekleme = max(float(bekleme_ms), 0.0) / 1000
+        self.max_satir = max(int(max_satir), 1)
+        self.zaman_asimi = max(float(zaman_asimi_ms), 0.0) / 1000
+        self._kuyruk = queue.Queue()
+        self._isci = None
+        self._baslatma_lock = threading.Lock()
+
+    @classmethod
+    def ortamdan(cls):
+        """KREDI_BATCH_WAIT_MS, KREDI_BATCH_MAX_ROWS ve KREDI_BATCH_TIMEOUT_MS ortam değişkenlerinden oluştur"""
+        return cls(
+            bekleme_ms=float(os.getenv('KREDI_BATCH_WAIT_MS') or VARSAYILAN_BEKLEME_MS),
+            max_satir=int(os.getenv('KREDI_BATCH_MAX_ROWS') or VARSAYILAN_MAX_SATIR),
+            zaman_asimi_ms=float(os.getenv('KREDI_BATCH_TIMEOUT_MS') or VARSAYILAN_ZAMAN_ASIMI_MS)
+        )
+
+    @property
+    def etkin(self):
+        return self.bekleme > 0 and self.max_satir > 1
+
+    def _isciyi_baslat(self):
+        if self._isci is None:
+            with self._baslatma_lock:
+                if self._isci is None:
+                    self._isci = threading.Thread(
+                        target=self._calistir, name='tahmin-birlestirici', daemon=True
+                    )
+                    self._isci.start()
+
+    def predict_proba(self, pipeline, X):
+        """(n, 3) float64 ham satırlar için olasılıklar
+
+        pipeline.predict_proba ile aynı sözleşme: X yerinde ölçeklenir, böylece
+        çağıran ölçeklenmiş satırları açıklayıcıya doğrudan verebilir.
+        """
+        if not self.etkin:
+            return pipeline.predict_proba(X)
+
+        self._isciyi_baslat()
+        is_ = _Is(pipeline, X)
+        self._kuyruk.put(is_)
+        metrikler.gosterge('predict_queue_depth', self._kuyruk.qsize(),
+                           "Toplu değerlendirme bekleyen tahmin isteği sayısı")
+        if not is_.bitti.wait(self.zaman_asimi or None) and is_.geri_al():
+            metrikler.sayac_arttir('predict_batch_timeouts_total', 1,
+                                   "Toplu değerlendirme zaman aşımı nedeniyle doğrudan skorlanan istekler")
+            # İşçi geri alınmış işin dizisine dokunmaz; X hâlâ ham satırları içerir
+            return pipeline.predict_proba(X)
+        if is_.hata is not None:
+            raise is_.hata
+        return is_.sonuc
+
+    def _topla(self, isler):
+        """İlk isteği bekle; pencere dolana veya satır sınırına ulaşılana kadar isler'e biriktir"""
+        ilk = self._kuyruk.get()
+        isler.append(ilk)
+        satir = ilk.X.shape[0]
+        son = ilk.zaman + self.bekleme
+        while satir < self.max_satir:
+            kalan = son - time.perf_counter()
+            try:
+                # Pencere geçtiyse yalnızca kuyrukta hazır bekleyenler alınır
+                is_ = self._kuyruk.get(timeout=kalan) if kalan > 0 else self._kuyruk.get_nowait()
+            except queue.Empty:
+                break
+            isler.append(is_)
+            satir += is_.X.shape[0]
+        metrikler.gosterge('predict_queue_depth', self._kuyruk.qsize(),
+                           "Toplu değerlendirme bekleyen tahmin isteği sayısı")
+
+    def _calistir(self):
+        while True:
+            isler = []
+            try:
+                self._topla(isler)
+                gruplar = {}
+                for is_ in isler:
+                    gruplar.setdefault(id(is_.pipeline), []).append(is_)
+                for grup in gruplar.values():
+                    self._degerlendir(grup)
+            except Exception as e:
+                # İşçi hiçbir hatada durmaz; bekleyen her istek hatayı alır
+                for is_ in isler:
+                    is_.teslim_et(hata=e)
+
+    def _degerlendir(self, isler):
+        """Aynı hattın isteklerini tek çağrıda skorla ve sonuçları dağıt"""
+        try:
+            self._skorla(isler)
+        except Exception as e:
+            for is_ in isler:
+                is_.teslim_et(hata=e)
+
+    def _skorla(self, isler):
+        baslangic = time.perf_counter()
+        for is_ in isler:
+            metrikler.gozlemle('predict_batch_wait_seconds', baslangic - is_.zaman,
+                               "Toplu değerlendirme için kuyrukta eklenen bekleme",
+                               BEKLEME_KOVALARI)
+        # Her zaman kopya üzerinde skorlanır; çağıranın dizisi yalnızca teslimde değişir
+        X = np.concatenate([is_.X for is_ in isler])
+        proba = isler[0].pipeline.predict_proba(X)
+
+        metrikler.gozlemle('predict_batch_rows', X.shape[0],
+                           "Toplu değerlendirme başına satır sayısı", TOPLU_BOYUT_KOVALARI)
+        metrikler.gozlemle('predict_batch_requests', len(isler),
+                           "Toplu değerlendirme başına istek sayısı", TOPLU_BOYUT_KOVALARI)
+        i = 0
+        for is_ in isler:
+            n = is_.X.shape[0]
+            is_.teslim_et(sonuc=proba[i:i + n], X=X[i:i + n])
+            i += n
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Model Kaydı
+Servis edilen modeli değişmez, sürümlenmiş anlık görüntüler (snapshot) olarak
+tutar. Yeni model tek bir referans ataması ile yayınlanır; okuyucular kilit
+almadan ve kopyalamadan her zaman tutarlı bir model/arka plan çifti görür.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ModelSnapshot:
+    """Bir model sürümünün değişmez görüntüsü"""
+    version: str
+    pipeline: object
+    background: np.ndarray
+    meta: dict = field(default_factory=dict)
+    # Arka plan bir özetse temsilcilerin ağırlıkları (tam eğitim setinde None)
+    background_weights: Optional[np.ndarray] = None
+
+    @classmethod
+    def olustur(cls, version, pipeline, background, meta=None, background_weights=None):
+        """Arka plan verisini salt okunur diziye çevirerek görüntü oluştur"""
+        background = _salt_okunur(background)
+        if background_weights is not None:
+            background_weights = _salt_okunur(background_weights)
+        return cls(version=version, pipeline=pipeline, background=background, meta=dict(meta or {}),
+                   background_weights=background_weights)
+
+
+def _salt_okunur(dizi):
+    dizi = np.asarray(dizi, dtype=np.float64)
+    if dizi.flags.writeable:
+        dizi = dizi.view()
+        dizi.flags.writeable = False
+    return dizi
+
+
+class ModelRegistry:
+    """Geçerli model görüntüsünü tutar ve atomik olarak değiştirir"""
+
+    def __init__(self):
+        self._current = None
+        self._publish_lock = threading.Lock()
+        self._listeners = []
+
+    def current(self):
+        """Geçerli görüntüyü döndür (model yoksa None)"""
+        return self._current
+
+    def publish(self, snapshot):
+        """Yeni görüntüyü tek adımda devreye al ve dinleyicileri bilgilendir"""
+        with self._publish_lock:
+            onceki = self._current
+            self._current = snapshot
+            for listener in self._listeners:
+                listener(snapshot, onceki)
+        print(f"Model sürümü yayınlandı: {snapshot.version}")
+        return onceki
+
+    def on_publish(self, listener):
+        """Her yayında listener(yeni, onceki) çağrılır"""
+        self._listeners.append(listener)
+        return listener
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Çıkarım Hattı
+Eğitimde kullanılan StandardScaler parametrelerini ve ormanı tek bir nesnede
+birleştirir; ölçekleme NumPy yığını üzerinde yerinde uygulanır, böylece API
+eğitimle aynı dönüşümü DataFrame oluşturmadan kullanır.
+"""
+
+import threading
+
+import numpy as np
+
+# Modelin beklediği sütun sırası ve ölçeklenen sütunlar
+FEATURE_COLUMNS = ['Employed', 'Bank Balance', 'Annual Salary']
+SCALED_COLUMNS = ['Bank Balance', 'Annual Salary']
+
+
+class InferencePipeline:
+    """Ölçekleme + orman çıkarımı
+
+    engine (ör. FlatForest) verilirse olasılıklar onunla hesaplanır; model
+    açıklayıcılar için scikit-learn ormanı olarak kalır. model yerine
+    model_loader verilirse orman ilk erişimde yüklenir; yalnızca tahmin yapan
+    süreçler scikit-learn'ü hiç içe aktarmaz.
+    """
+
+    def __init__(self, model, mean, scale, scaled_idx, engine=None, model_loader=None):
+        if model is None and (engine is None or model_loader is None):
+            raise ValueError("model verilmezse engine ve model_loader gerekli")
+        self._model = model
+        self._model_loader = model_loader
+        self._model_lock = threading.Lock()
+        self.engine = engine
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+        self.scaled_idx = np.asarray(scaled_idx, dtype=np.intp)
+        self.classes_ = np.asarray((model if model is not None else engine).classes_)
+
+    @classmethod
+    def from_scaler(cls, model, scaler, scaled_columns=SCALED_COLUMNS, engine=None):
+        """Eğitilmiş StandardScaler'ın ortalama ve ölçek dizilerinden hat oluştur"""
+        return cls.from_params(scaler.mean_, scaler.scale_, scaled_columns, model=model, engine=engine)
+
+    @classmethod
+    def from_params(cls, mean, scale, scaled_columns=SCALED_COLUMNS, model=None, engine=None, model_loader=None):
+        """Kayıtlı ölçekleyici parametrelerinden hat oluştur (scikit-learn gerekmez)"""
+        scaled_idx = [FEATURE_COLUMNS.index(col) for col in scaled_columns]
+        return cls(model, mean, scale, scaled_idx, engine=engine, model_loader=model_loader)
+
+    @property
+    def model(self):
+        """scikit-learn ormanı (model_loader verildiyse ilk erişimde yüklenir)"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._model_loader()
+        return self._model
+
+    @property
+    def feature_importances_(self):
+        return self.model.feature_importances_
+
+    def transform_inplace(self, X):
+        """Ölçeklemeyi (n, 3) float64 dizisine yerinde uygula"""
+        for k, j in enumerate(self.scaled_idx):
+            sutun = X[:, j]
+            sutun -= self.mean_[k]
+            sutun /= self.scale_[k]
+        return X
+
+    def _batch(self, X):
+        """Girdiyi yazılabilir float64 matrise çevir; uygunsa kopyalamadan kullan"""
+        if hasattr(X, 'to_numpy'):
+            return X[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.dtype != np.float64 or not X.flags.writeable:
+            X = X.astype(np.float64)
+        return X
+
+    def predict_proba(self, X):
+        """Ham özelliklerden olasılık tahmini
+
+        NumPy float64 girdiler yerinde ölçeklenir; çağrıdan sonra dizi
+        modelin gördüğü (ölçeklenmiş) değerleri içerir.
+        """
+        X = self.transform_inplace(self._batch(X))
+        return (self.model if self.engine is None else self.engine).predict_proba(X)
+
+    def predict(self, X):
+        """Ham özelliklerden sınıf tahmini (olasılıklardan türetilir)"""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
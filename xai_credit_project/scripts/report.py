@@ -0,0 +1,405 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Artımlı Rapor Üretimi
+Rapordaki her grafik, girdilerinin özetiyle anahtarlanan bir yapıt olarak
+tanımlanır. Grafikler rapor klasörüne ayrı PNG dosyaları olarak bir kez yazılır;
+yalnızca girdisi değişen grafikler, başsız (Agg) bir süreç havuzunda paralel
+olarak yeniden çizilir. HTML dosyası grafiklere bağlantı verir ve içeriği
+değişmedikçe yeniden yazılmaz.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from scripts.config import RESULTS_DIR, ortam_int, sonuc_yolu
+from scripts.metrics import olculen
+
+# Çizim fonksiyonları değişirse artırılır (tüm grafikler yeniden çizilir)
+SEKIL_SURUMU = 1
+
+SEKIL_KLASORU = "rapor_sekilleri"
+
+
+@dataclass(frozen=True)
+class Sekil:
+    """Bir rapor grafiği: çizim fonksiyonu ve girdileri"""
+    ad: str
+    ciz: object
+    veri: dict = field(default_factory=dict)
+
+    def anahtar(self):
+        """Çizim fonksiyonu ve girdilerin özeti; girdi değişmedikçe sabittir"""
+        ozet = hashlib.sha256(f"{SEKIL_SURUMU}:{self.ciz.__module__}.{self.ciz.__name__}".encode("utf-8"))
+        for ad in sorted(self.veri):
+            deger = self.veri[ad]
+            ozet.update(ad.encode("utf-8"))
+            if isinstance(deger, np.ndarray):
+                ozet.update(f"{deger.dtype}{deger.shape}".encode("utf-8"))
+                ozet.update(np.ascontiguousarray(deger).tobytes())
+            else:
+                ozet.update(json.dumps(deger, sort_keys=True, default=str).encode("utf-8"))
+        return ozet.hexdigest()[:16]
+
+    def dosya_adi(self):
+        return f"{self.ad}-{self.anahtar()}.png"
+
+
+def _figur(figsize):
+    """pyplot durumu kullanmadan (başsız) bir figür ve eksen oluştur"""
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+def _kaydet(fig, yol):
+    fig.tight_layout()
+    gecici = yol + ".tmp.png"
+    fig.savefig(gecici, format='png', bbox_inches='tight')
+    os.replace(gecici, yol)
+
+
+def karmasiklik_matrisi_ciz(veri, yol):
+    import seaborn as sns
+    fig, ax = _figur((8, 6))
+    sns.heatmap(veri['cm'], annot=True, fmt='d', cmap='Blues', ax=ax)
+    ax.set_title('Karmaşıklık Matrisi')
+    ax.set_ylabel('Gerçek Değer')
+    ax.set_xlabel('Tahmin')
+    _kaydet(fig, yol)
+
+
+def ozellik_onemi_ciz(veri, yol):
+    import seaborn as sns
+    fig, ax = _figur((10, 6))
+    sns.barplot(x=veri['onem'], y=veri['ozellik'], ax=ax)
+    ax.set_xlabel('önem')
+    ax.set_ylabel('özellik')
+    ax.set_title('Özellik Önem Dereceleri')
+    _kaydet(fig, yol)
+
+
+def dagilim_ciz(veri, yol):
+    import pandas as pd
+    import seaborn as sns
+    fig, ax = _figur((8, 5))
+    sns.histplot(
+        x=pd.Series(veri['x'], name=veri['sutun']),
+        hue=pd.Series(veri['y'], name=veri['hedef']),
+        multiple="stack",
+        ax=ax
+    )
+    ax.set_title(f"{veri['sutun']} Dağılımı")
+    _kaydet(fig, yol)
+
+
+def dagilim_histogram_ciz(veri, yol):
+    """Önceden hesaplanmış sınıf bazlı kutulardan yığılmış histogram çiz"""
+    import seaborn as sns
+    fig, ax = _figur((8, 5))
+    kenarlar = veri['kenarlar']
+    genislik = np.diff(kenarlar)
+    alt = np.zeros(len(genislik))
+    renkler = sns.color_palette(n_colors=len(veri['siniflar']))
+    for sinif, sayim, renk in zip(veri['siniflar'], veri['sayimlar'], renkler):
+        ax.bar(kenarlar[:-1], sayim, width=genislik, bottom=alt.copy(), align='edge',
+               color=renk, alpha=0.75, edgecolor='black', label=str(sinif))
+        alt += sayim
+    # Yığılmış çubukların alt kenarları eksen sınırını sabitler; üst boşluk elle bırakılır
+    ax.set_ylim(0, max(float(alt.max()), 1.0) * 1.05)
+    ax.legend(title=veri['hedef'])
+    ax.set_xlabel(veri['sutun'])
+    ax.set_ylabel('Count' if veri['orneklem'] is None else 'Count (tahmini)')
+    ax.set_title(f"{veri['sutun']} Dağılımı")
+    _kaydet(fig, yol)
+
+
+def tabakali_orneklem(y, sinir, random_state=42):
+    """Sınıf oranlarını koruyan en fazla `sinir` satırlık örneklem indeksleri"""
+    y = np.asarray(y)
+    if sinir is None or len(y) <= sinir:
+        return None
+    rng = np.random.default_rng(random_state)
+    siniflar, sayilar = np.unique(y, return_counts=True)
+    indeksler = []
+    for sinif, sayi in zip(siniflar, sayilar):
+        # Her sınıftan en az bir satır: az görülen sınıf grafikten kaybolmasın
+        adet = max(1, int(round(sinir * sayi / len(y))))
+        indeksler.append(rng.choice(np.flatnonzero(y == sinif), size=min(adet, sayi), replace=False))
+    return np.sort(np.concatenate(indeksler))
+
+
+def kutu_kenarlari(x, bins=30):
+    """Eşit genişlikte kutular; az sayıda tam sayı değer alan sütunlarda birim kutular"""
+    en_kucuk, en_buyuk = float(np.min(x)), float(np.max(x))
+    if en_buyuk - en_kucuk <= bins and np.all(np.mod(x, 1) == 0):
+        return np.arange(en_kucuk - 0.5, en_buyuk + 1.5)
+    if en_buyuk == en_kucuk:
+        en_buyuk = en_kucuk + 1.0
+    return np.linspace(en_kucuk, en_buyuk, bins + 1)
+
+
+def sinifa_gore_histogram(x, y, bins=30, orneklem=None, random_state=42):
+    """Sütunu sınıf bazında kutula: (kenarlar, siniflar, sayimlar)
+
+    orneklem verilirse en fazla o kadar satırlık tabakalı örneklem kutulanır
+    ve sayımlar sınıf başına örnekleme oranıyla tüm veriye ölçeklenir.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y)
+    siniflar, toplamlar = np.unique(y, return_counts=True)
+    secim = tabakali_orneklem(y, orneklem, random_state)
+    if secim is not None:
+        x, y = x[secim], y[secim]
+
+    kenarlar = kutu_kenarlari(x, bins)
+    sayimlar = np.zeros((len(siniflar), len(kenarlar) - 1))
+    for k, (sinif, toplam) in enumerate(zip(siniflar, toplamlar)):
+        maske = y == sinif
+        sayim, _ = np.histogram(x[maske], bins=kenarlar)
+        sayimlar[k] = sayim * (toplam / max(int(maske.sum()), 1))
+    return kenarlar, siniflar, sayimlar
+
+
+def _sekil_ciz(sekil, yol):
+    sekil.ciz(sekil.veri, yol)
+    return sekil.ad
+
+
+def sekilleri_uret(sekiller, rapor_dizini, n_jobs=None):
+    """Eksik grafikleri çiz ve {ad: rapor_dizinine göre yol} döndür
+
+    Dosya adı girdi özetini içerdiğinden var olan dosyalar yeniden çizilmez.
+    Artık kullanılmayan eski grafik dosyaları silinir.
+    """
+    klasor = os.path.join(rapor_dizini, SEKIL_KLASORU)
+    os.makedirs(klasor, exist_ok=True)
+
+    yollar = {sekil.ad: f"{SEKIL_KLASORU}/{sekil.dosya_adi()}" for sekil in sekiller}
+    eksikler = [
+        sekil for sekil in sekiller
+        if not os.path.exists(os.path.join(klasor, sekil.dosya_adi()))
+    ]
+    print(f"Rapor grafikleri: {len(sekiller) - len(eksikler)} önbellekten, {len(eksikler)} çizilecek")
+
+    n_jobs = min(n_jobs or int(os.getenv('RAPOR_N_JOBS', os.cpu_count() or 1)), len(eksikler))
+    hedefler = [os.path.join(klasor, sekil.dosya_adi()) for sekil in eksikler]
+    if n_jobs <= 1:
+        for sekil, hedef in zip(eksikler, hedefler):
+            _sekil_ciz(sekil, hedef)
+    else:
+        # spawn: işçiler ana süreçteki GUI arka ucunu ve pyplot durumunu devralmaz
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('spawn')) as havuz:
+            for _ in havuz.map(_sekil_ciz, eksikler, hedefler):
+                pass
+
+    gecerli = {os.path.basename(yol) for yol in yollar.values()}
+    for ad in os.listdir(klasor):
+        if ad.endswith(".png") and ad not in gecerli:
+            os.remove(os.path.join(klasor, ad))
+    return yollar
+
+
+def degisirse_yaz(yol, icerik):
+    """Dosyayı yalnızca içerik değiştiyse yaz; yazıldıysa True döndür"""
+    if os.path.exists(yol):
+        with open(yol, encoding="utf-8") as f:
+            if f.read() == icerik:
+                return False
+    gecici = yol + ".tmp"
+    with open(gecici, "w", encoding="utf-8") as f:
+        f.write(icerik)
+    os.replace(gecici, yol)
+    return True
+
+
+@olculen()
+def create_html_report(model, X_orig, X_scaled, y, df, performans_metrikleri, y_test, y_pred, ai_interpretation, n_jobs=None):
+    """Gelişmiş HTML raporu oluştur
+
+    Grafikler girdilerinin özetiyle önbelleğe alınan ayrı PNG dosyalarıdır;
+    yalnızca girdisi değişenler paralel olarak yeniden çizilir.
+    """
+    sekiller = [
+        create_confusion_matrix(y_test, y_pred),
+        create_importance_plot(X_orig.columns, model.feature_importances_),
+        *create_distribution_plots(X_orig, y)
+    ]
+    yollar = sekilleri_uret(sekiller, RESULTS_DIR, n_jobs=n_jobs)
+    
+    # Veri dağılımı grafikleri
+    dist_plots = "".join(
+        f"""
+        <div class="col-md-6 mb-4">
+            <img src="{yollar[f'dagilim_{i}']}" alt="{col} Dağılımı">
+        </div>
+        """
+        for i, col in enumerate(X_orig.columns)
+    )
+    
+    # Veri seti istatistikleri
+    stats = df.describe().round(2).to_html(classes='table table-striped')
+    
+    html_template = """
+    <!DOCTYPE html>
+    <html lang="tr">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Kredi Temerrüt Tahmin Raporu</title>
+        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
+        <style>
+            body {{ padding: 20px; background-color: #f8f9fa; }}
+            .container {{ max-width: 1200px; background-color: white; padding: 30px; border-radius: 10px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }}
+            .section {{ margin-bottom: 40px; }}
+            img {{ max-width: 100%; height: auto; border-radius: 5px; }}
+            .metric-card {{ background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
+            .interpretation {{ background-color: #e9ecef; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
+            pre {{ background-color: #f8f9fa; padding: 15px; border-radius: 5px; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1 class="mb-4">Kredi Temerrüt Tahmin Analizi</h1>
+            
+            <div class="section">
+                <h2>Model Performansı</h2>
+                <div class="row">
+                    <div class="col-md-6">
+                        <div class="metric-card">
+                            <h4>ROC AUC Skoru</h4>
+                            <h2>{roc_auc:.4f}</h2>
+                        </div>
+                    </div>
+                </div>
+                <pre>{classification_report}</pre>
+            </div>
+            
+            <div class="section">
+                <h2>AI Yorumu</h2>
+                <div class="interpretation">
+                    {ai_interpretation}
+                </div>
+            </div>
+            
+            <div class="section">
+                <h2>Karmaşıklık Matrisi</h2>
+                <img src="{cm_yolu}" alt="Karmaşıklık Matrisi">
+            </div>
+            
+            <div class="section">
+                <h2>Özellik Önem Dereceleri</h2>
+                <img src="{importance_yolu}" alt="Özellik Önem Dereceleri">
+            </div>
+            
+            <div class="section">
+                <h2>Özellik Dağılımları</h2>
+                <div class="row">
+                    {dist_plots}
+                </div>
+            </div>
+            
+            <div class="section">
+                <h2>Veri Seti İstatistikleri</h2>
+                {stats}
+            </div>
+            
+            <div class="section">
+                <h2>Model Açıklamaları</h2>
+                <p>Detaylı SHAP ve LIME açıklamaları için lütfen aşağıdaki dosyalara bakın:</p>
+                <ul>
+                    <li><a href="shap_ozet.png">SHAP Özet Grafiği</a></li>
+                    <li><a href="lime_aciklama.html">LIME Açıklamaları</a></li>
+                </ul>
+            </div>
+        </div>
+        
+        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
+    </body>
+    </html>
+    """
+    
+    # HTML içeriğini oluştur
+    html_content = html_template.format(
+        roc_auc=performans_metrikleri['roc_auc'],
+        classification_report=performans_metrikleri['classification_report'],
+        ai_interpretation=ai_interpretation.replace('\n', '<br>'),
+        cm_yolu=yollar['karmasiklik_matrisi'],
+        importance_yolu=yollar['ozellik_onemi'],
+        dist_plots=dist_plots,
+        stats=stats
+    )
+    
+    # HTML dosyasını yalnızca içerik değiştiyse yaz
+    if not degisirse_yaz(sonuc_yolu("rapor.html"), html_content):
+        print("Rapor değişmedi")
+
+
+def create_confusion_matrix(y_test, y_pred):
+    """Karmaşıklık matrisi grafiği"""
+    from sklearn.metrics import confusion_matrix
+    return Sekil('karmasiklik_matrisi', karmasiklik_matrisi_ciz, {
+        'cm': confusion_matrix(y_test, y_pred)
+    })
+
+
+def create_importance_plot(ozellikler, onemler):
+    """Özellik önem grafiği (büyükten küçüğe)"""
+    sira = np.argsort(-np.asarray(onemler), kind='stable')
+    return Sekil('ozellik_onemi', ozellik_onemi_ciz, {
+        'ozellik': [str(ozellikler[i]) for i in sira],
+        'onem': np.asarray(onemler, dtype=np.float64)[sira]
+    })
+
+
+# Bu satır sayısının üzerinde dağılımlar önceden kutulanarak çizilir
+RAPOR_HAM_SATIR_SINIRI = 100000
+
+
+def create_distribution_plots(X, y, mod=None, orneklem=None, bins=30):
+    """Her özellik için sınıfa göre yığılmış dağılım grafiği
+
+    mod='ham' ham satırları sns.histplot'a verir; mod='histogram' her sütunu
+    np.histogram ile sınıf bazında kutular ve yalnızca kutuları çizer, böylece
+    çizim süresi satır sayısından bağımsız kalır. Varsayılan (RAPOR_DAGILIM_MODU
+    veya 'otomatik') büyük veri setlerinde 'histogram' seçer. orneklem (veya
+    RAPOR_ORNEKLEM) kutulamadan önce tabakalı örneklem sınırıdır.
+    """
+    mod = mod or os.getenv('RAPOR_DAGILIM_MODU', 'otomatik')
+    if mod == 'otomatik':
+        mod = 'histogram' if len(X) > RAPOR_HAM_SATIR_SINIRI else 'ham'
+    if mod not in ('ham', 'histogram'):
+        raise ValueError(f"Geçersiz dağılım modu: {mod}")
+    orneklem = orneklem if orneklem is not None else ortam_int('RAPOR_ORNEKLEM')
+    
+    if mod == 'ham':
+        return [
+            Sekil(f'dagilim_{i}', dagilim_ciz, {
+                'sutun': str(col),
+                'x': X[col].to_numpy(),
+                'hedef': str(y.name),
+                'y': y.to_numpy()
+            })
+            for i, col in enumerate(X.columns)
+        ]
+    
+    y_dizi = y.to_numpy()
+    sekiller = []
+    for i, col in enumerate(X.columns):
+        kenarlar, siniflar, sayimlar = sinifa_gore_histogram(X[col].to_numpy(), y_dizi, bins, orneklem)
+        sekiller.append(Sekil(f'dagilim_{i}', dagilim_histogram_ciz, {
+            'sutun': str(col),
+            'hedef': str(y.name),
+            'kenarlar': kenarlar,
+            'siniflar': siniflar.tolist(),
+            'sayimlar': sayimlar,
+            'orneklem': orneklem
+        }))
+    return sekiller
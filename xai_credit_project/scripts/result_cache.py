@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Sonuç Önbelleği
+Aynı başvuru tekrar gönderildiğinde (arayüz yenilemeleri, istemci yeniden
+denemeleri) tahmin ve açıklamayı yeniden hesaplamadan döndürür. Anahtar,
+doğrulanmış girdi satırı, açıklama ayarları ve model sürümünden türetilir.
+Süreç içi katman bayt sınırlı LRU'dur; isteğe bağlı paylaşılan arka uç
+(ör. birden fazla API süreci için) aynı arayüzle takılabilir.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from scripts.metrics import metrikler
+
+# Süreç içi katmanın varsayılan bellek sınırı (MB)
+VARSAYILAN_MAX_MB = 64
+
+
+def _anahtar_surumu(anahtar):
+    return anahtar.partition(":")[0]
+
+
+def sonuc_anahtari(version, X, **ayarlar):
+    """Model sürümü, float64'e normalleştirilmiş ham satırlar ve ayarlardan anahtar
+
+    Girdi doğrulamadan sonra oluşturulur; "1", 1 ve 1.0 aynı anahtarı verir.
+    Anahtar "<sürüm>:" ile başlar; arka uçlar eski sürümlerin kayıtlarını buna
+    göre ayırt eder.
+    """
+    ozet = hashlib.sha256()
+    ozet.update(version.encode("utf-8"))
+    ozet.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    ozet.update(json.dumps(ayarlar, sort_keys=True).encode("utf-8"))
+    return f"{version}:{ozet.hexdigest()[:32]}"
+
+
+class BellekArkaUcu:
+    """Süreç içi paylaşılan arka uç (test ve tek süreçli kurulumlar için)
+
+    Paylaşılan arka uçlar oku(anahtar), yaz(anahtar, deger, ttl), temizle()
+    ve eskileri_temizle(version) metodlarını sağlar; değerler JSON'a
+    çevrilebilir sözlüklerdir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._kayitlar = {}
+
+    def oku(self, anahtar):
+        with self._lock:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is None:
+                return None
+            deger, son = kayit
+            if son is not None and son <= time.time():
+                del self._kayitlar[anahtar]
+                return None
+            return deger
+
+    def yaz(self, anahtar, deger, ttl=None):
+        with self._lock:
+            self._kayitlar[anahtar] = (deger, time.time() + ttl if ttl else None)
+
+    def temizle(self):
+        with self._lock:
+            self._kayitlar = {}
+
+    def eskileri_temizle(self, version):
+        """version'dan eski sürümlerin kayıtlarını sil"""
+        with self._lock:
+            self._kayitlar = {
+                anahtar: kayit for anahtar, kayit in self._kayitlar.items()
+                if _anahtar_surumu(anahtar) >= version
+            }
+
+
+class DosyaArkaUcu:
+    """Yerel dosya arka ucu (anahtar başına bir JSON dosyası)
+
+    Aynı makinedeki API süreçleri dizini paylaşarak sonuçları paylaşır. Dosya
+    adı model sürümüyle başlar: <sürüm>.<özet>.json
+    """
+
+    def __init__(self, dizin):
+        self.dizin = dizin
+
+    def _yol(self, anahtar):
+        ozet = hashlib.sha256(anahtar.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.dizin, f"{_anahtar_surumu(anahtar)}.{ozet}.json")
+
+    def oku(self, anahtar):
+        yol = self._yol(anahtar)
+        try:
+            with open(yol, encoding="utf-8") as f:
+                kayit = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if kayit.get('anahtar') != anahtar:
+            return None
+        if kayit.get('son') is not None and kayit['son'] <= time.time():
+            try:
+                os.remove(yol)
+            except OSError:
+                pass
+            return None
+        return kayit.get('deger')
+
+    def yaz(self, anahtar, deger, ttl=None):
+        os.makedirs(self.dizin, exist_ok=True)
+        yol = self._yol(anahtar)
+        gecici = f"{yol}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump({'anahtar': anahtar, 'son': time.time() + ttl if ttl else None, 'deger': deger},
+                      f, ensure_ascii=False)
+        os.replace(gecici, yol)
+
+    def temizle(self):
+        try:
+            dosyalar = os.listdir(self.dizin)
+        except OSError:
+            return
+        for ad in dosyalar:
+            if ad.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.dizin, ad))
+                except OSError:
+                    pass
+
+    def eskileri_temizle(self, version):
+        """version'dan eski sürümlerin dosyalarını sil; diğer süreçlerin güncel kayıtları kalır"""
+        try:
+            dosyalar = os.listdir(self.dizin)
+        except OSError:
+            return
+        for ad in dosyalar:
+            if ad.endswith(".json") and ad.split(".", 1)[0] < version:
+                try:
+                    os.remove(os.path.join(self.dizin, ad))
+                except OSError:
+                    pass
+
+
+class SonucOnbellegi:
+    """Bayt sınırlı LRU + isteğe bağlı TTL ve paylaşılan arka uç
+
+    Önce süreç içi katmana, bulunamazsa arka uca bakılır; arka uçtan gelen
+    sonuç süreç içi katmana da yazılır. max_mb 0 ise önbellek kapalıdır.
+    """
+
+    def __init__(self, max_mb=VARSAYILAN_MAX_MB, ttl=None, arka_uc=None):
+        self.max_bayt = int(max_mb * 1024 ** 2)
+        self.ttl = ttl or None
+        self.arka_uc = arka_uc
+        self._lock = threading.Lock()
+        self._kayitlar = OrderedDict()
+        self._bayt = 0
+        self._sayaclar = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    @classmethod
+    def ortamdan(cls):
+        """KREDI_RESULT_CACHE_MB, KREDI_RESULT_CACHE_TTL ve KREDI_RESULT_CACHE_DIR'den oluştur"""
+        dizin = os.getenv('KREDI_RESULT_CACHE_DIR')
+        return cls(
+            max_mb=float(os.getenv('KREDI_RESULT_CACHE_MB') or VARSAYILAN_MAX_MB),
+            ttl=float(os.getenv('KREDI_RESULT_CACHE_TTL') or 0),
+            arka_uc=DosyaArkaUcu(dizin) if dizin else None
+        )
+
+    @property
+    def etkin(self):
+        return self.max_bayt > 0
+
+    def _say(self, olay, tur):
+        with self._lock:
+            self._sayaclar[olay] += 1
+        metrikler.sayac_arttir('result_cache_events_total', 1,
+                               "Sonuç önbelleği isabet, ıska ve çıkarma sayıları", event=olay, kind=tur)
+
+    def getir(self, anahtar, tur):
+        """Önbellekteki sonucu döndür; yoksa veya süresi dolduysa None"""
+        if not self.etkin:
+            return None
+        with self._lock:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is not None:
+                deger, boyut, son = kayit
+                if son is not None and son <= time.monotonic():
+                    del self._kayitlar[anahtar]
+                    self._bayt -= boyut
+                    deger = None
+                else:
+                    self._kayitlar.move_to_end(anahtar)
+            else:
+                deger = None
+
+        if deger is None and self.arka_uc is not None:
+            deger = self.arka_uc.oku(anahtar)
+            if deger is not None:
+                self._yerel_yaz(anahtar, deger, tur)
+
+        self._say('hits' if deger is not None else 'misses', tur)
+        return deger
+
+    def koy(self, anahtar, deger, tur):
+        """Sonucu (JSON'a çevrilebilir sözlük) önbelleğe yaz"""
+        if not self.etkin:
+            return
+        self._yerel_yaz(anahtar, deger, tur)
+        if self.arka_uc is not None:
+            try:
+                self.arka_uc.yaz(anahtar, deger, self.ttl)
+            except Exception as e:
+                # Paylaşılan arka uç yazılamasa da süreç içi katman kullanılır
+                print(f"Sonuç önbelleği arka ucuna yazılamadı: {str(e)}")
+
+    def _yerel_yaz(self, anahtar, deger, tur):
+        # Boyut, sonucun JSON gösterimiyle yaklaşık olarak ölçülür
+        boyut = len(json.dumps(deger, ensure_ascii=False)) + len(anahtar)
+        if boyut > self.max_bayt:
+            return
+        son = time.monotonic() + self.ttl if self.ttl else None
+        cikarilan = 0
+        with self._lock:
+            eski = self._kayitlar.pop(anahtar, None)
+            if eski is not None:
+                self._bayt -= eski[1]
+            self._kayitlar[anahtar] = (deger, boyut, son)
+            self._bayt += boyut
+            while self._bayt > self.max_bayt:
+                _, (_, eski_boyut, _) = self._kayitlar.popitem(last=False)
+                self._bayt -= eski_boyut
+                cikarilan += 1
+            bayt, adet = self._bayt, len(self._kayitlar)
+        for _ in range(cikarilan):
+            self._say('evictions', tur)
+        metrikler.gosterge('result_cache_bytes', bayt, "Sonuç önbelleğinin süreç içi boyutu (bayt)")
+        metrikler.gosterge('result_cache_entries', adet, "Sonuç önbelleğindeki kayıt sayısı")
+
+    def gecersiz_kil(self, version=None):
+        """Süreç içi sonuçları sil (yeni model yayınlandığında)
+
+        Anahtarlar model sürümünü içerdiğinden paylaşılan arka uç silinmez;
+        version verilirse yalnızca ondan eski sürümlerin kayıtları silinir.
+        Böylece bir sürecin açılıştaki yayını diğer süreçlerin önbelleğini
+        boşaltmaz.
+        """
+        with self._lock:
+            self._kayitlar = OrderedDict()
+            self._bayt = 0
+            self._sayaclar['invalidations'] += 1
+        if self.arka_uc is not None and version is not None:
+            self.arka_uc.eskileri_temizle(version)
+        metrikler.gosterge('result_cache_bytes', 0, "Sonuç önbelleğinin süreç içi boyutu (bayt)")
+        metrikler.gosterge('result_cache_entries', 0, "Sonuç önbelleğindeki kayıt sayısı")
+
+    def stats(self):
+        """İsabet/ıska sayıları ve doluluk"""
+        with self._lock:
+            sayaclar = dict(self._sayaclar)
+            bayt, adet = self._bayt, len(self._kayitlar)
+        toplam = sayaclar['hits'] + sayaclar['misses']
+        return {
+            **sayaclar,
+            'hit_ratio': sayaclar['hits'] / toplam if toplam else None,
+            'entries': adet,
+            'bytes': bayt,
+            'max_bytes': self.max_bayt,
+            'ttl_seconds': self.ttl,
+            'backend': type(self.arka_uc).__name__ if self.arka_uc is not None else None
+        }
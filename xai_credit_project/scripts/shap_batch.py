@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Toplu SHAP Hesaplama
+Büyük değerlendirme kümelerini parçalara bölüp bir süreç havuzunda TreeSHAP ile
+açıklar. Satır bazındaki katkılar bellek eşlemeli bir .npy deposuna yazılır;
+böylece başvuru bazında açıklamalar yeniden hesaplanmadan okunabilir.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import joblib
+import numpy as np
+
+from scripts.config import RESULTS_DIR
+
+# Model sürümü başına bir alt klasör: results/shap_degerleri/<sürüm>/
+SHAP_DEPO_KOKU = os.path.join(RESULTS_DIR, "shap_degerleri")
+
+VALUES_FILE = "values.npy"
+IDS_FILE = "row_ids.npy"
+INPUT_FILE = "input.npy"
+MODEL_FILE = "model.joblib"
+META_FILE = "meta.json"
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Süreç başına bir kez oluşturulan açıklayıcı
+_worker_explainer = None
+
+
+def shap_deposu_dizini(version):
+    """Model sürümünün satır bazında SHAP deposu"""
+    return os.path.join(SHAP_DEPO_KOKU, version)
+
+
+def shap_pozitif_sinif(shap_values):
+    """SHAP çıktısından pozitif sınıfın (temerrüt) katkılarını al"""
+    if isinstance(shap_values, list):
+        return shap_values[1]
+    if shap_values.ndim == 3:
+        return shap_values[:, :, 1]
+    return shap_values
+
+
+def _pozitif_beklenen_deger(explainer):
+    return float(np.ravel(explainer.expected_value)[-1])
+
+
+def _worker_baslat(model_yolu):
+    """Süreç başlangıcında modeli yükle ve açıklayıcıyı bir kez oluştur"""
+    global _worker_explainer
+    import shap
+    _worker_explainer = shap.TreeExplainer(joblib.load(model_yolu, mmap_mode='r'))
+
+
+def _parca_hesapla(depo_dizini, baslangic, bitis):
+    """Girdiyi bellek eşlemeli oku, katkıları doğrudan depo dosyasına yaz"""
+    X = np.load(os.path.join(depo_dizini, INPUT_FILE), mmap_mode='r')
+    degerler = np.load(os.path.join(depo_dizini, VALUES_FILE), mmap_mode='r+')
+    degerler[baslangic:bitis] = shap_pozitif_sinif(_worker_explainer.shap_values(np.asarray(X[baslangic:bitis])))
+    degerler.flush()
+    return bitis - baslangic
+
+
+def shap_toplu_hesapla(model, X, depo_dizini, row_ids=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                       n_jobs=None, feature_names=None):
+    """X için SHAP katkılarını parça parça hesaplayıp depoya yaz ve depoyu döndür"""
+    baslangic_zamani = time.perf_counter()
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    n, f = X.shape
+    row_ids = np.arange(n) if row_ids is None else np.asarray(row_ids)
+    n_jobs = n_jobs or int(os.getenv('SHAP_N_JOBS', os.cpu_count() or 1))
+
+    os.makedirs(depo_dizini, exist_ok=True)
+    # Meta dosyası en son yazılır; yoksa depo eksik kabul edilir
+    if os.path.exists(os.path.join(depo_dizini, META_FILE)):
+        os.remove(os.path.join(depo_dizini, META_FILE))
+    np.save(os.path.join(depo_dizini, IDS_FILE), row_ids)
+    degerler = np.lib.format.open_memmap(
+        os.path.join(depo_dizini, VALUES_FILE), mode='w+', dtype=np.float64, shape=(n, f)
+    )
+
+    parcalar = [(b, min(b + chunk_size, n)) for b in range(0, n, chunk_size)]
+    import shap
+    explainer = shap.TreeExplainer(model)
+
+    if n_jobs <= 1 or len(parcalar) <= 1:
+        for b, e in parcalar:
+            degerler[b:e] = shap_pozitif_sinif(explainer.shap_values(X[b:e]))
+        degerler.flush()
+    else:
+        # İşçiler girdiyi ve modeli diskten bellek eşlemeli okur; büyük diziler kopyalanmaz
+        del degerler
+        np.save(os.path.join(depo_dizini, INPUT_FILE), X)
+        model_yolu = os.path.join(depo_dizini, MODEL_FILE)
+        joblib.dump(model, model_yolu)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(n_jobs, len(parcalar)),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_worker_baslat,
+                initargs=(model_yolu,)
+            ) as havuz:
+                for _ in havuz.map(_parca_hesapla, [depo_dizini] * len(parcalar), *zip(*parcalar)):
+                    pass
+        finally:
+            for gecici in (INPUT_FILE, MODEL_FILE):
+                yol = os.path.join(depo_dizini, gecici)
+                if os.path.exists(yol):
+                    os.remove(yol)
+
+    meta = {
+        'rows': n,
+        'features': f,
+        'feature_names': list(feature_names) if feature_names is not None else None,
+        'expected_value': _pozitif_beklenen_deger(explainer),
+        'chunk_size': chunk_size,
+        'n_jobs': n_jobs,
+        'seconds': time.perf_counter() - baslangic_zamani,
+        'created_at': datetime.now().isoformat(timespec='seconds')
+    }
+    with open(os.path.join(depo_dizini, META_FILE), "w", encoding="utf-8") as f_meta:
+        json.dump(meta, f_meta, ensure_ascii=False, indent=2)
+
+    print(f"SHAP deposu yazıldı: {depo_dizini} ({n} satır, {len(parcalar)} parça, {meta['seconds']:.2f} sn)")
+    return ShapDeposu(depo_dizini)
+
+
+class ShapDeposu:
+    """Diskteki SHAP katkılarına satır kimliğiyle erişim"""
+
+    def __init__(self, depo_dizini):
+        self.dizin = depo_dizini
+        with open(os.path.join(depo_dizini, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.values = np.load(os.path.join(depo_dizini, VALUES_FILE), mmap_mode='r')
+        self.row_ids = np.load(os.path.join(depo_dizini, IDS_FILE))
+        self._sira = np.argsort(self.row_ids, kind='stable')
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    def getir(self, row_ids):
+        """Verilen satır kimliklerinin katkılarını döndür; bulunamayanlar KeyError"""
+        row_ids = np.atleast_1d(np.asarray(row_ids, dtype=self.row_ids.dtype))
+        sirali = self.row_ids[self._sira]
+        if len(sirali) == 0:
+            raise KeyError(f"SHAP deposunda bulunamayan satırlar: {row_ids.tolist()}")
+        konum = np.searchsorted(sirali, row_ids)
+        konum = np.minimum(konum, len(sirali) - 1)
+        bulunamayan = sirali[konum] != row_ids
+        if bulunamayan.any():
+            raise KeyError(f"SHAP deposunda bulunamayan satırlar: {row_ids[bulunamayan].tolist()}")
+        return np.asarray(self.values[self._sira[konum]])
+
+
+def eski_depolari_temizle(ana_dizin=SHAP_DEPO_KOKU, keep=5, koru=()):
+    """Sürüm adına göre en yeni `keep` depo dışındakileri sil
+
+    Yalnızca meta.json içeren (tamamlanmış) sürüm klasörleri sayılır; diğer
+    dosya ve klasörlere dokunulmaz. `koru` içindeki sürümler (ör. servis
+    edilen model) yaşlarından bağımsız olarak silinmez.
+    """
+    import shutil
+    if not os.path.isdir(ana_dizin):
+        return
+    depolar = sorted(
+        ad for ad in os.listdir(ana_dizin)
+        if os.path.isfile(os.path.join(ana_dizin, ad, META_FILE))
+    )
+    for ad in depolar[:-keep] if keep > 0 else depolar:
+        if ad in koru:
+            continue
+        shutil.rmtree(os.path.join(ana_dizin, ad), ignore_errors=True)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Akışlı Veri Yükleme
+Bellekten büyük CSV dosyalarını parça parça, sıkıştırılmış veri tipleriyle okur.
+İlk geçişte aykırı değer sınırları için yaklaşık bir kantil taslağı (sketch),
+ikinci geçişte filtreleme ve ölçekleyici istatistikleri (akan momentler)
+hesaplanır. Filtrelenen satırlar sütun bazında diske yazılır ve bellek
+eşlemeli döndürülür; tepe bellek satır sayısından değil parça boyutundan
+ve taslak kapasitesinden belirlenir.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from scripts.data_cache import eski_onbellekleri_temizle, klasorden_oku, meta_yaz
+
+# Okuma sırasında kullanılan sıkıştırılmış veri tipleri (eksik değer için nullable)
+CSV_DTYPES = {
+    'Index': 'Int64',
+    'Employed': 'Int8',
+    'Bank Balance': 'float32',
+    'Annual Salary': 'float32',
+    'Defaulted?': 'Int8'
+}
+# Eksik değerler temizlendikten sonraki veri tipleri
+CLEAN_DTYPES = {
+    'Index': 'int64',
+    'Employed': 'int8',
+    'Bank Balance': 'float32',
+    'Annual Salary': 'float32',
+    'Defaulted?': 'int8'
+}
+IQR_COLUMNS = ['Bank Balance', 'Annual Salary']
+FEATURE_COLUMNS = ['Employed', 'Bank Balance', 'Annual Salary']
+TARGET_COLUMN = 'Defaulted?'
+
+DEFAULT_CHUNKSIZE = 500_000
+DEFAULT_SKETCH_CAPACITY = 200_000
+
+
+class RowReservoirSketch:
+    """Sabit kapasiteli satır rezervuarı ile yaklaşık kantil taslağı
+
+    Satır sayısı kapasiteyi aşmadıkça kantiller tam olarak hesaplanır. Satırlar
+    birlikte saklandığı için sütunlar arası sıralı filtreler de taslak üzerinde
+    uygulanabilir.
+    """
+
+    def __init__(self, n_columns, capacity=DEFAULT_SKETCH_CAPACITY, random_state=42):
+        self.capacity = capacity
+        self.rows = np.empty((capacity, n_columns), dtype=np.float64)
+        self.size = 0
+        self.seen = 0
+        self._rng = np.random.default_rng(random_state)
+
+    def update(self, values):
+        """Bir parçayı rezervuara ekle (vektörleştirilmiş Algoritma R)"""
+        values = np.asarray(values, dtype=np.float64)
+        m = values.shape[0]
+
+        # Önce boş kapasiteyi doldur
+        bos = min(self.capacity - self.size, m)
+        if bos > 0:
+            self.rows[self.size:self.size + bos] = values[:bos]
+            self.size += bos
+            self.seen += bos
+            values = values[bos:]
+            m -= bos
+        if m == 0:
+            return
+
+        # Her yeni satır seen+1 / kapasite olasılıkla rastgele bir konumu değiştirir
+        sira = self.seen + 1 + np.arange(m)
+        konum = self._rng.integers(0, sira)
+        kabul = konum < self.capacity
+        self.rows[konum[kabul]] = values[kabul]
+        self.seen += m
+
+    def sample(self):
+        return self.rows[:self.size]
+
+
+class RunningMoments:
+    """Parça parça birleştirilebilen ortalama ve varyans (Chan yöntemi)"""
+
+    def __init__(self, n_columns):
+        self.count = 0
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        n_b = values.shape[0]
+        if n_b == 0:
+            return
+        mean_b = values.mean(axis=0)
+        m2_b = ((values - mean_b) ** 2).sum(axis=0)
+
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * n_b / n
+        self.m2 = self.m2 + m2_b + delta ** 2 * n_a * n_b / n
+        self.count = n
+
+    @property
+    def var(self):
+        return self.m2 / self.count
+
+
+def _iqr_sinirlari(sample, iqr_carpani=1.5):
+    """Orijinal sıralı IQR filtresini taslak üzerinde uygula ve sınırları döndür"""
+    sinirlar = {}
+    for j, col in enumerate(IQR_COLUMNS):
+        Q1, Q3 = np.quantile(sample[:, j], [0.25, 0.75])
+        IQR = Q3 - Q1
+        alt, ust = Q1 - iqr_carpani * IQR, Q3 + iqr_carpani * IQR
+        sinirlar[col] = (alt, ust)
+        sample = sample[(sample[:, j] >= alt) & (sample[:, j] <= ust)]
+    return sinirlar
+
+
+def _parcalari_oku(veri_yolu, chunksize):
+    """CSV'yi sıkıştırılmış tiplerle parça parça oku, eksik değerleri temizle"""
+    for parca in pd.read_csv(veri_yolu, dtype=CSV_DTYPES, chunksize=chunksize):
+        yield parca.dropna().astype(CLEAN_DTYPES)
+
+
+def akisli_veri_yukle(veri_yolu, chunksize=DEFAULT_CHUNKSIZE, sketch_capacity=DEFAULT_SKETCH_CAPACITY,
+                      iqr_carpani=1.5, cikti_dizini=None):
+    """Veriyi iki geçişte yükle, temizle ve ölçekle
+
+    veri_yukle_ve_onisle(return_scaler=True) ile aynı değerleri döndürür:
+    (X_scaled, y, df, X, scaler). DataFrame'ler veri önbelleği biçiminde
+    (scripts.data_cache) yazılmış .npy sütunlarının bellek eşlemeli
+    görünümleridir. cikti_dizini verilirse sütunlar oraya (önbellek
+    klasörü) yazılır; verilmezse geçici bir klasör kullanılır.
+    """
+    # 1. geçiş: aykırı değer sınırları için kantil taslağı
+    taslak = RowReservoirSketch(len(IQR_COLUMNS), capacity=sketch_capacity)
+    toplam = 0
+    for parca in _parcalari_oku(veri_yolu, chunksize):
+        taslak.update(parca[IQR_COLUMNS].to_numpy())
+        toplam += len(parca)
+    print(f"1. geçiş tamamlandı: {toplam} satır, taslak boyutu {taslak.size}")
+
+    sinirlar = _iqr_sinirlari(taslak.sample(), iqr_carpani)
+    for col, (alt, ust) in sinirlar.items():
+        print(f"{col} için sınırlar: [{alt:.2f}, {ust:.2f}]")
+
+    # 2. geçiş: filtrele, ölçekleyici momentlerini biriktir; filtrelenen parçalar
+    # bellekte birleştirilmez, sütun bazında ham dosyaların sonuna eklenir
+    gecici = cikti_dizini + ".tmp" if cikti_dizini else tempfile.mkdtemp(prefix="kredi_akisli_")
+    shutil.rmtree(gecici, ignore_errors=True)
+    os.makedirs(gecici)
+    momentler = RunningMoments(len(IQR_COLUMNS))
+    sutunlar = list(CLEAN_DTYPES)
+    dosyalar = {ad: open(os.path.join(gecici, ad + ".bin"), "wb") for ad in ['index'] + sutunlar}
+    try:
+        for parca in _parcalari_oku(veri_yolu, chunksize):
+            maske = np.ones(len(parca), dtype=bool)
+            for col, (alt, ust) in sinirlar.items():
+                degerler = parca[col].to_numpy()
+                maske &= (degerler >= alt) & (degerler <= ust)
+            parca = parca[maske]
+            momentler.update(parca[IQR_COLUMNS].to_numpy())
+            parca.index.to_numpy(dtype=np.int64).tofile(dosyalar['index'])
+            for col in sutunlar:
+                parca[col].to_numpy().tofile(dosyalar[col])
+    finally:
+        for f in dosyalar.values():
+            f.close()
+    n = momentler.count
+    print(f"2. geçiş tamamlandı. Yeni boyut: ({n}, {len(sutunlar)})")
+
+    # Ölçekleyiciyi biriken momentlerden kur (StandardScaler ile aynı, ddof=0)
+    scaler = StandardScaler()
+    scaler.n_features_in_ = len(IQR_COLUMNS)
+    scaler.n_samples_seen_ = n
+    scaler.mean_ = momentler.mean
+    scaler.var_ = momentler.var
+    scaler.scale_ = np.sqrt(momentler.var) if n else np.ones(len(IQR_COLUMNS))
+    scaler.scale_[scaler.scale_ == 0] = 1.0
+
+    # Ham dosyaları veri önbelleği biçimindeki .npy sütunlarına parça parça dönüştür;
+    # ölçeklenmiş sütunlar da aynı geçişte yazılır
+    def _npy_yaz(ad, kaynak, dtype, donustur=None):
+        hedef = np.lib.format.open_memmap(os.path.join(gecici, ad), mode='w+', dtype=dtype, shape=(n,))
+        for baslangic in range(0, n, chunksize):
+            parca = kaynak[baslangic:baslangic + chunksize]
+            hedef[baslangic:baslangic + chunksize] = donustur(parca) if donustur else parca
+        hedef.flush()
+        del hedef
+
+    def _ham(ad, dtype):
+        yol = os.path.join(gecici, ad + ".bin")
+        return np.memmap(yol, dtype=dtype, mode='r', shape=(n,)) if n else np.empty(0, dtype=dtype)
+
+    _npy_yaz("index.npy", _ham('index', np.int64), np.int64)
+    for i, col in enumerate(sutunlar):
+        _npy_yaz(f"df_{i}.npy", _ham(col, CLEAN_DTYPES[col]), CLEAN_DTYPES[col])
+    for i, col in enumerate(FEATURE_COLUMNS):
+        if col in IQR_COLUMNS:
+            j = IQR_COLUMNS.index(col)
+            _npy_yaz(f"scaled_{i}.npy", _ham(col, CLEAN_DTYPES[col]), np.float32,
+                     lambda x, j=j: (x - scaler.mean_[j]) / scaler.scale_[j])
+        else:
+            _npy_yaz(f"scaled_{i}.npy", _ham(col, CLEAN_DTYPES[col]), CLEAN_DTYPES[col])
+    for ad in ['index'] + sutunlar:
+        os.remove(os.path.join(gecici, ad + ".bin"))
+    meta_yaz(gecici, sutunlar, n, scaler)
+    print("Özellikler ölçeklendirildi")
+
+    if cikti_dizini:
+        shutil.rmtree(cikti_dizini, ignore_errors=True)
+        os.replace(gecici, cikti_dizini)
+        print(f"Ön işlenmiş veri önbelleğe yazıldı: {cikti_dizini}")
+        eski_onbellekleri_temizle(os.path.dirname(cikti_dizini))
+        return klasorden_oku(cikti_dizini)
+
+    sonuc = klasorden_oku(gecici)
+    # Eşlenmiş dosyalar açık kaldıkça okunabilir (POSIX); klasör hemen silinir
+    shutil.rmtree(gecici, ignore_errors=True)
+    return sonuc
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Eğitim
+Veri yükleme ve ön işleme, SMOTE ile dengeleme, orman eğitimi, sıcak
+başlatmalı güncelleme ve performans değerlendirmesi. scikit-learn, imblearn
+ve pandas'ı yükler; yalnızca eğitim yapan süreçler tarafından içe aktarılmalı.
+"""
+
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+from imblearn.over_sampling import SMOTE
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import StandardScaler
+
+from scripts.config import ortam_int, sonuc_yolu
+from scripts.data_cache import CACHE_DIR, onbellek_anahtari, onbellekten_oku, onbellege_yaz
+from scripts.drift import ozellik_referansi
+from scripts.metrics import olculen
+from scripts.pipeline import FEATURE_COLUMNS, InferencePipeline
+from scripts.streaming import akisli_veri_yukle
+
+# Bu boyutun üzerindeki CSV dosyaları akışlı olarak işlenir
+AKISLI_ESIK_BAYT = 512 * 1024 * 1024
+
+
+# Ön işleme ayarları (değiştiğinde veri önbelleği geçersiz olur)
+ONISLEME_AYARLARI = {
+    'iqr_carpani': 1.5,
+    'iqr_sutunlari': ['Bank Balance', 'Annual Salary'],
+    'olceklenen_sutunlar': ['Bank Balance', 'Annual Salary']
+}
+
+
+@olculen()
+def veri_yukle_ve_onisle(return_scaler=False, akisli=None, onbellek=None, veri_yolu=None, return_referans=False):
+    """Veri setini yükle, temizle ve ön işle
+
+    return_scaler=True ise eğitilmiş StandardScaler da döndürülür.
+    return_referans=True ise ham özelliklerin drift referans histogramları
+    (scripts.drift.ozellik_referansi) en sona eklenir.
+    veri_yolu verilmezse data/Default_Fin.csv kullanılır.
+    akisli=None ise büyük dosyalar (veya KREDI_STREAMING=1) akışlı yüklenir.
+    onbellek=None ise KREDI_DATA_CACHE=0 olmadıkça ön işlenmiş veri önbelleği kullanılır.
+    """
+    try:
+        # Veriyi yükle
+        veri_yolu = veri_yolu or os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "Default_Fin.csv")
+        print(f"Veri yükleniyor: {veri_yolu}")
+        
+        if not os.path.exists(veri_yolu):
+            raise FileNotFoundError(f"Veri dosyası bulunamadı: {veri_yolu}")
+        
+        if akisli is None:
+            akisli = os.getenv('KREDI_STREAMING') == '1' or os.path.getsize(veri_yolu) > AKISLI_ESIK_BAYT
+        if onbellek is None:
+            onbellek = os.getenv('KREDI_DATA_CACHE', '1') != '0'
+        
+        # Önbellek anahtarı: CSV içeriği + ön işleme ayarları
+        sonuc = None
+        if onbellek:
+            anahtar = onbellek_anahtari(veri_yolu, dict(ONISLEME_AYARLARI, akisli=akisli))
+            sonuc = onbellekten_oku(anahtar)
+        
+        if sonuc is None:
+            if akisli:
+                # Akışlı yükleme sütunları doğrudan önbellek klasörüne yazar
+                print("Akışlı yükleme kullanılıyor")
+                sonuc = akisli_veri_yukle(
+                    veri_yolu, iqr_carpani=ONISLEME_AYARLARI['iqr_carpani'],
+                    cikti_dizini=os.path.join(CACHE_DIR, anahtar) if onbellek else None
+                )
+            else:
+                sonuc = _veriyi_bellekte_onisle(veri_yolu)
+                if onbellek:
+                    onbellege_yaz(anahtar, sonuc[0], sonuc[1], sonuc[2], sonuc[4])
+        
+        X_scaled, y, df, X, scaler = sonuc
+        donus = (X_scaled, y, df, X) + ((scaler,) if return_scaler else ())
+        if return_referans:
+            donus += (ozellik_referansi(X, FEATURE_COLUMNS),)
+        return donus
+        
+    except Exception as e:
+        print(f"Veri yükleme ve ön işleme sırasında hata: {str(e)}")
+        raise
+
+
+def _veriyi_bellekte_onisle(veri_yolu):
+    """CSV'yi tek seferde okuyup temizle ve ölçekle"""
+    df = pd.read_csv(veri_yolu)
+    print(f"Veri yüklendi. Boyut: {df.shape}")
+    
+    # Eksik değerleri kontrol et ve temizle
+    eksik_sayisi = df.isnull().sum().sum()
+    print(f"Eksik değer sayısı: {eksik_sayisi}")
+    df = df.dropna()
+    print(f"Eksik değerler temizlendi. Yeni boyut: {df.shape}")
+    
+    # Aykırı değerleri tespit et ve temizle
+    carpan = ONISLEME_AYARLARI['iqr_carpani']
+    for col in ONISLEME_AYARLARI['iqr_sutunlari']:
+        Q1 = df[col].quantile(0.25)
+        Q3 = df[col].quantile(0.75)
+        IQR = Q3 - Q1
+        lower_bound = Q1 - carpan * IQR
+        upper_bound = Q3 + carpan * IQR
+        df = df[(df[col] >= lower_bound) & (df[col] <= upper_bound)]
+        print(f"{col} için aykırı değerler temizlendi. Yeni boyut: {df.shape}")
+    
+    # Özellikleri ve hedef değişkeni ayır
+    X = df[['Employed', 'Bank Balance', 'Annual Salary']]
+    y = df['Defaulted?']
+    print("Özellikler ve hedef değişken ayrıldı")
+    
+    # Sayısal özellikleri ölçeklendir
+    olceklenen = ONISLEME_AYARLARI['olceklenen_sutunlar']
+    scaler = StandardScaler()
+    X_scaled = X.copy()
+    X_scaled[olceklenen] = scaler.fit_transform(X[olceklenen])
+    print("Özellikler ölçeklendirildi")
+    
+    return X_scaled, y, df, X, scaler
+
+
+# Orman parametreleri (eğitim ve sıcak başlatmalı güncelleme aynı ayarları kullanır).
+# Elle seçilmiş varsayılanlardır; aday ayarlar scripts/tuning.py ile aranır.
+MODEL_AYARLARI = {
+    'n_estimators': 200,
+    'max_depth': 10,
+    'min_samples_split': 5,
+    'min_samples_leaf': 2,
+    'class_weight': 'balanced',
+    'random_state': 42
+}
+
+
+def egitim_cekirdek_sayisi(n_jobs=None):
+    """Eğitimde kullanılacak çekirdek sayısı
+
+    n_jobs verilmezse KREDI_N_JOBS okunur; o da yoksa tüm çekirdekler (-1) kullanılır.
+    """
+    if n_jobs is None:
+        n_jobs = ortam_int('KREDI_N_JOBS')
+    return -1 if n_jobs is None else n_jobs
+
+
+# SMOTE parametreleri (sampling_strategy: azınlık / çoğunluk oranı veya 'auto' = 1)
+SMOTE_AYARLARI = {
+    'k_neighbors': 5,
+    'sampling_strategy': 'auto'
+}
+
+
+def smote_uygula(X_train, y_train, n_jobs=None, **ayarlar):
+    """SMOTE ile dengesiz veri setini dengele (komşu araması çok çekirdekli)
+
+    ayarlar SMOTE_AYARLARI'nın üzerine uygulanır.
+    """
+    ayarlar = dict(SMOTE_AYARLARI, **ayarlar)
+    komsular = NearestNeighbors(n_neighbors=ayarlar['k_neighbors'] + 1, n_jobs=egitim_cekirdek_sayisi(n_jobs))
+    smote = SMOTE(random_state=42, k_neighbors=komsular, sampling_strategy=ayarlar['sampling_strategy'])
+    return smote.fit_resample(X_train, y_train)
+
+
+def orman_egit(X_train, y_train, n_jobs=None, **ayarlar):
+    """Ormanı tüm çekirdeklerde eğit; tahmin için tek iş parçacığına döndür"""
+    model = RandomForestClassifier(
+        n_jobs=egitim_cekirdek_sayisi(n_jobs),
+        **dict(MODEL_AYARLARI, **ayarlar)
+    )
+    # NumPy ile eğit: çıkarım hattı ve LIME sütun adı olmadan dizilerle çalışır
+    model.fit(np.asarray(X_train), y_train)
+    # Tek satırlık tahminlerde iş parçacığı havuzu kurulumu gecikmeyi artırır
+    model.n_jobs = None
+    return model
+
+
+@olculen()
+def model_egit(X, y, n_jobs=None, smote_ayarlari=None, **ayarlar):
+    """RandomForest modelini eğit
+
+    n_jobs SMOTE komşu araması ve orman eğitimi için çekirdek sayısıdır;
+    ayarlar MODEL_AYARLARI'nın, smote_ayarlari SMOTE_AYARLARI'nın üzerine
+    uygulanır.
+    """
+    # Veriyi böl
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    
+    X_train_balanced, y_train_balanced = smote_uygula(X_train, y_train, n_jobs, **(smote_ayarlari or {}))
+    model = orman_egit(X_train_balanced, y_train_balanced, n_jobs, **ayarlar)
+    
+    return model, X_train_balanced, X_test, y_train_balanced, y_test
+
+
+@olculen()
+def model_guncelle(model, X_yeni, y_yeni, ek_agac=50, n_jobs=None):
+    """Mevcut ormanı sıcak başlatarak yeni veri üzerinde ek_agac ağaç ekle
+
+    Eski ağaçlar yeniden eğitilmez. Servis edilen model değişmez; ağaçları
+    paylaşan yeni bir orman ve yeni ağaçların gördüğü dengelenmiş veri döndürülür.
+    """
+    X_balanced, y_balanced = smote_uygula(X_yeni, y_yeni, n_jobs)
+    
+    yeni = copy.copy(model)
+    yeni.estimators_ = list(model.estimators_)
+    yeni.set_params(
+        warm_start=True,
+        n_estimators=len(model.estimators_) + ek_agac,
+        n_jobs=egitim_cekirdek_sayisi(n_jobs)
+    )
+    yeni.fit(np.asarray(X_balanced), y_balanced)
+    yeni.set_params(warm_start=False, n_jobs=None)
+    
+    return yeni, X_balanced, y_balanced
+
+
+@olculen()
+def model_performansi(model, X_test, y_test):
+    """Model performansını detaylı olarak değerlendir
+
+    model bir InferencePipeline ise X_test ölçeklenmemiş özellikleri içermelidir.
+    """
+    proba = model.predict_proba(X_test if isinstance(model, InferencePipeline) else X_test.to_numpy())
+    y_pred = model.classes_[proba.argmax(axis=1)]
+    y_pred_proba = proba[:, 1]
+    
+    # Sınıflandırma raporu
+    rapor = classification_report(y_test, y_pred)
+    
+    # ROC AUC skoru
+    roc_auc = roc_auc_score(y_test, y_pred_proba)
+    
+    performans_metrikleri = {
+        'classification_report': rapor,
+        'roc_auc': roc_auc,
+        'confusion_matrix': confusion_matrix(y_test, y_pred).tolist()
+    }
+    
+    with open(sonuc_yolu("model_performans.txt"), "w", encoding="utf-8") as f:
+        f.write("Model Performans Raporu\n")
+        f.write("=======================\n\n")
+        f.write(f"ROC AUC Skoru: {roc_auc:.4f}\n\n")
+        f.write(rapor)
+    
+    return performans_metrikleri, y_pred
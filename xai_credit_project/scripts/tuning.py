@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Ayar Araması
+Orman ve SMOTE parametrelerini ardışık yarılama (successive halving) ile
+arar: tüm adaylar az ağaçla değerlendirilir, her turda en iyi 1/eta'lık kısım
+eta kat daha fazla ağaçla devam eder. Katmanlı çapraz doğrulama katları ve
+her SMOTE ayarı için dengelenmiş katlar bir kez hesaplanıp diske yazılır;
+süreç havuzundaki denemeler bunları bellek eşlemeli okur. Her denemenin
+skoru ve süresi bir sonuç tablosuna yazılır.
+"""
+
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from scripts.config import RESULTS_DIR, sonuc_yolu
+from scripts.metrics import olculen
+from scripts.training import MODEL_AYARLARI, SMOTE_AYARLARI, orman_egit, smote_uygula
+
+# Aranan orman parametreleri (n_estimators ardışık yarılamanın bütçesidir)
+ORMAN_UZAYI = {
+    'max_depth': [6, 8, 10, 14, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', None]
+}
+# Aranan SMOTE parametreleri
+SMOTE_UZAYI = {
+    'k_neighbors': [3, 5, 8],
+    'sampling_strategy': [0.5, 0.75, 'auto']
+}
+
+VARSAYILAN_ADAY = 27
+VARSAYILAN_KAT = 3
+VARSAYILAN_ETA = 3
+VARSAYILAN_MIN_AGAC = 25
+
+SONUC_TABLOSU = "ayar_arama.csv"
+SONUC_DOSYASI = "ayar_arama.json"
+
+# Süreç başına bir kez açılan kat dizinleri
+_isci_dizini = None
+
+
+def adaylari_sec(n_aday, random_state=42):
+    """Arama uzayından tekrarsız n_aday aday seç; ilk aday geçerli varsayılanlardır"""
+    orman_adlari, smote_adlari = list(ORMAN_UZAYI), list(SMOTE_UZAYI)
+    tum = list(itertools.product(*ORMAN_UZAYI.values(), *SMOTE_UZAYI.values()))
+    varsayilan = (
+        {ad: MODEL_AYARLARI[ad] if ad in MODEL_AYARLARI else 'sqrt' for ad in orman_adlari},
+        {ad: SMOTE_AYARLARI[ad] for ad in smote_adlari}
+    )
+    adaylar = [varsayilan]
+    for i in np.random.RandomState(random_state).permutation(len(tum)):
+        if len(adaylar) >= n_aday:
+            break
+        degerler = tum[i]
+        aday = (
+            dict(zip(orman_adlari, degerler[:len(orman_adlari)])),
+            dict(zip(smote_adlari, degerler[len(orman_adlari):]))
+        )
+        if aday != varsayilan:
+            adaylar.append(aday)
+    return adaylar
+
+
+def agac_basamaklari(min_agac, max_agac, eta):
+    """Turların ağaç sayıları: min_agac, min_agac*eta, ..., max_agac"""
+    basamaklar = [min_agac]
+    while basamaklar[-1] * eta < max_agac:
+        basamaklar.append(basamaklar[-1] * eta)
+    if basamaklar[-1] != max_agac:
+        basamaklar.append(max_agac)
+    return basamaklar
+
+
+def _smote_anahtari(ayarlar):
+    return json.dumps(ayarlar, sort_keys=True)
+
+
+@olculen()
+def katlari_hazirla(X, y, dizin, smote_ayarlari, kat_sayisi=VARSAYILAN_KAT, n_jobs=None):
+    """Katmanlı katları ve her SMOTE ayarı için dengelenmiş eğitim katlarını diske yaz
+
+    Doğrulama katları dengelenmez; skorlar gerçek sınıf oranında hesaplanır.
+    {smote anahtarı: kimlik} sözlüğünü döndürür.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    kimlikler = {}
+    for ayarlar in smote_ayarlari:
+        kimlikler.setdefault(_smote_anahtari(ayarlar), len(kimlikler))
+
+    katlar = StratifiedKFold(n_splits=kat_sayisi, shuffle=True, random_state=42)
+    for k, (egitim, dogrulama) in enumerate(katlar.split(X, y)):
+        np.save(os.path.join(dizin, f"kat{k}_dogrulama_X.npy"), X[dogrulama])
+        np.save(os.path.join(dizin, f"kat{k}_dogrulama_y.npy"), y[dogrulama])
+        for anahtar, kimlik in kimlikler.items():
+            X_bal, y_bal = smote_uygula(X[egitim], y[egitim], n_jobs, **json.loads(anahtar))
+            np.save(os.path.join(dizin, f"kat{k}_smote{kimlik}_X.npy"), np.asarray(X_bal, dtype=np.float64))
+            np.save(os.path.join(dizin, f"kat{k}_smote{kimlik}_y.npy"), np.asarray(y_bal))
+    print(f"{kat_sayisi} kat x {len(kimlikler)} SMOTE ayarı hazırlandı: {dizin}")
+    return kimlikler
+
+
+def _isci_baslat(dizin):
+    global _isci_dizini
+    _isci_dizini = dizin
+
+
+def _yukle(ad):
+    return np.load(os.path.join(_isci_dizini, ad), mmap_mode='r')
+
+
+def _deneme(orman_ayarlari, smote_kimligi, n_agac, kat_sayisi):
+    """Bir adayı tüm katlarda n_agac ağaçla eğit; ROC AUC skorlarını ve süreyi döndür"""
+    baslangic, cpu_baslangic = time.perf_counter(), time.process_time()
+    skorlar = []
+    for k in range(kat_sayisi):
+        model = orman_egit(
+            _yukle(f"kat{k}_smote{smote_kimligi}_X.npy"), _yukle(f"kat{k}_smote{smote_kimligi}_y.npy"),
+            n_jobs=1, **dict(orman_ayarlari, n_estimators=n_agac)
+        )
+        proba = model.predict_proba(np.asarray(_yukle(f"kat{k}_dogrulama_X.npy")))[:, 1]
+        skorlar.append(roc_auc_score(_yukle(f"kat{k}_dogrulama_y.npy"), proba))
+    return {
+        'roc_auc': float(np.mean(skorlar)),
+        'roc_auc_std': float(np.std(skorlar)),
+        'saniye': time.perf_counter() - baslangic,
+        'cpu_saniye': time.process_time() - cpu_baslangic
+    }
+
+
+def _tabloyu_yaz(denemeler, yol):
+    alanlar = (['tur', 'agac', 'aday'] + list(ORMAN_UZAYI) + list(SMOTE_UZAYI)
+               + ['roc_auc', 'roc_auc_std', 'saniye', 'cpu_saniye'])
+    with open(yol, "w", newline="", encoding="utf-8") as f:
+        yazici = csv.DictWriter(f, fieldnames=alanlar)
+        yazici.writeheader()
+        for deneme in denemeler:
+            yazici.writerow({ad: deneme.get(ad) for ad in alanlar})
+
+
+@olculen()
+def ardisik_yarilama(X, y, n_aday=VARSAYILAN_ADAY, kat_sayisi=VARSAYILAN_KAT, eta=VARSAYILAN_ETA,
+                     min_agac=VARSAYILAN_MIN_AGAC, max_agac=None, n_jobs=None, random_state=42):
+    """Adayları ardışık yarılama ile değerlendir
+
+    Her turda hayatta kalan adaylar süreç havuzunda paralel denenir; en iyi
+    ceil(n/eta) aday bir sonraki tura eta kat ağaçla geçer. Tüm denemeler
+    ve en iyi aday döndürülür.
+    """
+    max_agac = max_agac or MODEL_AYARLARI['n_estimators']
+    n_jobs = n_jobs or os.cpu_count() or 1
+    adaylar = adaylari_sec(n_aday, random_state)
+    basamaklar = agac_basamaklari(min_agac, max_agac, eta)
+    print(f"{len(adaylar)} aday, {kat_sayisi} kat, ağaç basamakları: {basamaklar}, {n_jobs} süreç")
+
+    denemeler = []
+    with tempfile.TemporaryDirectory(prefix="ayar_arama_") as dizin:
+        kimlikler = katlari_hazirla(X, y, dizin, [smote for _, smote in adaylar], kat_sayisi, n_jobs)
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_isci_baslat,
+            initargs=(dizin,)
+        ) as havuz:
+            hayatta = list(range(len(adaylar)))
+            for tur, n_agac in enumerate(basamaklar):
+                isler = {
+                    i: havuz.submit(_deneme, adaylar[i][0], kimlikler[_smote_anahtari(adaylar[i][1])],
+                                    n_agac, kat_sayisi)
+                    for i in hayatta
+                }
+                skorlar = {}
+                for i, is_ in isler.items():
+                    sonuc = is_.result()
+                    skorlar[i] = sonuc['roc_auc']
+                    denemeler.append({'tur': tur, 'agac': n_agac, 'aday': i,
+                                      **adaylar[i][0], **adaylar[i][1], **sonuc})
+                    print(f"tur={tur} agac={n_agac:<4} aday={i:<3} AUC={sonuc['roc_auc']:.4f} "
+                          f"(±{sonuc['roc_auc_std']:.4f}) {sonuc['saniye']:.2f}s")
+                if len(hayatta) == 1:
+                    break
+                hayatta = sorted(hayatta, key=lambda i: -skorlar[i])[:max(int(np.ceil(len(hayatta) / eta)), 1)]
+
+    en_iyi = max((d for d in denemeler if d['aday'] == hayatta[0]), key=lambda d: d['agac'])
+    return denemeler, {
+        'aday': en_iyi['aday'],
+        'model': dict(adaylar[en_iyi['aday']][0], n_estimators=en_iyi['agac']),
+        'smote': adaylar[en_iyi['aday']][1],
+        'roc_auc': en_iyi['roc_auc']
+    }
+
+
+def _test_skoru(X_train, y_train, X_test, y_test, model_ayarlari, smote_ayarlari, n_jobs):
+    X_bal, y_bal = smote_uygula(X_train, y_train, n_jobs, **smote_ayarlari)
+    model = orman_egit(X_bal, y_bal, n_jobs, **model_ayarlari)
+    return float(roc_auc_score(y_test, model.predict_proba(np.asarray(X_test))[:, 1]))
+
+
+def ayar_ara(X_scaled, y, n_jobs=None, **ayarlar):
+    """Eğitim bölümünde ayar ara, en iyi ve varsayılan ayarları test bölümünde karşılaştır
+
+    Bölme model_egit() ile aynıdır; test satırları aramada kullanılmaz.
+    Tüm denemeler results/ayar_arama.csv, özet results/ayar_arama.json
+    dosyasına yazılır.
+    """
+    baslangic = time.perf_counter()
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_scaled, y, test_size=0.2, random_state=42, stratify=y
+    )
+    X_train = np.asarray(X_train, dtype=np.float64)
+    y_train = np.asarray(y_train)
+    denemeler, en_iyi = ardisik_yarilama(X_train, y_train, n_jobs=n_jobs, **ayarlar)
+
+    en_iyi['test_roc_auc'] = _test_skoru(X_train, y_train, X_test, y_test, en_iyi['model'], en_iyi['smote'], n_jobs)
+    varsayilan_test = _test_skoru(X_train, y_train, X_test, y_test, {}, {}, n_jobs)
+
+    _tabloyu_yaz(denemeler, sonuc_yolu(SONUC_TABLOSU))
+    rapor = {
+        'ayarlar': dict(ayarlar, n_jobs=n_jobs),
+        'deneme_sayisi': len(denemeler),
+        'toplam_saniye': time.perf_counter() - baslangic,
+        'deneme_saniyesi_toplami': sum(d['saniye'] for d in denemeler),
+        'en_iyi': en_iyi,
+        'varsayilan': {
+            'model': dict(MODEL_AYARLARI),
+            'smote': dict(SMOTE_AYARLARI),
+            'test_roc_auc': varsayilan_test
+        },
+        'denemeler': denemeler
+    }
+    with open(sonuc_yolu(SONUC_DOSYASI), "w", encoding="utf-8") as f:
+        json.dump(rapor, f, ensure_ascii=False, indent=2)
+
+    print(f"En iyi aday {en_iyi['aday']}: model={en_iyi['model']} smote={en_iyi['smote']}")
+    print(f"CV AUC={en_iyi['roc_auc']:.4f}  test AUC={en_iyi['test_roc_auc']:.4f} "
+          f"(varsayılan ayarlar: {varsayilan_test:.4f})")
+    print(f"{len(denemeler)} deneme, {rapor['toplam_saniye']:.1f} sn. "
+          f"Sonuçlar: {RESULTS_DIR}/{SONUC_TABLOSU}, {RESULTS_DIR}/{SONUC_DOSYASI}")
+    return rapor
+
+
+def ayarlari_oku(yol):
+    """ayar_arama.json (veya {'model': ..., 'smote': ...}) dosyasından en iyi ayarları oku"""
+    with open(yol, encoding="utf-8") as f:
+        veri = json.load(f)
+    veri = veri.get('en_iyi', veri)
+    return dict(veri.get('model') or {}), dict(veri.get('smote') or {})
@@ -5,414 +5,266 @@
 Kredi Temerrüt Tahmini için Açıklanabilir Yapay Zeka (XAI) Modeli
 Bu script, kredi temerrüt tahminleri için RandomForest modeli oluşturur ve
 SHAP ve LIME kullanarak model açıklamaları sağlar.
+
+Komut satırı giriş noktasıdır; eğitim (scripts.training), açıklamalar
+(scripts.explanation) ve rapor (scripts.report) ayrı modüllerdedir. Tahmin
+servisi bu modülü içe aktarmaz.
 """
 
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
-from sklearn.preprocessing import StandardScaler
-from imblearn.over_sampling import SMOTE
-import shap
-import lime
-import lime.lime_tabular
-import matplotlib.pyplot as plt
 import os
-import base64
-from io import BytesIO
-import seaborn as sns
 import json
-import openai
+import argparse
+from contextlib import contextmanager
 from dotenv import load_dotenv
+import sys
 
-# Çevresel değişkenleri yükle
-load_dotenv()
+# Script doğrudan çalıştırıldığında proje kökünü içe aktarma yoluna ekle
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# OpenAI API anahtarını çevresel değişkenden al
-openai.api_key = os.getenv('OPENAI_API_KEY')
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import roc_auc_score
 
-# Sonuçlar klasörünü kontrol et ve oluştur
-RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "results")
-print(f"Sonuçlar dizini: {RESULTS_DIR}")
+from scripts.config import RESULTS_DIR, sonuc_yolu
+from scripts.artifacts import artifact_kaydet, en_son_artifact_yukle
+from scripts.explainer_cache import yeni_model_versiyonu
+from scripts.pipeline import InferencePipeline
+from scripts.compiled_forest import ormani_derle, cikarim_benchmark
+from scripts.metrics import metrikler
+from scripts.training import (
+    veri_yukle_ve_onisle, smote_uygula, orman_egit, model_egit, model_guncelle, model_performansi
+)
+from scripts.explanation import shap_aciklamalar, lime_aciklamalar
+from scripts.shap_batch import eski_depolari_temizle, shap_deposu_dizini
+from scripts.background import arka_plan_ozetle
+from scripts.drift import olasilik_referansi_ekle
+from scripts.tuning import (
+    ayar_ara, ayarlari_oku, VARSAYILAN_ADAY, VARSAYILAN_KAT, VARSAYILAN_ETA, VARSAYILAN_MIN_AGAC
+)
+from scripts.report import create_html_report
+from scripts.interpretation import YorumServisi, YORUM_YOK, AI_YORUM_ZAMAN_ASIMI
 
-if not os.path.exists(RESULTS_DIR):
-    os.makedirs(RESULTS_DIR)
-    print("Sonuçlar dizini oluşturuldu")
+# Çevresel değişkenleri yükle (OPENAI_API_KEY, OPENAI_BASE_URL, KREDI_AI_CLIENT)
+load_dotenv()
 
-def veri_yukle_ve_onisle():
-    """Veri setini yükle, temizle ve ön işle"""
-    try:
-        # Veriyi yükle
-        veri_yolu = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "Default_Fin.csv")
-        print(f"Veri yükleniyor: {veri_yolu}")
-        
-        if not os.path.exists(veri_yolu):
-            raise FileNotFoundError(f"Veri dosyası bulunamadı: {veri_yolu}")
-            
-        df = pd.read_csv(veri_yolu)
-        print(f"Veri yüklendi. Boyut: {df.shape}")
-        
-        # Eksik değerleri kontrol et ve temizle
-        eksik_sayisi = df.isnull().sum().sum()
-        print(f"Eksik değer sayısı: {eksik_sayisi}")
-        df = df.dropna()
-        print(f"Eksik değerler temizlendi. Yeni boyut: {df.shape}")
-        
-        # Aykırı değerleri tespit et ve temizle
-        for col in ['Bank Balance', 'Annual Salary']:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            df = df[(df[col] >= lower_bound) & (df[col] <= upper_bound)]
-            print(f"{col} için aykırı değerler temizlendi. Yeni boyut: {df.shape}")
-        
-        # Özellikleri ve hedef değişkeni ayır
-        X = df[['Employed', 'Bank Balance', 'Annual Salary']]
-        y = df['Defaulted?']
-        print("Özellikler ve hedef değişken ayrıldı")
-        
-        # Sayısal özellikleri ölçeklendir
-        scaler = StandardScaler()
-        X_scaled = X.copy()
-        X_scaled[['Bank Balance', 'Annual Salary']] = scaler.fit_transform(X[['Bank Balance', 'Annual Salary']])
-        print("Özellikler ölçeklendirildi")
-        
-        return X_scaled, y, df, X
-        
-    except Exception as e:
-        print(f"Veri yükleme ve ön işleme sırasında hata: {str(e)}")
-        raise
+@contextmanager
+def _olc(kayit, asama):
+    """Aşamanın duvar saati ve CPU süresini ve tepe RSS değerini kayda ekle"""
+    with metrikler.asama(f'benchmark_{asama}') as olcum:
+        yield
+    kayit[f'{asama}_saniye'] = round(olcum['wall_seconds'], 4)
+    kayit[f'{asama}_cpu_saniye'] = round(olcum['cpu_seconds'], 4)
+    kayit[f'{asama}_tepe_mb'] = round(olcum['peak_rss_bytes'] / 1024 ** 2, 2)
 
-def model_egit(X, y):
-    """RandomForest modelini eğit ve optimize et"""
-    # Veriyi böl
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
-    
-    # SMOTE ile dengesiz veri setini dengele
-    smote = SMOTE(random_state=42)
-    X_train_balanced, y_train_balanced = smote.fit_resample(X_train, y_train)
-    
-    # Model parametrelerini optimize et
-    model = RandomForestClassifier(
-        n_estimators=200,
-        max_depth=10,
-        min_samples_split=5,
-        min_samples_leaf=2,
-        class_weight='balanced',
-        random_state=42
-    )
-    model.fit(X_train_balanced, y_train_balanced)
-    
-    return model, X_train_balanced, X_test, y_train_balanced, y_test
+def varsayilan_cekirdekler():
+    """1, 2, 4, ... ve makinedeki tüm çekirdekler"""
+    toplam = os.cpu_count() or 1
+    cekirdekler = {toplam}
+    n = 1
+    while n < toplam:
+        cekirdekler.add(n)
+        n *= 2
+    return sorted(cekirdekler)
 
-def model_performansi(model, X_test, y_test):
-    """Model performansını detaylı olarak değerlendir"""
-    y_pred = model.predict(X_test)
-    y_pred_proba = model.predict_proba(X_test)[:, 1]
-    
-    # Sınıflandırma raporu
-    rapor = classification_report(y_test, y_pred)
-    
-    # ROC AUC skoru
-    roc_auc = roc_auc_score(y_test, y_pred_proba)
-    
-    performans_metrikleri = {
-        'classification_report': rapor,
-        'roc_auc': roc_auc,
-        'confusion_matrix': confusion_matrix(y_test, y_pred).tolist()
-    }
-    
-    with open(f"{RESULTS_DIR}/model_performans.txt", "w", encoding="utf-8") as f:
-        f.write("Model Performans Raporu\n")
-        f.write("=======================\n\n")
-        f.write(f"ROC AUC Skoru: {roc_auc:.4f}\n\n")
-        f.write(rapor)
-    
-    return performans_metrikleri, y_pred
+def egitim_benchmark(cekirdekler=None, agac_sayilari=(50, 100, 200), veri_yolu=None):
+    """Çekirdek ve ağaç sayısına göre eğitim aşamalarını ölç
 
-def get_ai_interpretation(performans_metrikleri, feature_importance):
-    """OpenAI API kullanarak model sonuçlarını yorumla"""
-    prompt = f"""
-    Kredi temerrüt tahmin modelinin sonuçlarını yorumla:
-    
-    1. Model Performans Metrikleri:
-    - ROC AUC Skoru: {performans_metrikleri['roc_auc']}
-    - Sınıflandırma Raporu:
-    {performans_metrikleri['classification_report']}
-    
-    2. Özellik Önem Sıralaması:
-    {feature_importance.to_string()}
-    
-    Lütfen şu konularda yorum yap:
-    1. Modelin genel performansı nasıl?
-    2. Hangi özellikler temerrüt tahmininde en etkili?
-    3. Modelin güçlü ve zayıf yönleri neler?
-    4. Model nasıl iyileştirilebilir?
-    
-    Yorumunu Türkçe olarak, maddeler halinde ve anlaşılır bir dille yap.
+    Her (n_jobs, n_estimators) çifti için SMOTE, eğitim ve tahmin aşamalarının
+    süresi, tepe belleği ve ROC AUC skoru results/egitim_benchmark.json
+    dosyasına yazılır.
     """
+    cekirdekler = cekirdekler or varsayilan_cekirdekler()
     
-    client = openai.OpenAI(
-        api_key="..."
-    )
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": "Sen bir finans ve makine öğrenmesi uzmanısın."},
-            {"role": "user", "content": prompt}
-        ]
+    yukleme = {}
+    with _olc(yukleme, 'veri_yukleme'):
+        X_scaled, y, _, _ = veri_yukle_ve_onisle(veri_yolu=veri_yolu)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_scaled, y, test_size=0.2, random_state=42, stratify=y
     )
     
-    return response.choices[0].message.content
+    sonuclar = []
+    for n_jobs in cekirdekler:
+        for n_estimators in agac_sayilari:
+            kayit = {'n_jobs': n_jobs, 'n_estimators': n_estimators}
+            with _olc(kayit, 'smote'):
+                X_bal, y_bal = smote_uygula(X_train, y_train, n_jobs)
+            with _olc(kayit, 'egitim'):
+                model = orman_egit(X_bal, y_bal, n_jobs, n_estimators=n_estimators)
+            with _olc(kayit, 'tahmin'):
+                proba = model.predict_proba(X_test.to_numpy())[:, 1]
+            kayit['roc_auc'] = round(float(roc_auc_score(y_test, proba)), 4)
+            sonuclar.append(kayit)
+            print(
+                f"n_jobs={n_jobs:<3} agac={n_estimators:<4} "
+                f"smote={kayit['smote_saniye']:.3f}s egitim={kayit['egitim_saniye']:.3f}s "
+                f"({kayit['egitim_tepe_mb']:.1f} MB) tahmin={kayit['tahmin_saniye']:.3f}s "
+                f"AUC={kayit['roc_auc']:.4f}"
+            )
+    
+    rapor = {
+        'cpu_count': os.cpu_count(),
+        'satir_sayisi': int(len(X_scaled)),
+        **yukleme,
+        'sonuclar': sonuclar
+    }
+    with open(sonuc_yolu("egitim_benchmark.json"), "w", encoding="utf-8") as f:
+        json.dump(rapor, f, ensure_ascii=False, indent=2)
+    print(f"Benchmark sonuçları kaydedildi: {RESULTS_DIR}/egitim_benchmark.json")
+    return rapor
 
-def create_html_report(model, X_orig, X_scaled, y, df, performans_metrikleri, y_test, y_pred, ai_interpretation):
-    """Gelişmiş HTML raporu oluştur"""
-    # Karmaşıklık matrisi
-    cm_base64 = create_confusion_matrix(y_test, y_pred)
-    
-    # Özellik önem grafiği
-    plt.figure(figsize=(10, 6))
-    feature_importance = pd.DataFrame({
-        'özellik': X_orig.columns,
-        'önem': model.feature_importances_
-    }).sort_values('önem', ascending=False)
-    
-    sns.barplot(x='önem', y='özellik', data=feature_importance)
-    plt.title('Özellik Önem Dereceleri')
-    plt.tight_layout()
-    importance_base64 = plot_to_base64(plt)
-    plt.close()
-    
-    # Veri dağılımı grafikleri
-    dist_plots = create_distribution_plots(X_orig, y)
-    
-    # Veri seti istatistikleri
-    stats = df.describe().round(2).to_html(classes='table table-striped')
-    
-    # HTML�ablonu
-    html_template = """
-    <!DOCTYPE html>
-    <html lang="tr">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Kredi Temerrüt Tahmin Raporu</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-        <style>
-            body { padding: 20px; background-color: #f8f9fa; }
-            .container { max-width: 1200px; background-color: white; padding: 30px; border-radius: 10px; box-shadow: 0 0 10px rgba(0,0,0,0.1); }
-            .section { margin-bottom: 40px; }
-            img { max-width: 100%; height: auto; border-radius: 5px; }
-            .metric-card { background-color: #f8f9fa; padding: 20px; border-radius: 5px; margin-bottom: 20px; }
-            .interpretation { background-color: #e9ecef; padding: 20px; border-radius: 5px; margin-bottom: 20px; }
-            pre { background-color: #f8f9fa; padding: 15px; border-radius: 5px; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1 class="mb-4">Kredi Temerrüt Tahmin Analizi</h1>
-            
-            <div class="section">
-                <h2>Model Performansı</h2>
-                <div class="row">
-                    <div class="col-md-6">
-                        <div class="metric-card">
-                            <h4>ROC AUC Skoru</h4>
-                            <h2>{roc_auc:.4f}</h2>
-                        </div>
-                    </div>
-                </div>
-                <pre>{classification_report}</pre>
-            </div>
-            
-            <div class="section">
-                <h2>AI Yorumu</h2>
-                <div class="interpretation">
-                    {ai_interpretation}
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>Karmaşıklık Matrisi</h2>
-                <img src="data:image/png;base64,{cm_base64}" alt="Karmaşıklık Matrisi">
-            </div>
-            
-            <div class="section">
-                <h2>Özellik Önem Dereceleri</h2>
-                <img src="data:image/png;base64,{importance_base64}" alt="Özellik Önem Dereceleri">
-            </div>
-            
-            <div class="section">
-                <h2>Özellik Dağılımları</h2>
-                <div class="row">
-                    {dist_plots}
-                </div>
-            </div>
-            
-            <div class="section">
-                <h2>Veri Seti İstatistikleri</h2>
-                {stats}
-            </div>
-            
-            <div class="section">
-                <h2>Model Açıklamaları</h2>
-                <p>Detaylı SHAP ve LIME açıklamaları için lütfen aşağıdaki dosyalara bakın:</p>
-                <ul>
-                    <li><a href="shap_ozet.png">SHAP Özet Grafiği</a></li>
-                    <li><a href="lime_aciklama.html">LIME Açıklamaları</a></li>
-                </ul>
-            </div>
-        </div>
-        
-        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
-    </body>
-    </html>
+def artimli_egit(ek_agac, n_jobs=None, veri_yolu=None):
+    """En son model paketine yeni veriyle ağaç ekleyip yeni paket olarak kaydet
+
+    Yeni veri paketteki ölçekleyiciyle ölçeklenir, böylece eski ve yeni ağaçlar
+    aynı özellik uzayını görür.
     """
+    paket = en_son_artifact_yukle(mmap=False)
+    if paket is None:
+        raise FileNotFoundError("Sıcak başlatma için kayıtlı model paketi yok")
     
-    # HTML içeriğini oluştur
-    html_content = html_template.format(
-        roc_auc=performans_metrikleri['roc_auc'],
-        classification_report=performans_metrikleri['classification_report'],
-        ai_interpretation=ai_interpretation.replace('\n', '<br>'),
-        cm_base64=cm_base64,
-        importance_base64=importance_base64,
-        dist_plots=dist_plots,
-        stats=stats
+    _, y, _, X_orig, drift_referansi = veri_yukle_ve_onisle(veri_yolu=veri_yolu, return_referans=True)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_orig, y, test_size=0.2, random_state=42, stratify=y
+    )
+    pipeline = InferencePipeline.from_scaler(paket['model'], paket['scaler'])
+    X_train_scaled = pipeline.transform_inplace(pipeline._batch(X_train))
+    
+    model, X_balanced, y_balanced = model_guncelle(paket['model'], X_train_scaled, y_train, ek_agac, n_jobs)
+    print(f"{paket['version']} sürümüne {ek_agac} ağaç eklendi (toplam {len(model.estimators_)})")
+    forest = ormani_derle(model, X_balanced)
+    
+    yeni_pipeline = InferencePipeline.from_scaler(model, paket['scaler'], engine=forest)
+    performans_metrikleri, _ = model_performansi(yeni_pipeline, X_test, y_test)
+    olasilik_referansi_ekle(drift_referansi, yeni_pipeline.predict_proba(X_test)[:, 1])
+    print(f"ROC AUC: {performans_metrikleri['roc_auc']:.4f}")
+    
+    arka_plan = arka_plan_ozetle(X_balanced, y_balanced, ayrik_kaynak=X_train_scaled)
+    return artifact_kaydet(
+        model, paket['scaler'], arka_plan.X, forest=forest, background_weights=arka_plan.agirlik,
+        meta={'base_version': paket['version'], 'n_estimators': len(model.estimators_),
+              'background_method': arka_plan.yontem, 'drift_reference': drift_referansi}
     )
-    
-    # HTML dosyasını kaydet
-    with open(f"{RESULTS_DIR}/rapor.html", "w", encoding="utf-8") as f:
-        f.write(html_content)
-
-def create_distribution_plots(X, y):
-    """Her özellik için dağılım grafiklerini oluştur"""
-    plots_html = ""
-    
-    for col in X.columns:
-        plt.figure(figsize=(8, 5))
-        sns.histplot(data=X, x=col, hue=y, multiple="stack")
-        plt.title(f'{col} Dağılımı')
-        plt.tight_layout()
-        plot_base64 = plot_to_base64(plt)
-        plt.close()
-        
-        plots_html += f"""
-        <div class="col-md-6 mb-4">
-            <img src="data:image/png;base64,{plot_base64}" alt="{col} Dağılımı">
-        </div>
-        """
-    
-    return plots_html
-
-def plot_to_base64(plt):
-    """Matplotlib grafiğini base64 formatına dönüştür"""
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    buf.seek(0)
-    return base64.b64encode(buf.getvalue()).decode('utf-8')
-
-def create_confusion_matrix(y_test, y_pred):
-    """Karmaşıklık matrisini oluştur"""
-    plt.figure(figsize=(8, 6))
-    cm = confusion_matrix(y_test, y_pred)
-    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues')
-    plt.title('Karmaşıklık Matrisi')
-    plt.ylabel('Gerçek Değer')
-    plt.xlabel('Tahmin')
-    plt.tight_layout()
-    
-    # Base64'e dönüştür
-    cm_base64 = plot_to_base64(plt)
-    plt.close()
-    return cm_base64
 
-def shap_aciklamalar(model, X_train, X_test):
-    """SHAP değerlerini hesapla ve görselleştir"""
-    try:
-        print("SHAP açıklamaları oluşturuluyor...")
-        
-        # SHAP değerlerini hesapla
-        explainer = shap.TreeExplainer(model)
-        shap_values = explainer.shap_values(X_test)
-        
-        if isinstance(shap_values, list):
-            shap_values = shap_values[1]  # Pozitif sınıf için SHAP değerleri
-        
-        print(f"SHAP değerleri hesaplandı. Boyut: {shap_values.shape}")
-        
-        # SHAP özet grafiği
-        plt.figure(figsize=(10, 6))
-        shap.summary_plot(shap_values, X_test, plot_type="bar", show=False)
-        plt.title("SHAP Özellik Önem Dereceleri")
-        plt.tight_layout()
-        plt.savefig(f"{RESULTS_DIR}/shap_ozet.png")
-        plt.close()
-        print("SHAP özet grafiği kaydedildi")
-        
-        return shap_values
-        
-    except Exception as e:
-        print(f"SHAP açıklamaları oluşturulurken hata: {str(e)}")
-        raise
+def cikarim_benchmark_calistir(veri_yolu=None):
+    """En son paketin ormanını derlenmiş motorla test verisi üzerinde karşılaştır"""
+    paket = en_son_artifact_yukle(mmap=False)
+    if paket is None:
+        raise FileNotFoundError("Benchmark için kayıtlı model paketi yok")
+    
+    _, y, _, X_orig = veri_yukle_ve_onisle(veri_yolu=veri_yolu)
+    _, X_test, _, _ = train_test_split(X_orig, y, test_size=0.2, random_state=42, stratify=y)
+    pipeline = InferencePipeline.from_scaler(paket['model'], paket['scaler'])
+    X_test_scaled = pipeline.transform_inplace(pipeline._batch(X_test))
+    
+    forest = paket['forest'] or ormani_derle(paket['model'], X_test_scaled)
+    sonuc = cikarim_benchmark(paket['model'], forest, X_test_scaled)
+    sonuc['model_version'] = paket['version']
+    with open(sonuc_yolu("cikarim_benchmark.json"), "w", encoding="utf-8") as f:
+        json.dump(sonuc, f, ensure_ascii=False, indent=2)
+    print(f"Benchmark sonuçları kaydedildi: {RESULTS_DIR}/cikarim_benchmark.json")
+    return sonuc
 
-def lime_aciklamalar(model, X_train, X_test):
-    """LIME açıklamaları oluştur"""
-    try:
-        print("LIME açıklamaları oluşturuluyor...")
-        
-        # LIME açıklayıcı oluştur
-        feature_names = ['İstihdam Durumu', 'Banka Bakiyesi', 'Yıllık Maaş']
-        explainer = lime.lime_tabular.LimeTabularExplainer(
-            X_train.values,
-            feature_names=feature_names,
-            class_names=['Temerrüt Yok', 'Temerrüt Var'],
-            mode='classification'
-        )
-        
-        # Örnek bir tahmin için LIME açıklaması
-        exp = explainer.explain_instance(
-            X_test.iloc[0].values, 
-            model.predict_proba,
-            num_features=3
-        )
-        
-        # HTML olarak kaydet
-        exp.save_to_file(f"{RESULTS_DIR}/lime_aciklama.html")
-        print("LIME açıklaması HTML olarak kaydedildi")
-        
-    except Exception as e:
-        print(f"LIME açıklamaları oluşturulurken hata: {str(e)}")
-        raise
+def arguman_ayristir(argv=None):
+    parser = argparse.ArgumentParser(description="Kredi temerrüt modeli eğitimi ve açıklamaları")
+    parser.add_argument('--data', help="CSV dosyası (varsayılan: data/Default_Fin.csv)")
+    parser.add_argument('--n-jobs', type=int, default=None,
+                        help="Eğitim çekirdek sayısı (varsayılan: KREDI_N_JOBS veya tüm çekirdekler)")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Çekirdek ve ağaç sayısına göre süre, bellek ve ROC AUC ölç")
+    parser.add_argument('--benchmark-cores', type=int, nargs='+', metavar='N',
+                        help="Benchmark çekirdek sayıları (varsayılan: 1, 2, 4, ..., tümü)")
+    parser.add_argument('--benchmark-trees', type=int, nargs='+', metavar='N', default=[50, 100, 200],
+                        help="Benchmark ağaç sayıları")
+    parser.add_argument('--benchmark-inference', action='store_true',
+                        help="Derlenmiş orman ile scikit-learn tahmin gecikmesini ve belleğini karşılaştır")
+    parser.add_argument('--warm-start', type=int, metavar='N',
+                        help="En son model paketini yükleyip yeni veriyle N ağaç ekle")
+    parser.add_argument('--tune', action='store_true',
+                        help="Orman ve SMOTE parametrelerini ardışık yarılama ile ara")
+    parser.add_argument('--tune-candidates', type=int, default=VARSAYILAN_ADAY,
+                        help="Aranacak aday sayısı")
+    parser.add_argument('--tune-folds', type=int, default=VARSAYILAN_KAT,
+                        help="Çapraz doğrulama kat sayısı")
+    parser.add_argument('--tune-eta', type=int, default=VARSAYILAN_ETA,
+                        help="Her turda adayların 1/eta'sı eta kat ağaçla devam eder")
+    parser.add_argument('--tune-min-trees', type=int, default=VARSAYILAN_MIN_AGAC,
+                        help="İlk turdaki ağaç sayısı")
+    parser.add_argument('--tune-max-trees', type=int, default=None,
+                        help="Son turdaki ağaç sayısı (varsayılan: MODEL_AYARLARI)")
+    parser.add_argument('--params', metavar='JSON',
+                        help="Eğitimde --tune sonucundaki (ayar_arama.json) en iyi ayarları kullan")
+    return parser.parse_args(argv)
 
-def main():
+def main(argv=None):
     """Ana fonksiyon"""
+    args = arguman_ayristir(argv)
+    if args.benchmark:
+        egitim_benchmark(args.benchmark_cores, args.benchmark_trees, veri_yolu=args.data)
+        return
+    if args.benchmark_inference:
+        cikarim_benchmark_calistir(veri_yolu=args.data)
+        return
+    if args.warm_start:
+        artimli_egit(args.warm_start, n_jobs=args.n_jobs, veri_yolu=args.data)
+        return
+    if args.tune:
+        X_scaled, y, _, _ = veri_yukle_ve_onisle(veri_yolu=args.data)
+        ayar_ara(
+            X_scaled, y, n_jobs=args.n_jobs, n_aday=args.tune_candidates, kat_sayisi=args.tune_folds,
+            eta=args.tune_eta, min_agac=args.tune_min_trees, max_agac=args.tune_max_trees
+        )
+        return
+    model_ayarlari, smote_ayarlari = ayarlari_oku(args.params) if args.params else ({}, {})
+    
     print("Veri yükleniyor ve ön işleniyor...")
-    X_scaled, y, df, X_orig = veri_yukle_ve_onisle()
+    X_scaled, y, df, X_orig, scaler, drift_referansi = veri_yukle_ve_onisle(
+        return_scaler=True, return_referans=True, veri_yolu=args.data
+    )
     
     print("Model eğitiliyor...")
-    model, X_train, X_test, y_train, y_test = model_egit(X_scaled, y)
+    model, X_train, X_test, y_train, y_test = model_egit(
+        X_scaled, y, n_jobs=args.n_jobs, smote_ayarlari=smote_ayarlari, **model_ayarlari
+    )
     
-    print("Model performansı değerlendiriliyor...")
-    performans_metrikleri, y_pred = model_performansi(model, X_test, y_test)
+    print("Orman derleniyor...")
+    forest = ormani_derle(model, X_test)
     
-    print("SHAP açıklamaları oluşturuluyor...")
-    shap_aciklamalar(model, X_train, X_test)
+    print("Açıklayıcı arka planı özetleniyor...")
+    arka_plan = arka_plan_ozetle(X_train, y_train, ayrik_kaynak=X_scaled)
     
-    print("LIME açıklamaları oluşturuluyor...")
-    lime_aciklamalar(model, X_train, X_test)
-    
-    print("AI yorumu alınıyor...")
+    print("Model performansı değerlendiriliyor...")
+    # API ile aynı ölçekleme + çıkarım hattını ham test verisi üzerinde kullan
+    pipeline = InferencePipeline.from_scaler(model, scaler, engine=forest)
+    performans_metrikleri, y_pred = model_performansi(pipeline, X_orig.loc[X_test.index], y_test)
+    olasilik_referansi_ekle(drift_referansi, pipeline.predict_proba(X_orig.loc[X_test.index])[:, 1])
+    
+    print("Model paketi kaydediliyor...")
+    versiyon = yeni_model_versiyonu()
+    artifact_kaydet(model, scaler, arka_plan.X, version=versiyon, forest=forest,
+                    background_weights=arka_plan.agirlik,
+                    meta={'background_method': arka_plan.yontem, 'drift_reference': drift_referansi})
+    
+    # AI yorumu açıklamalar hesaplanırken arka planda alınır
+    print("AI yorumu istendi...")
     feature_importance = pd.DataFrame({
         'özellik': X_orig.columns,
         'önem': model.feature_importances_
     }).sort_values('önem', ascending=False)
+    yorum_servisi = YorumServisi()
+    yorum_anahtari = yorum_servisi.iste(performans_metrikleri, feature_importance)
+    
+    print("SHAP açıklamaları oluşturuluyor...")
+    # API ile aynı sürüm klasörü: /api/shap bu modelin deposunu bulur
+    shap_aciklamalar(model, arka_plan.X, X_test, depo_dizini=shap_deposu_dizini(versiyon))
+    
+    print("LIME açıklamaları oluşturuluyor...")
+    lime_aciklamalar(model, arka_plan.X, X_test, agirlik=arka_plan.agirlik)
+    # Açıklamalar tamamlandıktan sonra eski depolar silinir; bu sürümünki korunur
+    eski_depolari_temizle(koru=(versiyon,))
     
-    ai_interpretation = get_ai_interpretation(performans_metrikleri, feature_importance)
+    print("AI yorumu bekleniyor...")
+    ai_interpretation = yorum_servisi.bekle(yorum_anahtari, timeout=AI_YORUM_ZAMAN_ASIMI) or YORUM_YOK
     
     print("HTML raporu oluşturuluyor...")
     create_html_report(model, X_orig, X_scaled, y, df, performans_metrikleri, y_test, y_pred, ai_interpretation)
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+# Testler proje kökünden bağımsız çalıştırılabilsin (scripts paketini içe aktarma yoluna ekle)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
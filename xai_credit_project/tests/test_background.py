@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+"""Açıklayıcı arka plan özetinin ayrık sütun testleri"""
+
+import numpy as np
+import pytest
+
+from scripts.background import arka_plan_ozetle
+
+
+@pytest.fixture(scope="module")
+def veri():
+    """İkili bir sütun ve SMOTE benzeri ara değerlere çekilmiş dengelenmiş kopyası"""
+    rng = np.random.default_rng(0)
+    X = np.column_stack([
+        rng.integers(0, 2, 3000),
+        rng.normal(10000, 5000, 3000),
+        rng.normal(400000, 150000, 3000)
+    ]).astype(np.float64)
+    y = (rng.random(3000) < 0.1).astype(int)
+    sentetik = X[y == 1][:2000].copy()
+    sentetik[:, 0] = rng.random(len(sentetik))
+    X_bal = np.vstack([X, sentetik])
+    y_bal = np.concatenate([y, np.ones(len(sentetik), dtype=int)])
+    return X, X_bal, y_bal
+
+
+@pytest.mark.parametrize("yontem", ["kmeans", "quantile", "none"])
+def test_ayrik_sutun_smote_oncesi_degerlere_yuvarlanir(veri, yontem):
+    X, X_bal, y_bal = veri
+    ozet = arka_plan_ozetle(X_bal, y_bal, boyut=100, yontem=yontem, ayrik_kaynak=X)
+    assert set(np.unique(ozet.X[:, 0])) <= {0.0, 1.0}
+    assert np.isclose(ozet.agirlik.sum(), 1.0)
+
+
+def test_kaynak_yoksa_ara_degerler_kalir(veri):
+    _, X_bal, y_bal = veri
+    ozet = arka_plan_ozetle(X_bal, y_bal, boyut=100, yontem="kmeans")
+    assert not set(np.unique(ozet.X[:, 0])) <= {0.0, 1.0}
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""Derlenmiş ormanın scikit-learn ile parite testleri"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from scripts.compiled_forest import DERLEME_TOLERANSI, FlatForest, ormani_derle, parite_farki
+
+
+@pytest.fixture(scope="module")
+def orman():
+    """Employed benzeri ikili bir sütun ve iki sürekli sütunla küçük bir orman"""
+    rng = np.random.default_rng(0)
+    X = np.column_stack([
+        rng.integers(0, 2, 2000),
+        rng.normal(10000, 5000, 2000),
+        rng.normal(400000, 150000, 2000)
+    ]).astype(np.float64)
+    y = (X[:, 1] / 20000 - X[:, 2] / 800000 + rng.normal(0, 0.3, 2000) > 0.1).astype(int)
+    model = RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0).fit(X, y)
+    return model, X
+
+
+def _esik_satirlari(model, X):
+    """Her bölünme eşiğine tam eşit, float32 komşusu ve bir alt/üst değer içeren satırlar"""
+    satirlar = []
+    taban = np.median(X, axis=0)
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        for ozellik, esik in zip(tree.feature, tree.threshold):
+            if ozellik < 0:
+                continue
+            esik32 = np.float32(esik)
+            for deger in (esik, esik32, np.nextafter(esik32, np.float32(np.inf)),
+                          np.nextafter(esik32, np.float32(-np.inf))):
+                satir = taban.copy()
+                satir[ozellik] = deger
+                satirlar.append(satir)
+    return np.array(satirlar)
+
+
+def test_rastgele_girdilerde_parite(orman):
+    model, X = orman
+    forest = FlatForest.from_sklearn(model)
+    rng = np.random.default_rng(1)
+    X_rastgele = np.column_stack([
+        rng.integers(0, 2, 5000),
+        rng.uniform(-5000, 30000, 5000),
+        rng.uniform(0, 900000, 5000)
+    ])
+    np.testing.assert_allclose(forest.predict_proba(X_rastgele), model.predict_proba(X_rastgele),
+                               rtol=0, atol=DERLEME_TOLERANSI)
+    np.testing.assert_array_equal(forest.predict(X_rastgele), model.predict(X_rastgele))
+
+
+def test_esik_degerlerinde_parite(orman):
+    model, X = orman
+    forest = FlatForest.from_sklearn(model)
+    X_esik = _esik_satirlari(model, X)
+    assert len(X_esik) > 0
+    np.testing.assert_allclose(forest.predict_proba(X_esik), model.predict_proba(X_esik),
+                               rtol=0, atol=DERLEME_TOLERANSI)
+
+
+def test_tek_satir_ve_parca_sinirlari(orman, monkeypatch):
+    model, X = orman
+    forest = FlatForest.from_sklearn(model)
+    np.testing.assert_allclose(forest.predict_proba(X[0]), model.predict_proba(X[:1]),
+                               rtol=0, atol=DERLEME_TOLERANSI)
+    # Parça boyutunun katı olmayan satır sayıları da doğru birleştirilmeli
+    monkeypatch.setattr("scripts.compiled_forest.EVAL_CHUNK_ROWS", 7)
+    assert parite_farki(forest, model, X[:100]) <= DERLEME_TOLERANSI
+
+
+def test_kaydet_yukle_ve_derle(orman, tmp_path):
+    model, X = orman
+    forest = ormani_derle(model, X[:500])
+    yol = str(tmp_path / "forest.npz")
+    forest.kaydet(yol)
+    yuklenen = FlatForest.yukle(yol)
+    assert yuklenen.n_estimators == model.n_estimators
+    np.testing.assert_array_equal(yuklenen.predict_proba(X), forest.predict_proba(X))